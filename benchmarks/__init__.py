@@ -0,0 +1 @@
+"""SDK performance benchmarks (see benchmarks/run.py)."""
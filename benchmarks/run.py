@@ -0,0 +1,528 @@
+"""Benchmarks for SDK hot paths with baseline comparison.
+
+Usage:
+    python -m benchmarks                       # run all, print a table
+    python -m benchmarks --quick -k search     # fewer samples, filter by name
+    python -m benchmarks --output out.json     # machine-readable results
+    python -m benchmarks --baseline benchmarks/baseline.json --max-regression 0.25
+    python -m benchmarks --update-baseline     # rewrite benchmarks/baseline.json
+
+Time benchmarks report the median nanoseconds per operation over several
+samples; memory benchmarks report tracemalloc bytes per object; import
+benchmarks run `python -X importtime` in fresh interpreters and report the
+median cumulative microseconds of the imported module. With
+--baseline, any benchmark slower (or bigger) than baseline * (1 +
+max-regression) fails the run with exit code 1. A baseline entry may carry
+its own "max_regression" to override the global threshold.
+
+Results are absolute numbers, so a baseline only holds for the machine that
+recorded it. Reports record the host (CPU model and count, architecture, OS,
+Python), and --baseline refuses to compare across hosts (exit code 2):
+generate the baseline on each runner with --update-baseline.
+
+End-to-end benchmarks run against omem.fake_service with no injected
+latency, so they measure SDK overhead rather than the network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+import omem
+from omem import Memory
+from omem.client import MemoryClient, RetryConfig, _as_jsonable_turn
+from omem.fake_service import FakeOmemService
+from omem.memory import Conversation, _event_from_graph, _items_from_retrieval, _parse_datetime
+from omem.models import MemoryItem, SearchResult
+from omem.types import CanonicalTurnV1
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # "time": setup() -> (run, ops), where run() performs `ops` operations.
+    # "memory": setup() -> make(n), which returns n live objects.
+    # "import": setup() -> dotted module name to import in a fresh interpreter.
+    setup: Callable[[], Any]
+    kind: str = "time"  # "time" (ns/op), "memory" (bytes/obj) or "import" (us)
+    # Per-benchmark regression budget, recorded into the report (and baseline).
+    max_regression: Optional[float] = None
+
+
+_BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(
+    name: str, kind: str = "time", max_regression: Optional[float] = None
+) -> Callable[[Callable[[], Any]], Callable[[], Any]]:
+    def register(fn: Callable[[], Any]) -> Callable[[], Any]:
+        _BENCHMARKS.append(Benchmark(name, fn, kind, max_regression))
+        return fn
+
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+TS = "2026-01-14T09:30:00+08:00"
+
+
+def _messages(n: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"Message {i}: Caroline mentioned the West Lake trip and the budget review on Friday.",
+            "timestamp": TS,
+        }
+        for i in range(n)
+    ]
+
+
+def _turns(n: int) -> List[CanonicalTurnV1]:
+    return [
+        CanonicalTurnV1(
+            turn_id=f"t{i:04d}",
+            role="user" if i % 2 == 0 else "assistant",
+            text=m["content"],
+            timestamp_iso=TS,
+            meta={"source": "bench"},
+        )
+        for i, m in enumerate(_messages(n), 1)
+    ]
+
+
+def _retrieval_payload(n: int) -> bytes:
+    details = [
+        {
+            "text": f"Caroline went to the support group on 2026-01-{(i % 28) + 1:02d}",
+            "score": 1.0 - i / 100,
+            "timestamp": f"2026-01-{(i % 28) + 1:02d}T10:00:00Z",
+            "source": "tkg",
+            "entities": ["Caroline", "support group"],
+            "event_id": f"logical-{i}",
+            "tkg_event_id": f"ev-{i}",
+        }
+        for i in range(n)
+    ]
+    return json.dumps({"strategy": "dialog_v2", "evidence_details": details}).encode()
+
+
+def _graph_events_payload(n: int) -> bytes:
+    # Shape of graph_list_events / iter_list_events items; entity names repeat.
+    people = ["Caroline", "Melanie", "Dana", "Bob"]
+    items = [
+        {
+            "id": f"ev-{i}",
+            "summary": f"{people[i % 4]} talked about the West Lake trip ({i})",
+            "t_abs_start": f"2026-01-{(i % 28) + 1:02d}T10:{i % 60:02d}:00Z",
+            "involves": [people[i % 4], people[(i + 1) % 4], "West Lake"],
+        }
+        for i in range(n)
+    ]
+    return json.dumps({"items": items}).encode()
+
+
+def _fake_client(fake: FakeOmemService, retries: int = 0) -> MemoryClient:
+    return MemoryClient(
+        base_url="http://omem.fake",
+        tenant_id="__from_api_key__",
+        api_token="qbk_bench",
+        http=fake.http_client(),
+        retry_config=RetryConfig(max_retries=retries, base_backoff_seconds=0.0, jitter=False),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+@benchmark("conversation_add")
+def _bench_conversation_add() -> Any:
+    client = _fake_client(FakeOmemService())
+    msgs = _messages(100)
+
+    def run() -> None:
+        conv = Conversation(client, "bench", sync_cursor=False)
+        for m in msgs:
+            conv.add(m)
+
+    return run, len(msgs)
+
+
+@benchmark("ingest_encode")
+def _bench_ingest_encode() -> Any:
+    turns = _turns(100)
+
+    def run() -> None:
+        json.dumps({"session_id": "bench", "turns": [_as_jsonable_turn(t) for t in turns]}).encode()
+
+    return run, len(turns)
+
+
+@benchmark("retrieval_decode")
+def _bench_retrieval_decode() -> Any:
+    raw = _retrieval_payload(30)
+
+    def run() -> None:
+        _items_from_retrieval(json.loads(raw))
+
+    return run, 30
+
+
+@benchmark("parse_datetime")
+def _bench_parse_datetime() -> Any:
+    values = [f"2026-01-{(i % 28) + 1:02d}T10:{i % 60:02d}:00Z" for i in range(100)]
+
+    def run() -> None:
+        for v in values:
+            _parse_datetime(v)
+
+    return run, len(values)
+
+
+# 100k events from a graph listing: decoded JSON -> Event objects. Timestamps
+# are kept raw and parsed on first access, so this measures model building.
+@benchmark("graph_events_decode")
+def _bench_graph_events_decode() -> Any:
+    items = json.loads(_graph_events_payload(100_000))["items"]
+
+    def run() -> None:
+        [_event_from_graph(item) for item in items]
+
+    return run, len(items)
+
+
+@benchmark("retry_schedule")
+def _bench_retry_schedule() -> Any:
+    # One 503 then 200: measures error mapping + backoff bookkeeping, no sleep.
+    state = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["n"] += 1
+        if state["n"] % 2:
+            return httpx.Response(503, json={"error": "busy"})
+        return httpx.Response(200, json={"job_id": "j1", "session_id": "s", "status": "COMPLETED"})
+
+    client = MemoryClient(
+        base_url="http://omem.bench",
+        tenant_id="__from_api_key__",
+        api_token="qbk_bench",
+        http=httpx.Client(transport=httpx.MockTransport(handler)),
+        retry_config=RetryConfig(max_retries=1, base_backoff_seconds=0.0, jitter=False),
+    )
+
+    def run() -> None:
+        client.get_job("j1")
+
+    return run, 1
+
+
+@benchmark("e2e_add")
+def _bench_e2e_add() -> Any:
+    fake = FakeOmemService()
+    mem = Memory(api_key="qbk_bench", endpoint="http://omem.fake", http=fake.http_client())
+    msgs = _messages(10)
+    counter = iter(range(10**9))
+
+    def run() -> None:
+        mem.add(f"conv-{next(counter)}", msgs)
+
+    return run, 1
+
+
+@benchmark("e2e_search")
+def _bench_e2e_search() -> Any:
+    fake = FakeOmemService()
+    mem = Memory(api_key="qbk_bench", endpoint="http://omem.fake", http=fake.http_client())
+    for i in range(20):
+        mem.add(f"seed-{i}", _messages(10))
+
+    def run() -> None:
+        mem.search("Caroline West Lake budget", limit=10)
+
+    return run, 1
+
+
+def _alloc_bytes(make: Callable[[int], Any], n: int = 2000) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = make(n)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (after - before) / n
+
+
+@benchmark("memory_per_item", kind="memory")
+def _bench_memory_item() -> Any:
+    ts = _parse_datetime(TS)
+    return lambda n: [
+        MemoryItem(text=f"memory text {i}", score=0.5, timestamp=ts, source="tkg", entities=["A"], event_id=f"ev-{i}")
+        for i in range(n)
+    ]
+
+
+@benchmark("memory_per_graph_event", kind="memory")
+def _bench_memory_graph_event() -> Any:
+    # Bytes retained once the decoded payload is gone (interned names are shared).
+    return lambda n: [_event_from_graph(item) for item in json.loads(_graph_events_payload(n))["items"]]
+
+
+@benchmark("memory_per_turn", kind="memory")
+def _bench_memory_turn() -> Any:
+    return lambda n: [CanonicalTurnV1(turn_id=f"t{i:04d}", role="user", text=f"turn {i}", timestamp_iso=TS) for i in range(n)]
+
+
+@benchmark("memory_per_search_result", kind="memory")
+def _bench_memory_result() -> Any:
+    raw = _retrieval_payload(10)
+    return lambda n: [SearchResult(query="q", items=_items_from_retrieval(json.loads(raw))) for _ in range(n)]
+
+
+# Cold-start budget: `import omem` must not pull in httpx or the client stack.
+# Process startup is noisy, hence the wider threshold.
+@benchmark("import_omem", kind="import", max_regression=0.5)
+def _bench_import_omem() -> Any:
+    return "omem"
+
+
+# `import omem.memory` loads the client stack (httpx) but not opt-in features:
+# attachments, the fallback store, the overlay, graph iterators and asyncio.
+@benchmark("import_omem_memory", kind="import", max_regression=0.3)
+def _bench_import_omem_memory() -> Any:
+    return "omem.memory"
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+
+def _import_us(module: str, *, samples: int) -> Dict[str, Any]:
+    """Median `-X importtime` cumulative microseconds for `module` in fresh interpreters."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    values: List[float] = []
+    for _ in range(samples):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        # Sum the top-level entries logged after interpreter startup (`site`).
+        total = 0.0
+        for line in proc.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) != 3 or parts[2].startswith("  "):
+                continue
+            name = parts[2].strip()
+            if name == "site":
+                total = 0.0
+            elif name != "imported package":
+                total += float(parts[1])
+        values.append(total)
+    return {
+        "unit": "us",
+        "value": statistics.median(values),
+        "min": min(values),
+        "stdev": (statistics.stdev(values) if len(values) > 1 else 0.0),
+        "samples": len(values),
+    }
+
+
+def _time(run: Callable[[], Any], ops: int, *, samples: int, min_sample_s: float) -> Dict[str, Any]:
+    run()  # warm up
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            run()
+        if time.perf_counter() - t0 >= min_sample_s or loops >= 1 << 20:
+            break
+        loops *= 2
+    per_op: List[float] = []
+    for _ in range(samples):
+        t0 = time.perf_counter_ns()
+        for _ in range(loops):
+            run()
+        per_op.append((time.perf_counter_ns() - t0) / (loops * ops))
+    return {
+        "unit": "ns/op",
+        "value": statistics.median(per_op),
+        "min": min(per_op),
+        "stdev": (statistics.stdev(per_op) if len(per_op) > 1 else 0.0),
+        "samples": len(per_op),
+    }
+
+
+def run_benchmarks(*, pattern: Optional[str] = None, quick: bool = False) -> Dict[str, Any]:
+    """Run registered benchmarks and return a JSON-serializable report."""
+    results: Dict[str, Any] = {}
+    for b in _BENCHMARKS:
+        if pattern and pattern not in b.name:
+            continue
+        if b.kind == "memory":
+            value = _alloc_bytes(b.setup(), 200 if quick else 2000)
+            results[b.name] = {"unit": "bytes/obj", "value": value}
+        elif b.kind == "import":
+            results[b.name] = _import_us(b.setup(), samples=(3 if quick else 9))
+        else:
+            run, ops = b.setup()
+            results[b.name] = _time(run, ops, samples=(3 if quick else 7), min_sample_s=(0.005 if quick else 0.05))
+        if b.max_regression is not None:
+            results[b.name]["max_regression"] = b.max_regression
+    return {
+        "meta": {
+            "omem": omem.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "host": host_info(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_info() -> Dict[str, Any]:
+    """What a baseline's absolute numbers depend on; compared field by field."""
+    return {
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+    }
+
+
+def host_mismatch(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Host fields that differ between a report and a baseline (all of them if one lacks host info)."""
+    cur = (report.get("meta") or {}).get("host") or {}
+    ref = (baseline.get("meta") or {}).get("host") or {}
+    return sorted(k for k in set(cur) | set(ref) if cur.get(k) != ref.get(k))
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[Dict[str, Any]]:
+    """Compare a report against a baseline; returns one row per shared benchmark.
+
+    Raises:
+        ValueError: The baseline was recorded on a different host.
+    """
+    mismatch = host_mismatch(report, baseline)
+    if mismatch:
+        raise ValueError(
+            f"baseline was recorded on a different host ({', '.join(mismatch)} differ); "
+            "regenerate it on this machine with --update-baseline"
+        )
+    rows: List[Dict[str, Any]] = []
+    base = baseline.get("results") or {}
+    for name, cur in (report.get("results") or {}).items():
+        ref = base.get(name)
+        if not ref or not ref.get("value"):
+            continue
+        limit = float(ref.get("max_regression", max_regression))
+        ratio = float(cur["value"]) / float(ref["value"])
+        rows.append(
+            {
+                "name": name,
+                "unit": cur["unit"],
+                "baseline": float(ref["value"]),
+                "current": float(cur["value"]),
+                "ratio": ratio,
+                "max_regression": limit,
+                "regressed": ratio > 1.0 + limit,
+            }
+        )
+    return rows
+
+
+_SUFFIX = {"ns/op": "/op", "bytes/obj": "/obj"}
+
+
+def _fmt(value: float, unit: str) -> str:
+    if unit == "ns/op":
+        for scale, suffix in ((1e9, "s"), (1e6, "ms"), (1e3, "us")):
+            if value >= scale:
+                return f"{value / scale:.2f}{suffix}"
+        return f"{value:.0f}ns"
+    if unit == "us":
+        return f"{value / 1e3:.2f}ms" if value >= 1e3 else f"{value:.0f}us"
+    return f"{value:.0f}B"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description="omem SDK benchmarks")
+    p.add_argument("-k", dest="pattern", default=None, help="only run benchmarks whose name contains this")
+    p.add_argument("--quick", action="store_true", help="fewer, shorter samples (CI smoke runs)")
+    p.add_argument("--output", default=None, help="write the JSON report here")
+    p.add_argument("--baseline", default=None, help="compare against this baseline JSON")
+    p.add_argument("--max-regression", type=float, default=0.25, help="allowed slowdown ratio (default 0.25)")
+    p.add_argument("--update-baseline", action="store_true", help=f"write results to {DEFAULT_BASELINE}")
+    args = p.parse_args(argv)
+
+    report = run_benchmarks(pattern=args.pattern, quick=args.quick)
+    for name, r in report["results"].items():
+        print(f"{name:28s} {_fmt(r['value'], r['unit']):>10s}{_SUFFIX.get(r['unit'], '')}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.update_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    try:
+        rows = compare(report, baseline, args.max_regression)
+    except ValueError as exc:
+        print(f"cannot compare: {exc}", file=sys.stderr)
+        return 2
+    failed = [r for r in rows if r["regressed"]]
+    for r in rows:
+        flag = "REGRESSION" if r["regressed"] else "ok"
+        print(f"{r['name']:28s} x{r['ratio']:.2f} (limit x{1 + r['max_regression']:.2f}) {flag}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -21,33 +21,90 @@ Quick Start:
 For more information, see: https://github.com/VisMemo/python-sdk
 """
 
-from .memory import Memory, Conversation
-from .models import (
-    MemoryItem,
-    SearchResult,
-    Entity,
-    Event,
-    Evidence,
-    EventContext,
-    ExtractedKnowledge,
-    AddResult,
-)
-from .client import (
-    MemoryClient,
-    SessionBuffer,
-    CommitHandle,
-    RetryConfig,
-    OmemClientError,
-    OmemHttpError,
-    OmemAuthError,
-    OmemForbiddenError,
-    OmemRateLimitError,
-    OmemQuotaExceededError,
-    OmemPayloadTooLargeError,
-    OmemValidationError,
-    OmemServerError,
-)
-from .types import CanonicalAttachmentV1, CanonicalTurnV1, JobStatusV1, SessionStatusV1
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .memory import Memory, Conversation
+    from .models import (
+        MemoryItem,
+        SearchResult,
+        SearchTimings,
+        Entity,
+        Event,
+        Evidence,
+        EventContext,
+        ExtractedKnowledge,
+        AddResult,
+    )
+    from .client import (
+        MemoryClient,
+        SessionBuffer,
+        CommitHandle,
+        RetryConfig,
+        OmemClientError,
+        OmemHttpError,
+        OmemAuthError,
+        OmemForbiddenError,
+        OmemRateLimitError,
+        OmemQuotaExceededError,
+        OmemPayloadTooLargeError,
+        OmemValidationError,
+        OmemServerError,
+    )
+    from .attachments import AttachmentUploader
+    from .instrumentation import RequestEvent
+    from .types import CanonicalAttachmentV1, CanonicalTurnV1, JobStatusV1, SessionStatusV1
+
+# Public names are resolved on first access (PEP 562), so `import omem` stays
+# cheap and httpx is only imported once something actually needs it.
+_LAZY: Dict[str, str] = {
+    "Memory": ".memory",
+    "Conversation": ".memory",
+    "MemoryItem": ".models",
+    "SearchResult": ".models",
+    "SearchTimings": ".models",
+    "Entity": ".models",
+    "Event": ".models",
+    "Evidence": ".models",
+    "EventContext": ".models",
+    "ExtractedKnowledge": ".models",
+    "AddResult": ".models",
+    "MemoryClient": ".client",
+    "SessionBuffer": ".client",
+    "CommitHandle": ".client",
+    "RetryConfig": ".client",
+    "OmemClientError": ".client",
+    "OmemHttpError": ".client",
+    "OmemAuthError": ".client",
+    "OmemForbiddenError": ".client",
+    "OmemRateLimitError": ".client",
+    "OmemQuotaExceededError": ".client",
+    "OmemPayloadTooLargeError": ".client",
+    "OmemValidationError": ".client",
+    "OmemServerError": ".client",
+    "AttachmentUploader": ".attachments",
+    "RequestEvent": ".instrumentation",
+    "CanonicalAttachmentV1": ".types",
+    "CanonicalTurnV1": ".types",
+    "JobStatusV1": ".types",
+    "SessionStatusV1": ".types",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
 
 # Version
 __version__ = "1.0.0"
@@ -60,6 +117,7 @@ __all__ = [
     "Conversation",
     "MemoryItem",
     "SearchResult",
+    "SearchTimings",
     "Entity",
     "Event",
     "Evidence",
@@ -81,6 +139,8 @@ __all__ = [
     "SessionBuffer",
     "CommitHandle",
     "RetryConfig",
+    "AttachmentUploader",
+    "RequestEvent",
     "CanonicalAttachmentV1",
     "CanonicalTurnV1",
     "JobStatusV1",
@@ -0,0 +1,232 @@
+"""Content-addressed attachment uploads.
+
+Attachments are identified by the sha256 of their bytes. Before uploading,
+the uploader asks the service whether that digest is already stored, so an
+identical screenshot or document shared across thousands of conversations is
+uploaded once. Files are hashed in fixed-size chunks through mmap and
+streamed on upload, so they are never read into memory whole.
+
+The result is a `CanonicalAttachmentV1` with `sha256`, `ref` and `truncated`
+filled in, ready to be sent with a turn.
+
+Usage:
+    >>> from omem.attachments import AttachmentUploader
+    >>> uploader = AttachmentUploader(client)
+    >>> att = uploader.upload("screenshot.png")
+    >>> att.ref, att.sha256
+
+With the high-level API, pass attachments on a message and they are uploaded
+at commit time:
+    >>> mem.add("conv-001", [
+    ...     {"role": "user", "content": "See attached", "attachments": ["report.pdf"]},
+    ... ])
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import mimetypes
+import mmap
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .client import MemoryClient
+from .metrics import CACHE_HITS_TOTAL
+from .types import CanonicalAttachmentV1
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# A file path, raw bytes, or a dict with "path"/"data" plus optional "type"/"name".
+AttachmentSource = Union[str, "os.PathLike[str]", bytes, Dict[str, Any]]
+
+
+def hash_file(
+    path: Union[str, "os.PathLike[str]"],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_bytes: Optional[int] = None,
+) -> Tuple[str, int]:
+    """Return (sha256 hex digest, hashed length) of a file's first `max_bytes` bytes.
+
+    The file is memory-mapped and fed to the hash in `chunk_size` slices, so
+    nothing beyond the page cache is held in memory.
+    """
+    size = os.path.getsize(path)
+    n = min(size, int(max_bytes)) if max_bytes is not None else size
+    h = hashlib.sha256()
+    if n <= 0:
+        # mmap cannot map empty files.
+        return h.hexdigest(), 0
+    step = max(1, int(chunk_size))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            for off in range(0, n, step):
+                h.update(view[off : min(off + step, n)])
+        finally:
+            view.release()
+    return h.hexdigest(), n
+
+
+def _file_body(path: Union[str, "os.PathLike[str]"], length: int, chunk_size: int) -> Iterator[bytes]:
+    remaining = length
+    with open(path, "rb") as f:
+        while remaining > 0:
+            block = f.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _guess_type(name: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Return (attachment type, MIME type) for a file name."""
+    mime = mimetypes.guess_type(name)[0] if name else None
+    major = (mime or "").split("/", 1)[0]
+    return (major if major in ("image", "video", "audio", "text") else "file"), mime
+
+
+class AttachmentUploader:
+    """Hashes, deduplicates and uploads attachments with bounded concurrency.
+
+    Thread-safe. Digests already seen by this uploader are answered from an
+    in-process cache; concurrent uploads of the same digest share one request.
+    """
+
+    def __init__(
+        self,
+        client: MemoryClient,
+        *,
+        max_concurrency: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = None,
+        cache_size: int = 10000,
+    ) -> None:
+        """Create an uploader.
+
+        Args:
+            client: MemoryClient used for the attachment endpoints.
+            max_concurrency: Maximum simultaneous lookups/uploads.
+            chunk_size: Hashing and upload chunk size in bytes.
+            max_bytes: Optional size cap; larger attachments are truncated to
+                this many bytes and marked `truncated=True`.
+            cache_size: Number of digest -> ref entries remembered in-process.
+        """
+        self._client = client
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._chunk_size = max(1, int(chunk_size))
+        self._max_bytes = int(max_bytes) if max_bytes is not None else None
+        self._cache_size = max(0, int(cache_size))
+        self._known: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self._max_concurrency)
+        self.uploads = 0
+        self.dedup_hits = 0
+
+    def upload(
+        self,
+        source: AttachmentSource,
+        *,
+        type: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> CanonicalAttachmentV1:
+        """Upload one attachment (if needed) and return its canonical form."""
+        if isinstance(source, dict):
+            type = type or source.get("type")
+            name = name or source.get("name")
+            source = source.get("path") if source.get("path") is not None else source.get("data")
+            if source is None:
+                raise ValueError("attachment dict needs a 'path' or 'data' field")
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = bytes(source)
+            truncated = self._max_bytes is not None and len(data) > self._max_bytes
+            if truncated:
+                data = data[: self._max_bytes]
+            digest, size = hashlib.sha256(data).hexdigest(), len(data)
+            body = lambda: data  # noqa: E731
+        else:
+            path = os.fspath(source)
+            name = name or os.path.basename(path)
+            digest, size = hash_file(path, chunk_size=self._chunk_size, max_bytes=self._max_bytes)
+            truncated = size < os.path.getsize(path)
+            body = lambda: _file_body(path, size, self._chunk_size)  # noqa: E731
+
+        guessed, mime = _guess_type(name)
+        ref = self._ensure_uploaded(digest, body, size=size, content_type=mime, name=name)
+        return CanonicalAttachmentV1(
+            type=str(type or guessed),
+            name=name,
+            truncated=bool(truncated),
+            sha256=digest,
+            ref=ref,
+        )
+
+    def upload_many(self, sources: Sequence[AttachmentSource]) -> List[CanonicalAttachmentV1]:
+        """Upload several attachments concurrently, preserving order."""
+        if not sources:
+            return []
+        if len(sources) == 1:
+            return [self.upload(sources[0])]
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_concurrency, len(sources)),
+            thread_name_prefix="omem-attach",
+        ) as pool:
+            return list(pool.map(self.upload, sources))
+
+    def _hit(self, source: str) -> None:
+        with self._lock:
+            self.dedup_hits += 1
+        self._client.metrics.incr(CACHE_HITS_TOTAL, {"cache": "attachments", "source": source})
+
+    def _ensure_uploaded(self, digest: str, body: Any, **kwargs: Any) -> str:
+        with self._lock:
+            ref = self._known.get(digest)
+            if ref is not None:
+                self._known.move_to_end(digest)
+            else:
+                fut = self._inflight.get(digest)
+                owner = fut is None
+                if owner:
+                    fut = self._inflight[digest] = Future()
+        if ref is not None:
+            self._hit("local")
+            return ref
+        if not owner:
+            # Someone else is uploading the same bytes right now.
+            self._hit("inflight")
+            return fut.result()  # type: ignore[union-attr]
+
+        try:
+            with self._slots:
+                ref = self._client.attachment_lookup(digest)
+                if ref is None:
+                    ref = self._client.upload_attachment(digest, body, **kwargs)
+                    with self._lock:
+                        self.uploads += 1
+                else:
+                    self._hit("remote")
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[digest]
+            fut.set_exception(exc)  # type: ignore[union-attr]
+            raise
+        with self._lock:
+            del self._inflight[digest]
+            if self._cache_size:
+                self._known[digest] = ref
+                while len(self._known) > self._cache_size:
+                    self._known.popitem(last=False)
+        fut.set_result(ref)  # type: ignore[union-attr]
+        return ref
+
+
+__all__ = [
+    "AttachmentSource",
+    "AttachmentUploader",
+    "hash_file",
+]
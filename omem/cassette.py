@@ -0,0 +1,252 @@
+"""Record/replay HTTP cassettes for deterministic offline tests and benchmarks.
+
+Record real traffic once, then replay it through the normal MemoryClient
+request path (serialization, retries, error mapping, parsing) without a
+network:
+
+    >>> import httpx
+    >>> from omem import MemoryClient
+    >>> from omem.cassette import RecordingTransport, ReplayTransport
+    >>> # Record
+    >>> http = httpx.Client(transport=RecordingTransport("search.cassette.jsonl"))
+    >>> client = MemoryClient(base_url=..., tenant_id="__from_api_key__", api_token=key, http=http)
+    >>> # Replay, optionally sleeping for each response's original latency
+    >>> http = httpx.Client(transport=ReplayTransport("search.cassette.jsonl", simulate_latency=True))
+
+A cassette is a JSON Lines file (gzip-compressed when the name ends in
+".gz"), one interaction per line. Credential headers (`x-api-key`,
+`x-api-token`, `authorization`) are replaced by "<scrubbed>" before anything
+is written.
+"""
+
+from __future__ import annotations
+
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Deque, Dict, IO, Iterable, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+DEFAULT_SCRUB_HEADERS = ("x-api-key", "x-api-token", "authorization")
+SCRUBBED = "<scrubbed>"
+
+# Recorded response bodies are stored decoded, so these no longer apply on replay.
+_DROP_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CassetteMiss(LookupError):
+    """Raised by ReplayTransport when no recorded interaction matches a request."""
+
+
+def _open(path: Union[str, "os.PathLike[str]"], mode: str) -> IO[str]:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode_body(data: bytes) -> Dict[str, str]:
+    if not data:
+        return {}
+    try:
+        return {"body": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(data).decode("ascii")}
+
+
+def _decode_body(d: Dict[str, Any]) -> bytes:
+    if "body_b64" in d:
+        return base64.b64decode(d["body_b64"])
+    return str(d.get("body") or "").encode("utf-8")
+
+
+def _target(url: httpx.URL) -> str:
+    return url.raw_path.decode("ascii")
+
+
+def _body_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest() if data else ""
+
+
+def load_cassette(path: Union[str, "os.PathLike[str]"]) -> List[Dict[str, Any]]:
+    """Read all interactions from a cassette file."""
+    out: List[Dict[str, Any]] = []
+    with _open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                out.append(json.loads(line))
+    return out
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Passes requests to a real transport and appends each exchange to a cassette."""
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        transport: Optional[httpx.BaseTransport] = None,
+        scrub_headers: Sequence[str] = DEFAULT_SCRUB_HEADERS,
+        append: bool = False,
+    ) -> None:
+        """Create a recorder.
+
+        Args:
+            path: Cassette file to write (".gz" for gzip).
+            transport: Transport that performs the real requests
+                (default: httpx.HTTPTransport()).
+            scrub_headers: Request/response headers whose values are never written.
+            append: Add to an existing cassette instead of truncating it.
+        """
+        self._inner = transport or httpx.HTTPTransport()
+        self._scrub = {h.lower() for h in scrub_headers}
+        self._lock = threading.Lock()
+        self._file = _open(path, "a" if append else "w")
+        self.recorded = 0
+
+    def _headers(self, headers: httpx.Headers, drop: Iterable[str] = ()) -> List[Tuple[str, str]]:
+        dropped = set(drop)
+        out: List[Tuple[str, str]] = []
+        for k, v in headers.multi_items():
+            key = k.lower()
+            if key in dropped:
+                continue
+            out.append((key, SCRUBBED if key in self._scrub else v))
+        return out
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        t0 = time.perf_counter()
+        resp = self._inner.handle_request(request)
+        try:
+            content = resp.read()
+        finally:
+            resp.close()
+        duration_ms = (time.perf_counter() - t0) * 1000
+
+        entry: Dict[str, Any] = {
+            "request": {
+                "method": request.method,
+                "url": _target(request.url),
+                "headers": self._headers(request.headers),
+                **_encode_body(body),
+            },
+            "response": {
+                "status": resp.status_code,
+                "headers": self._headers(resp.headers, _DROP_RESPONSE_HEADERS),
+                **_encode_body(content),
+            },
+            "duration_ms": round(duration_ms, 3),
+        }
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.recorded += 1
+
+        return httpx.Response(
+            resp.status_code,
+            headers=[(k, v) for k, v in resp.headers.multi_items() if k.lower() not in _DROP_RESPONSE_HEADERS],
+            content=content,
+            request=request,
+            extensions={"http_version": resp.extensions.get("http_version", b"HTTP/1.1")},
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self._inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serves recorded responses for matching requests.
+
+    Requests are matched on method and path+query (and on the request body
+    when `match_body=True`). Repeated identical requests are answered in
+    recording order; once a match's recordings are used up the last one is
+    repeated, unless `allow_repeats=False`.
+    """
+
+    def __init__(
+        self,
+        cassette: Union[str, "os.PathLike[str]", Sequence[Dict[str, Any]]],
+        *,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        match_body: bool = False,
+        allow_repeats: bool = True,
+    ) -> None:
+        """Create a replayer.
+
+        Args:
+            cassette: Cassette path or already-loaded interactions.
+            simulate_latency: Sleep for each interaction's recorded duration.
+            latency_scale: Multiplier applied to recorded durations.
+            match_body: Also require an identical request body.
+            allow_repeats: Re-serve the last matching interaction when exhausted.
+        """
+        interactions = load_cassette(cassette) if isinstance(cassette, (str, os.PathLike)) else list(cassette)
+        self._simulate = bool(simulate_latency)
+        self._scale = max(0.0, float(latency_scale))
+        self._match_body = bool(match_body)
+        self._allow_repeats = bool(allow_repeats)
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, ...], Deque[Dict[str, Any]]] = collections.defaultdict(collections.deque)
+        self._last: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        for it in interactions:
+            self._queues[self._key_for(it["request"])].append(it)
+        self.served = 0
+
+    def _key(self, method: str, url: str, body: bytes) -> Tuple[str, ...]:
+        if self._match_body:
+            return (method.upper(), url, _body_digest(body))
+        return (method.upper(), url)
+
+    def _key_for(self, req: Dict[str, Any]) -> Tuple[str, ...]:
+        return self._key(req["method"], req["url"], _decode_body(req))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = self._key(request.method, _target(request.url), request.read())
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                it = queue.popleft()
+                self._last[key] = it
+            elif self._allow_repeats and key in self._last:
+                it = self._last[key]
+            else:
+                raise CassetteMiss(f"no recorded interaction for {request.method} {_target(request.url)}")
+            self.served += 1
+
+        if self._simulate:
+            delay = float(it.get("duration_ms") or 0.0) * self._scale / 1000
+            if delay > 0:
+                time.sleep(delay)
+        resp = it["response"]
+        return httpx.Response(
+            int(resp["status"]),
+            headers=[(k, v) for k, v in resp.get("headers") or []],
+            content=_decode_body(resp),
+            request=request,
+        )
+
+    @property
+    def remaining(self) -> int:
+        """Number of recorded interactions not yet served."""
+        with self._lock:
+            return sum(len(q) for q in self._queues.values())
+
+
+__all__ = [
+    "CassetteMiss",
+    "RecordingTransport",
+    "ReplayTransport",
+    "load_cassette",
+]
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+import os
 import random
+import threading
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
 
 import json
 import warnings
 
 import httpx
 
+from .metrics import MetricsRegistry
 from .types import CanonicalAttachmentV1, CanonicalTurnV1, JobStatusV1, SessionStatusV1
 
+if TYPE_CHECKING:
+    # Imported where first used: hooks, shared transports and graph iterators
+    # are opt-in, and pagination pulls in more than a plain client needs.
+    from .instrumentation import PhaseTracer, RequestHook
+    from .pagination import GraphItems, PageFetcher
+    from .transports import SharedTransport, SharedTransportRegistry
+
 
 class OmemClientError(RuntimeError):
     pass
@@ -296,7 +306,29 @@ class MemoryClient:
         retry_config: Optional[RetryConfig] = None,
         http: Optional[httpx.Client] = None,
         mode: str = "saas",
+        hooks: Optional[Sequence[RequestHook]] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_s: float = 5.0,
+        http2: bool = False,
+        shared_transport: Union[bool, SharedTransportRegistry] = False,
+        headers: Optional[Mapping[str, str]] = None,
     ) -> None:
+        """Create a client.
+
+        The connection-pool options (`max_connections`,
+        `max_keepalive_connections`, `keepalive_expiry_s`) and `http2` configure
+        the httpx.Client built on first request; they are ignored when `http`
+        is given. `http2=True` multiplexes concurrent requests over one
+        connection and requires the `h2` package (`pip install omem[http2]`).
+
+        With `shared_transport=True` (or a SharedTransportRegistry), the client
+        borrows the connection pool shared by every client with the same
+        origin and pool settings (see omem.transports); its own httpx.Client
+        (cookies, headers) stays private. close() releases the pool.
+        `headers` are added to every request this instance makes.
+        """
         self.base_url = _normalize_base_url(base_url)
         self.tenant_id = str(tenant_id or "").strip()
         if not self.tenant_id:
@@ -326,10 +358,135 @@ class MemoryClient:
         self.api_token = (str(api_token).strip() if api_token else None)
         self._timeout_s = float(timeout_s)
         self._retry = retry_config or RetryConfig()
-        self._http = http or httpx.Client(timeout=self._timeout_s)
+        if int(max_connections) <= 0:
+            raise ValueError("max_connections must be > 0")
+        if http2 and http is None:
+            import importlib.util
+
+            if importlib.util.find_spec("h2") is None:
+                raise ImportError("http2=True requires the 'h2' package: pip install omem[http2]")
+        self._limits = httpx.Limits(
+            max_connections=int(max_connections),
+            max_keepalive_connections=min(int(max_keepalive_connections), int(max_connections)),
+            keepalive_expiry=float(keepalive_expiry_s),
+        )
+        self._http2 = bool(http2)
+        # Built on first request so constructing a client does no I/O setup.
+        self._http_client: Optional[httpx.Client] = http
+        self._http_lock = threading.Lock()
+        self._registry: Optional[SharedTransportRegistry] = None
+        self._shared: Optional[SharedTransport] = None
+        if http is None and shared_transport is not False:
+            from .transports import default_registry
+
+            self._registry = default_registry() if shared_transport is True else shared_transport
+        self._pid = os.getpid()
+        self._default_headers = {str(k): str(v) for k, v in (headers or {}).items()}
+        self._last_used = time.monotonic()
+        self._keepalive_stop: Optional[threading.Event] = None
+        # Copy-on-write so _send can iterate without locking.
+        self._hooks: List[RequestHook] = list(hooks or [])
+        # Always on; pass a shared registry to aggregate several clients.
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+
+    @property
+    def _http(self) -> httpx.Client:
+        http = self._http_client
+        if http is None or (self._registry is not None and self._pid != os.getpid()):
+            with self._http_lock:
+                if self._registry is not None:
+                    if self._http_client is None or self._pid != os.getpid():
+                        # After a fork the inherited pool belongs to the parent.
+                        self._shared = self._registry.acquire(
+                            self.base_url, timeout_s=self._timeout_s, limits=self._limits, http2=self._http2
+                        )
+                        self._http_client = httpx.Client(timeout=self._timeout_s, transport=self._shared)
+                        self._pid = os.getpid()
+                elif self._http_client is None:
+                    self._http_client = httpx.Client(timeout=self._timeout_s, limits=self._limits, http2=self._http2)
+                http = self._http_client
+        return http
 
     def close(self) -> None:
-        self._http.close()
+        self.stop_keepalive()
+        with self._http_lock:
+            http, registry, shared = self._http_client, self._registry, self._shared
+            if registry is not None:
+                self._http_client = self._shared = None
+        if http is None:
+            return
+        http.close()  # a SharedTransport survives this
+        if registry is not None and shared is not None and self._pid == os.getpid():
+            registry.release(shared)
+
+    # ========== Connection Management ==========
+
+    def _ping(self, timeout_s: Optional[float] = None) -> bool:
+        """One unretried, unmetered GET /debug/config; True if any HTTP response came back."""
+        try:
+            self._http.request(
+                "GET",
+                f"{self.base_url}/debug/config",
+                headers=self._headers(),
+                timeout=(self._timeout_s if timeout_s is None else float(timeout_s)),
+            )
+        except httpx.HTTPError:
+            return False
+        return True
+
+    def warmup(self, *, connections: int = 1, timeout_s: Optional[float] = None) -> int:
+        """Open pooled connections now so the first real request skips DNS/TCP/TLS setup.
+
+        Sends `connections` concurrent lightweight requests (a 404 from
+        deployments without the debug endpoint still leaves a warm
+        connection). With HTTP/2 a single connection is enough.
+
+        Returns:
+            Number of requests that reached the server.
+        """
+        n = max(1, min(int(connections), self._limits.max_keepalive_connections or 1))
+        if self._http2 or n == 1:
+            return int(self._ping(timeout_s))
+        results: List[bool] = []
+        threads = [threading.Thread(target=lambda: results.append(self._ping(timeout_s))) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sum(results)
+
+    def start_keepalive(self, interval_s: float = 20.0) -> None:
+        """Ping in the background whenever the client has been idle for `interval_s`.
+
+        Keeps a pooled connection open across sporadic traffic; choose an
+        interval below `keepalive_expiry_s` and the server's idle timeout.
+        """
+        interval = float(interval_s)
+        if interval <= 0:
+            raise ValueError("interval_s must be > 0")
+        self.stop_keepalive()
+        stop = self._keepalive_stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(max(0.0, self._last_used + interval - time.monotonic())):
+                if time.monotonic() - self._last_used >= interval:
+                    self._ping()
+                    self._last_used = time.monotonic()
+
+        threading.Thread(target=loop, name="omem-keepalive", daemon=True).start()
+
+    def stop_keepalive(self) -> None:
+        stop, self._keepalive_stop = self._keepalive_stop, None
+        if stop is not None:
+            stop.set()
+
+    def add_request_hook(self, hook: RequestHook) -> None:
+        """Register a callable that receives a RequestEvent for every HTTP attempt."""
+        self._hooks = self._hooks + [hook]
+
+    def remove_request_hook(self, hook: RequestHook) -> None:
+        """Unregister a hook added with add_request_hook() (no-op if absent)."""
+        self._hooks = [h for h in self._hooks if h is not hook]
 
     def session(self, *, session_id: str, sync_cursor: bool = False) -> SessionBuffer:
         buf = SessionBuffer(client=self, session_id=session_id)
@@ -381,14 +538,14 @@ class MemoryClient:
         jid = str(job_id or "").strip()
         if not jid:
             raise ValueError("job_id is required")
-        payload = self._request_json("GET", f"/ingest/jobs/{jid}")
+        payload = self._request_json("GET", f"/ingest/jobs/{jid}", endpoint="/ingest/jobs/{job_id}")
         return _coerce_job_status(payload)
 
     def get_session(self, session_id: str) -> SessionStatusV1:
         sid = str(session_id or "").strip()
         if not sid:
             raise ValueError("session_id is required")
-        payload = self._request_json("GET", f"/ingest/sessions/{sid}")
+        payload = self._request_json("GET", f"/ingest/sessions/{sid}", endpoint="/ingest/sessions/{session_id}")
         return _coerce_session_status(payload)
 
     def retrieve_dialog_v2(
@@ -406,7 +563,10 @@ class MemoryClient:
         time_hints: Optional[Dict[str, Any]] = None,
         client_meta: Optional[Dict[str, Any]] = None,
         strategy: str = "dialog_v2",
+        timing: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        # `timing`, when given, is filled with client-side phase timings and the
+        # raw Server-Timing header (see omem.timings.build_search_timings).
         # SaaS mode: backend (Gateway + BFF) owns user_tokens and client_meta.
         saas_mode = self._mode == "saas" or self.tenant_id == "__from_api_key__"
 
@@ -439,7 +599,7 @@ class MemoryClient:
                 body["user_tokens"] = list(self.user_tokens)
         if not saas_mode and client_meta:
             body["client_meta"] = dict(client_meta)
-        return self._request_json("POST", "/retrieval", json_body=body)
+        return self._request_json("POST", "/retrieval", json_body=body, timing=timing)
 
     def debug_config(self) -> Dict[str, Any]:
         """Fetch effective backend configuration for this client (if supported).
@@ -449,6 +609,77 @@ class MemoryClient:
         """
         return self._request_json("GET", "/debug/config")
 
+    # ========== Attachment API Methods ==========
+
+    def attachment_lookup(self, sha256: str) -> Optional[str]:
+        """Return the stored ref for content with this sha256, or None if unknown.
+
+        Backend: GET /attachments/{sha256} -> {"ref": ...}, 404 when unknown.
+        This route is an assumed backend contract; deployments without it
+        raise OmemHttpError.
+        """
+        digest = str(sha256 or "").strip().lower()
+        if not digest:
+            raise ValueError("sha256 is required")
+        try:
+            payload = self._request_json("GET", f"/attachments/{digest}", endpoint="/attachments/{sha256}")
+        except OmemHttpError as exc:
+            if exc.status_code == 404:
+                return None
+            raise
+        ref = str(payload.get("ref") or "").strip()
+        return ref or None
+
+    def upload_attachment(
+        self,
+        sha256: str,
+        content: Callable[[], Any],
+        *,
+        size: int,
+        content_type: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> str:
+        """Upload attachment bytes under their sha256 and return the stored ref.
+
+        Backend: PUT /attachments/{sha256} -> {"ref": ...} (assumed backend
+        contract, see attachment_lookup).
+
+        Args:
+            sha256: Hex digest of exactly the bytes being uploaded.
+            content: Factory returning the body (bytes or an iterator of bytes);
+                called again on retry.
+            size: Body length in bytes.
+            content_type: Optional MIME type.
+            name: Optional original file name.
+
+        Raises:
+            OmemClientError: If the response carries no ref.
+        """
+        digest = str(sha256 or "").strip().lower()
+        if not digest:
+            raise ValueError("sha256 is required")
+        headers = {
+            "Content-Type": content_type or "application/octet-stream",
+            "Content-Length": str(int(size)),
+        }
+        if name:
+            headers["X-Attachment-Name"] = str(name)
+        resp = self._send(
+            "PUT",
+            f"/attachments/{digest}",
+            content=content,
+            extra_headers=headers,
+            endpoint="/attachments/{sha256}",
+        )
+        try:
+            payload = resp.json()
+        except Exception:
+            payload = {}
+        ref = str((payload or {}).get("ref") or "").strip() if isinstance(payload, dict) else ""
+        if not ref:
+            raise OmemClientError(f"attachment_upload_missing_ref: status={resp.status_code} sha256={digest}")
+        return ref
+
     # ========== TKG Graph API Methods ==========
 
     def graph_resolve_entities(
@@ -487,27 +718,36 @@ class MemoryClient:
         eid = str(event_id or "").strip()
         if not eid:
             raise ValueError("event_id is required")
-        return self._request_json("GET", f"/graph/v0/explain/event/{eid}")
+        return self._request_json(
+            "GET", f"/graph/v0/explain/event/{eid}", endpoint="/graph/v0/explain/event/{event_id}"
+        )
 
     def graph_entity_timeline(
         self,
         entity_id: str,
         *,
         limit: int = 200,
+        cursor: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Get timeline of events/evidences for an entity.
 
         Args:
             entity_id: Entity ID.
             limit: Maximum number of results.
+            cursor: Page cursor from a previous response's "next_cursor".
+            offset: Number of results to skip (when the backend has no cursor).
 
         Returns:
             Dict with timeline data.
         """
+        params: Dict[str, Any] = {"limit": limit}
+        _add_page_params(params, cursor, offset)
         return self._request_json(
             "GET",
             f"/graph/v0/entities/{entity_id}/timeline",
-            params={"limit": limit},
+            params=params,
+            endpoint="/graph/v0/entities/{entity_id}/timeline",
         )
 
     def graph_search_events(
@@ -544,6 +784,8 @@ class MemoryClient:
         entity_id: Optional[str] = None,
         place_id: Optional[str] = None,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """List events with optional filters.
 
@@ -551,6 +793,8 @@ class MemoryClient:
             entity_id: Filter by entity involvement.
             place_id: Filter by place.
             limit: Maximum number of results.
+            cursor: Page cursor from a previous response's "next_cursor".
+            offset: Number of results to skip (when the backend has no cursor).
 
         Returns:
             Dict with "items" list of events.
@@ -560,6 +804,7 @@ class MemoryClient:
             params["entity_id"] = entity_id
         if place_id:
             params["place_id"] = place_id
+        _add_page_params(params, cursor, offset)
         return self._request_json("GET", "/graph/v0/events", params=params)
 
     def graph_timeslices_range(
@@ -569,6 +814,8 @@ class MemoryClient:
         *,
         granularity: Optional[str] = None,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Query timeslices within a time range.
 
@@ -577,6 +824,8 @@ class MemoryClient:
             end: ISO format end time.
             granularity: Optional granularity filter (e.g., "day", "hour").
             limit: Maximum number of results.
+            cursor: Page cursor from a previous response's "next_cursor".
+            offset: Number of results to skip (when the backend has no cursor).
 
         Returns:
             Dict with "items" list of timeslices.
@@ -584,6 +833,7 @@ class MemoryClient:
         params: Dict[str, Any] = {"start": start, "end": end, "limit": limit}
         if granularity:
             params["granularity"] = granularity
+        _add_page_params(params, cursor, offset)
         return self._request_json("GET", "/graph/v0/timeslices/range", params=params)
 
     def graph_timeslice_events(
@@ -591,20 +841,27 @@ class MemoryClient:
         timeslice_id: str,
         *,
         limit: int = 50,
+        cursor: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Get events within a specific timeslice.
 
         Args:
             timeslice_id: Timeslice ID.
             limit: Maximum number of results.
+            cursor: Page cursor from a previous response's "next_cursor".
+            offset: Number of results to skip (when the backend has no cursor).
 
         Returns:
             Dict with "items" list of events.
         """
+        params: Dict[str, Any] = {"limit": limit}
+        _add_page_params(params, cursor, offset)
         return self._request_json(
             "GET",
             f"/graph/v0/timeslices/{timeslice_id}/events",
-            params={"limit": limit},
+            params=params,
+            endpoint="/graph/v0/timeslices/{timeslice_id}/events",
         )
 
     def graph_entity_evidences(
@@ -614,6 +871,8 @@ class MemoryClient:
         subtype: Optional[str] = None,
         source_id: Optional[str] = None,
         limit: int = 50,
+        cursor: Optional[str] = None,
+        offset: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Get evidences for an entity.
 
@@ -622,6 +881,8 @@ class MemoryClient:
             subtype: Optional evidence subtype filter.
             source_id: Optional source ID filter.
             limit: Maximum number of results (default: 50, max: 200).
+            cursor: Page cursor from a previous response's "next_cursor".
+            offset: Number of results to skip (when the backend has no cursor).
 
         Returns:
             Dict with "items" list of evidence objects.
@@ -633,14 +894,189 @@ class MemoryClient:
             params["subtype"] = subtype
         if source_id:
             params["source_id"] = source_id
+        _add_page_params(params, cursor, offset)
         return self._request_json(
             "GET",
             f"/graph/v0/entities/{entity_id}/evidences",
             params=params,
+            endpoint="/graph/v0/entities/{entity_id}/evidences",
+        )
+
+    # ========== Paginated graph iterators ==========
+    #
+    # Each iter_* method walks every page of the matching graph_* listing and
+    # yields items one at a time, prefetching the next page in the background;
+    # the returned GraphItems can also build NumPy/Arrow columns (to_numpy()/
+    # to_arrow()).
+    # aiter_* methods are the asyncio equivalents (use with `async for`).
+
+    def iter_entity_timeline(
+        self,
+        entity_id: str,
+        *,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> GraphItems:
+        """Iterate over an entity's full timeline (see graph_entity_timeline)."""
+        fetch = self._page_fetcher(self.graph_entity_timeline, entity_id, limit=page_size)
+        return self._graph_items(fetch, "timeline", page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def aiter_entity_timeline(
+        self,
+        entity_id: str,
+        *,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_entity_timeline()."""
+        fetch = self._page_fetcher(self.graph_entity_timeline, entity_id, limit=page_size)
+        return self._aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def iter_list_events(
+        self,
+        *,
+        entity_id: Optional[str] = None,
+        place_id: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> GraphItems:
+        """Iterate over all events matching the filters (see graph_list_events)."""
+        fetch = self._page_fetcher(
+            self.graph_list_events, entity_id=entity_id, place_id=place_id, limit=page_size
+        )
+        return self._graph_items(fetch, "events", page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def aiter_list_events(
+        self,
+        *,
+        entity_id: Optional[str] = None,
+        place_id: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_list_events()."""
+        fetch = self._page_fetcher(
+            self.graph_list_events, entity_id=entity_id, place_id=place_id, limit=page_size
+        )
+        return self._aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def iter_entity_evidences(
+        self,
+        entity_id: str,
+        *,
+        subtype: Optional[str] = None,
+        source_id: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> GraphItems:
+        """Iterate over all evidences for an entity (see graph_entity_evidences)."""
+        fetch = self._page_fetcher(
+            self.graph_entity_evidences, entity_id, subtype=subtype, source_id=source_id, limit=page_size
+        )
+        return self._graph_items(fetch, "evidences", page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def aiter_entity_evidences(
+        self,
+        entity_id: str,
+        *,
+        subtype: Optional[str] = None,
+        source_id: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_entity_evidences()."""
+        fetch = self._page_fetcher(
+            self.graph_entity_evidences, entity_id, subtype=subtype, source_id=source_id, limit=page_size
+        )
+        return self._aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def iter_timeslices_range(
+        self,
+        start: str,
+        end: str,
+        *,
+        granularity: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> GraphItems:
+        """Iterate over all timeslices in a time range (see graph_timeslices_range)."""
+        fetch = self._page_fetcher(
+            self.graph_timeslices_range, start, end, granularity=granularity, limit=page_size
+        )
+        return self._graph_items(fetch, "timeslices", page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def aiter_timeslices_range(
+        self,
+        start: str,
+        end: str,
+        *,
+        granularity: Optional[str] = None,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_timeslices_range()."""
+        fetch = self._page_fetcher(
+            self.graph_timeslices_range, start, end, granularity=granularity, limit=page_size
         )
+        return self._aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def iter_timeslice_events(
+        self,
+        timeslice_id: str,
+        *,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> GraphItems:
+        """Iterate over all events in a timeslice (see graph_timeslice_events)."""
+        fetch = self._page_fetcher(self.graph_timeslice_events, timeslice_id, limit=page_size)
+        return self._graph_items(fetch, "events", page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    def aiter_timeslice_events(
+        self,
+        timeslice_id: str,
+        *,
+        page_size: int = 200,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Async version of iter_timeslice_events()."""
+        fetch = self._page_fetcher(self.graph_timeslice_events, timeslice_id, limit=page_size)
+        return self._aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    @staticmethod
+    def _graph_items(
+        fetch: PageFetcher, kind: str, *, page_size: int, max_items: Optional[int], prefetch: bool
+    ) -> GraphItems:
+        from .pagination import GraphItems, iter_pages
+
+        return GraphItems(iter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch), kind)
+
+    @staticmethod
+    def _aiter_pages(
+        fetch: PageFetcher, *, page_size: int, max_items: Optional[int], prefetch: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        from .pagination import aiter_pages
+
+        return aiter_pages(fetch, page_size=page_size, max_items=max_items, prefetch=prefetch)
+
+    @staticmethod
+    def _page_fetcher(method: Callable[..., Dict[str, Any]], *args: Any, **kwargs: Any) -> PageFetcher:
+        def fetch(cursor: Optional[str], offset: int) -> Dict[str, Any]:
+            return method(*args, cursor=cursor, offset=(offset or None), **kwargs)
+
+        return fetch
 
     def _headers(self) -> Dict[str, str]:
-        h: Dict[str, str] = {}
+        h: Dict[str, str] = dict(self._default_headers)
         
         # In SaaS mode, gateway injects x-tenant-id header from API key lookup.
         # SDK should NOT send X-Tenant-ID header in SaaS mode.
@@ -667,39 +1103,202 @@ class MemoryClient:
         *,
         json_body: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        timing: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        resp = self._send(method, path, json_body=json_body, params=params, endpoint=endpoint, timing=timing)
+        try:
+            if timing is None:
+                return resp.json()  # type: ignore[no-any-return]
+            t0 = time.perf_counter()
+            data = resp.json()
+            timing["decode_ms"] = (time.perf_counter() - t0) * 1000
+            return data  # type: ignore[no-any-return]
+        except Exception:
+            # Keep raw for diagnostics.
+            try:
+                txt = resp.text
+            except Exception:
+                txt = "<unreadable>"
+            raise OmemClientError(f"invalid_json_response: {txt[:500]}")
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        content: Optional[Callable[[], Any]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        endpoint: Optional[str] = None,
+        timing: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Send one request with retries and return the (successful) response.
+
+        `content` is a factory for a raw request body (bytes or an iterator of
+        bytes); it is called once per attempt so streamed bodies can be retried.
+        `endpoint` is the route template reported to hooks and metrics (defaults
+        to `path`). `timing`, when given, receives `started`, `encode_ms`,
+        `network_ms`, `backoff_ms`, `attempts` and `server_timing`.
+        """
         url = f"{self.base_url}{path}"
         headers = self._headers()
+        if extra_headers:
+            headers.update(extra_headers)
         request_id = _ensure_request_id(headers)
+        method = method.upper()
+        if timing is not None:
+            timing["started"] = time.perf_counter()
+            timing["network_ms"] = timing["backoff_ms"] = 0.0
+            if content is None and json_body is not None:
+                # Encode up front (as httpx would) so encoding time is measurable.
+                raw = json.dumps(json_body, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+                timing["encode_ms"] = (time.perf_counter() - timing["started"]) * 1000
+                headers["Content-Type"] = "application/json"
+                content = lambda: raw  # noqa: E731
 
         attempt = 0
+        backoff_s = 0.0
         while True:
+            hooks = self._hooks
+            tracer: Optional[PhaseTracer] = None
+            if hooks:
+                from .instrumentation import PhaseTracer
+
+                tracer = PhaseTracer()
+            kwargs: Dict[str, Any] = {"headers": headers, "params": params}
+            if content is not None:
+                kwargs["content"] = content()
+            else:
+                kwargs["json"] = json_body
+            if tracer is not None:
+                kwargs["extensions"] = {"trace": tracer}
+            started = time.time()
+            t0 = time.perf_counter()
+            self._last_used = time.monotonic()
             try:
-                resp = self._http.request(method.upper(), url, headers=headers, json=json_body, params=params)
+                resp = self._http.request(method, url, **kwargs)
             except Exception as exc:
-                if _should_retry_exc(exc) and attempt < self._retry.max_retries:
-                    _sleep_backoff(self._retry, attempt, None)
+                retry = _should_retry_exc(exc) and attempt < self._retry.max_retries
+                self._observe(hooks, method, endpoint or path, url, attempt, request_id, backoff_s,
+                              started, t0, tracer, None, type(exc).__name__, retry, timing)
+                if retry:
+                    backoff_s = _sleep_backoff(self._retry, attempt, None)
                     attempt += 1
                     continue
                 raise OmemClientError(f"http_request_failed: {type(exc).__name__}: {exc}") from exc
 
             if resp.status_code >= 400:
                 err = _http_error_from_response(resp, request_id=request_id)
-                if _should_retry_status(resp.status_code) and attempt < self._retry.max_retries:
-                    _sleep_backoff(self._retry, attempt, err.retry_after_s)
+                retry = _should_retry_status(resp.status_code) and attempt < self._retry.max_retries
+                self._observe(hooks, method, endpoint or path, url, attempt, request_id, backoff_s,
+                              started, t0, tracer, resp, type(err).__name__, retry, timing)
+                if retry:
+                    backoff_s = _sleep_backoff(self._retry, attempt, err.retry_after_s)
                     attempt += 1
                     continue
                 raise err
 
+            self._observe(hooks, method, endpoint or path, url, attempt, request_id, backoff_s,
+                          started, t0, tracer, resp, None, False, timing)
+            return resp
+
+    def _observe(
+        self,
+        hooks: Sequence[RequestHook],
+        method: str,
+        endpoint: str,
+        url: str,
+        attempt: int,
+        request_id: str,
+        backoff_s: float,
+        started: float,
+        t0: float,
+        tracer: Optional[PhaseTracer],
+        resp: Optional[httpx.Response],
+        error_type: Optional[str],
+        will_retry: bool,
+        timing: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        duration_ms = (time.perf_counter() - t0) * 1000
+        if timing is not None:
+            timing["attempts"] = attempt + 1
+            timing["network_ms"] += duration_ms
+            timing["backoff_ms"] += backoff_s * 1000
+            if resp is not None:
+                timing["server_timing"] = ", ".join(resp.headers.get_list("server-timing"))
+        self.metrics.record_attempt(
+            method=method,
+            endpoint=endpoint,
+            status_code=(int(resp.status_code) if resp is not None else None),
+            duration_ms=duration_ms,
+            error_type=error_type,
+            will_retry=will_retry,
+        )
+        if hooks:
+            self._emit(hooks, method, endpoint, url, attempt, request_id, backoff_s,
+                       started, duration_ms, tracer, resp, error_type, will_retry)
+
+    @staticmethod
+    def _emit(
+        hooks: Sequence[RequestHook],
+        method: str,
+        endpoint: str,
+        url: str,
+        attempt: int,
+        request_id: str,
+        backoff_s: float,
+        started: float,
+        duration_ms: float,
+        tracer: Optional[PhaseTracer],
+        resp: Optional[httpx.Response],
+        error_type: Optional[str],
+        will_retry: bool,
+    ) -> None:
+        request_bytes = 0
+        response_bytes = 0
+        status_code: Optional[int] = None
+        if resp is not None:
+            status_code = int(resp.status_code)
+            # Wire bytes when streamed from a socket; body length otherwise (e.g. mocks).
+            response_bytes = int(resp.num_bytes_downloaded or len(resp.content))
             try:
-                return resp.json()  # type: ignore[no-any-return]
+                request_bytes = int(resp.request.headers.get("content-length") or 0)
             except Exception:
-                # Keep raw for diagnostics.
-                try:
-                    txt = resp.text
-                except Exception:
-                    txt = "<unreadable>"
-                raise OmemClientError(f"invalid_json_response: {txt[:500]}")
+                request_bytes = 0
+        from .instrumentation import RequestEvent
+
+        ev = RequestEvent(
+            method=method,
+            endpoint=endpoint,
+            url=url,
+            attempt=attempt,
+            request_id=(resp.headers.get("x-request-id") if resp is not None else None) or request_id,
+            status_code=status_code,
+            error_type=error_type,
+            will_retry=will_retry,
+            backoff_s=backoff_s,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes,
+            start_time=started,
+            duration_ms=duration_ms,
+            phases_ms=(dict(tracer.phases_ms) if tracer is not None else {}),
+        )
+        for hook in hooks:
+            try:
+                hook(ev)
+            except Exception:
+                # Instrumentation must never break a request.
+                pass
+
+
+def _add_page_params(params: Dict[str, Any], cursor: Optional[str], offset: Optional[int]) -> None:
+    # A cursor, when the backend issued one, takes precedence over offset.
+    if cursor:
+        params["cursor"] = str(cursor)
+    elif offset:
+        params["offset"] = int(offset)
 
 
 def _ensure_request_id(headers: Dict[str, str]) -> str:
@@ -719,7 +1318,7 @@ def _should_retry_exc(exc: Exception) -> bool:
     return isinstance(exc, httpx.RequestError)
 
 
-def _sleep_backoff(cfg: RetryConfig, attempt: int, retry_after_s: Optional[int]) -> None:
+def _sleep_backoff(cfg: RetryConfig, attempt: int, retry_after_s: Optional[int]) -> float:
     if retry_after_s is not None and retry_after_s >= 0:
         wait = float(retry_after_s)
     else:
@@ -728,8 +1327,9 @@ def _sleep_backoff(cfg: RetryConfig, attempt: int, retry_after_s: Optional[int])
             wait = random.uniform(0.0, max(wait, 0.0))
     wait = min(wait, float(cfg.max_wait_seconds))
     if wait <= 0:
-        return
+        return 0.0
     time.sleep(wait)
+    return wait
 
 
 def _parse_retry_after(resp: httpx.Response) -> Optional[int]:
@@ -0,0 +1,216 @@
+"""Columnar export of search results and graph listings to NumPy or Arrow.
+
+For offline analysis, `SearchResult.to_numpy()` / `to_arrow()` and the same
+methods on the `MemoryClient.iter_*` graph iterators build one column per
+field in a single pass over the items, without creating Event/Evidence
+model objects first:
+
+- scores and confidences become float64 columns (missing values: NaN/null),
+- timestamps become `datetime64[us]` (NumPy) or `timestamp[us, UTC]`
+  (Arrow) columns; aware values are converted to UTC, naive ones are taken
+  as UTC, and unparseable ones become NaT/null,
+- entity names become list columns, or dictionary-encoded columns with
+  `entities="dictionary"` (NumPy: flat `entities` codes, `entities_offsets`
+  and `entities_dictionary`).
+
+numpy and pyarrow are optional (`pip install omem[numpy]` /
+`pip install omem[arrow]`) and are only imported when these methods are
+called.
+"""
+
+from __future__ import annotations
+
+import importlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models import parse_datetime
+
+_STR = "str"
+_FLOAT = "float"
+_TIME = "time"
+_NAMES = "names"
+
+_Column = Tuple[str, str, Callable[[Any], Any]]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+_NAT = -(2**63)  # numpy's NaT as int64
+
+_EVIDENCE_COLUMNS: Tuple[_Column, ...] = (
+    ("id", _STR, lambda r: r.get("evidence_id") or r.get("utterance_id") or r.get("id")),
+    ("kind", _STR, lambda r: r.get("kind") or r.get("subtype")),
+    ("text", _STR, lambda r: r.get("text") or r.get("raw_text")),
+    ("confidence", _FLOAT, lambda r: r.get("confidence")),
+    ("timestamp", _TIME, lambda r: r.get("t_media_start") or r.get("timestamp")),
+    ("segment_id", _STR, lambda r: r.get("segment_id")),
+    ("event_id", _STR, lambda r: r.get("event_id")),
+)
+
+
+# Record kind -> (column name, column type, getter). "search" rows are
+# MemoryItems (read straight from their slots, timestamps unparsed); all
+# other kinds are graph listing payload dicts.
+SCHEMAS: Dict[str, Tuple[_Column, ...]] = {
+    "search": (
+        ("text", _STR, lambda it: it.text),
+        ("score", _FLOAT, lambda it: it.score),
+        ("timestamp", _TIME, lambda it: it._timestamp_raw),
+        ("source", _STR, lambda it: it.source),
+        ("event_id", _STR, lambda it: it.event_id),
+        ("entities", _NAMES, lambda it: it.entities),
+    ),
+    "events": (
+        ("id", _STR, lambda r: r.get("id")),
+        ("summary", _STR, lambda r: r.get("summary")),
+        ("timestamp", _TIME, lambda r: r.get("t_abs_start") or r.get("timestamp")),
+        ("entities", _NAMES, lambda r: r.get("involves")),
+    ),
+    "evidences": _EVIDENCE_COLUMNS,
+    "timeline": _EVIDENCE_COLUMNS,
+    "timeslices": (
+        ("id", _STR, lambda r: r.get("id")),
+        ("kind", _STR, lambda r: r.get("kind")),
+        ("start", _TIME, lambda r: r.get("t_abs_start")),
+        ("end", _TIME, lambda r: r.get("t_abs_end")),
+    ),
+}
+
+_ENTITY_MODES = ("list", "dictionary")
+
+
+def _epoch_us(value: Any) -> Optional[int]:
+    dt = parse_datetime(value)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _US
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _collect(rows: Iterable[Any], kind: str) -> Dict[str, List[Any]]:
+    """One pass over `rows` into per-column Python lists (timestamps as epoch microseconds)."""
+    schema = SCHEMAS.get(kind)
+    if schema is None:
+        raise ValueError(f"kind must be one of: {', '.join(SCHEMAS)}")
+    cols: Dict[str, List[Any]] = {name: [] for name, _, _ in schema}
+    appenders = [(cols[name].append, ctype, get) for name, ctype, get in schema]
+    for row in rows:
+        for append, ctype, get in appenders:
+            value = get(row)
+            if ctype == _STR:
+                append(str(value) if value is not None else None)
+            elif ctype == _FLOAT:
+                append(_float(value))
+            elif ctype == _TIME:
+                append(_epoch_us(value))
+            else:
+                append([str(v) for v in value] if value else [])
+    return cols
+
+
+def _require(module: str, extra: str, caller: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"{caller} requires the '{module}' package: pip install omem[{extra}]") from None
+
+
+def _check_entities(entities: str) -> None:
+    if entities not in _ENTITY_MODES:
+        raise ValueError("entities must be one of: list, dictionary")
+
+
+def _dictionary_encode(lists: List[List[str]]) -> Tuple[List[int], List[int], List[str]]:
+    """Flat codes, per-row offsets (len(lists) + 1) and the dictionary of names."""
+    index: Dict[str, int] = {}
+    codes: List[int] = []
+    offsets = [0]
+    for names in lists:
+        for name in names:
+            code = index.get(name)
+            if code is None:
+                code = index[name] = len(index)
+            codes.append(code)
+        offsets.append(len(codes))
+    return codes, offsets, list(index)
+
+
+def to_numpy(rows: Iterable[Any], kind: str, *, entities: str = "list") -> Dict[str, Any]:
+    """Columns of `rows` as a dict of NumPy arrays.
+
+    Args:
+        rows: MemoryItems (kind="search") or graph listing items.
+        kind: One of SCHEMAS ("search", "events", "evidences", "timeline",
+            "timeslices").
+        entities: "list" (object array of lists) or "dictionary" (int32
+            codes plus `entities_offsets` and `entities_dictionary`).
+
+    Returns:
+        Dict of column name to array; strings are object arrays.
+    """
+    _check_entities(entities)
+    np = _require("numpy", "numpy", "to_numpy()")
+    cols = _collect(rows, kind)
+    out: Dict[str, Any] = {}
+    for name, ctype, _ in SCHEMAS[kind]:
+        values = cols[name]
+        if ctype == _STR:
+            out[name] = np.array(values, dtype=object)
+        elif ctype == _FLOAT:
+            out[name] = np.array([float("nan") if v is None else v for v in values], dtype=np.float64)
+        elif ctype == _TIME:
+            out[name] = np.array([_NAT if v is None else v for v in values], dtype=np.int64).view("datetime64[us]")
+        elif entities == "dictionary":
+            codes, offsets, dictionary = _dictionary_encode(values)
+            out[name] = np.array(codes, dtype=np.int32)
+            out[f"{name}_offsets"] = np.array(offsets, dtype=np.int64)
+            out[f"{name}_dictionary"] = np.array(dictionary, dtype=object)
+        else:
+            arr = np.empty(len(values), dtype=object)
+            for i, names in enumerate(values):  # element-wise: equal-length lists must not broadcast
+                arr[i] = names
+            out[name] = arr
+    return out
+
+
+def to_arrow(rows: Iterable[Any], kind: str, *, entities: str = "list") -> Any:
+    """Columns of `rows` as a `pyarrow.Table`.
+
+    Args:
+        rows: MemoryItems (kind="search") or graph listing items.
+        kind: One of SCHEMAS.
+        entities: "list" (`list<string>`) or "dictionary"
+            (`list<dictionary<int32, string>>`).
+    """
+    _check_entities(entities)
+    pa = _require("pyarrow", "arrow", "to_arrow()")
+    cols = _collect(rows, kind)
+    arrays: Dict[str, Any] = {}
+    for name, ctype, _ in SCHEMAS[kind]:
+        values = cols[name]
+        if ctype == _STR:
+            arrays[name] = pa.array(values, type=pa.string())
+        elif ctype == _FLOAT:
+            arrays[name] = pa.array(values, type=pa.float64())
+        elif ctype == _TIME:
+            arrays[name] = pa.array(values, type=pa.timestamp("us", tz="UTC"))
+        elif entities == "dictionary":
+            codes, offsets, dictionary = _dictionary_encode(values)
+            names = pa.DictionaryArray.from_arrays(
+                pa.array(codes, type=pa.int32()), pa.array(dictionary, type=pa.string())
+            )
+            arrays[name] = pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), names)
+        else:
+            arrays[name] = pa.array(values, type=pa.list_(pa.string()))
+    return pa.table(arrays)
+
+
+__all__ = ["SCHEMAS", "to_arrow", "to_numpy"]
@@ -0,0 +1,574 @@
+"""Streaming tenant export to newline-delimited JSON.
+
+Walks the TKG graph endpoints and writes everything the memory service holds
+for a tenant as JSONL records (optionally gzip-compressed):
+
+    {"type": "timeslice", "data": {...}}
+    {"type": "event", "timeslice_id": "...", "data": {...}}
+    {"type": "entity", "data": {"id": "..."}}
+    {"type": "evidence", "entity_id": "...", "data": {...}}
+    {"type": "utterance", "entity_id": "...", "data": {...}}
+
+The walk has two phases: timeslices in [start, end) with their events, then
+every entity referenced by those events (plus any seed `entity_ids`) with its
+evidences and utterances. Events name their entities in `entity_ids`; events
+that only carry names in `involves` are resolved through
+/graph/v0/entities/resolve. An entity the service no longer has (404) is
+skipped and counted in `ExportStats.missing_entities`.
+
+Pages are fetched concurrently by a bounded worker pool but written in a
+deterministic order. Memory stays constant no matter how large the tenant is:
+each unit of work (a timeslice's events, an entity's evidences) is buffered in
+an unlinked temp file next to the output until its turn, and the set of
+entities still to visit lives in a small SQLite file.
+
+With `checkpoint_path`, progress is recorded after every `checkpoint_every`
+units of work. A re-run with the same arguments truncates the output back to
+the last checkpoint and resumes from there.
+
+Usage:
+    >>> from omem import MemoryClient
+    >>> from omem.exporter import export_tenant
+    >>> stats = export_tenant(
+    ...     client, "backup.jsonl.gz",
+    ...     start="2026-01-01T00:00:00Z", end="2026-07-01T00:00:00Z",
+    ...     checkpoint_path="backup.ckpt",
+    ... )
+
+Or from the command line:
+    python -m omem.exporter --api-key qbk_xxx --start 2026-01-01T00:00:00Z \\
+        --end 2026-07-01T00:00:00Z --out backup.jsonl.gz --checkpoint backup.ckpt
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Counter, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .client import MemoryClient, OmemHttpError
+
+_CHECKPOINT_VERSION = 2
+_RESOLVE_CACHE_SIZE = 4096
+_ENTITY_BATCH = 500
+
+_Record = Dict[str, Any]
+
+
+@dataclass
+class ExportStats:
+    """Counters for a (possibly resumed) export run."""
+
+    timeslices: int = 0
+    events: int = 0
+    entities: int = 0
+    evidences: int = 0
+    utterances: int = 0
+    missing_entities: int = 0
+    bytes_written: int = 0
+    resumed: bool = False
+    completed: bool = False
+
+
+class _JsonlSink:
+    """Append-only JSONL writer with checkpointable byte offsets.
+
+    For gzip output every checkpoint closes the current gzip member, so the
+    file can be truncated back to any committed offset and still be a valid
+    (multi-member) gzip stream.
+    """
+
+    def __init__(self, path: str, *, compress: bool, resume_offset: Optional[int]) -> None:
+        self._compress = compress
+        if resume_offset is None:
+            self._raw = open(path, "wb")
+        else:
+            self._raw = open(path, "r+b" if os.path.exists(path) else "wb")
+            self._raw.truncate(int(resume_offset))
+            self._raw.seek(int(resume_offset))
+        self._gz: Optional[gzip.GzipFile] = None
+
+    def write(self, record: _Record) -> None:
+        self.write_line(_encode(record))
+
+    def write_line(self, line: bytes) -> None:
+        """Write one already-encoded JSONL line."""
+        if self._compress:
+            if self._gz is None:
+                self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb")
+            self._gz.write(line)
+        else:
+            self._raw.write(line)
+
+    def commit(self) -> int:
+        """Make everything written so far durable and return the file offset."""
+        if self._gz is not None:
+            self._gz.close()  # ends the member; does not close the raw file
+            self._gz = None
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        return self._raw.tell()
+
+    def close(self) -> int:
+        offset = self.commit()
+        self._raw.close()
+        return offset
+
+
+def _encode(record: _Record) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class _Spill:
+    """Records of one unit of work, buffered on disk until it is that unit's turn to be written.
+
+    Each line is `<entity ids JSON>\\t<record JSONL line>`; JSON never contains
+    a raw tab, so the split is unambiguous.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._file: IO[bytes] = tempfile.TemporaryFile(prefix="omem-export-", dir=directory)
+        self.counts: Counter[str] = collections.Counter()
+
+    def add(self, record: _Record, refs: Sequence[str] = ()) -> None:
+        self._file.write(json.dumps(list(refs), ensure_ascii=False).encode("utf-8") + b"\t" + _encode(record))
+        self.counts[record["type"]] += 1
+
+    def drain(self) -> Iterator[Tuple[bytes, List[str]]]:
+        """Yield (encoded record line, entity ids) in insertion order."""
+        self._file.seek(0)
+        for line in self._file:
+            refs, _, record = line.partition(b"\t")
+            yield record, json.loads(refs)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _EntityQueue:
+    """Insertion-ordered, de-duplicated entity ids kept in SQLite rather than in memory.
+
+    Additions become durable with commit(), which the exporter calls at each
+    checkpoint, so after a crash the queue matches the truncated output.
+    """
+
+    def __init__(self, path: Optional[str], *, resume: bool, directory: str) -> None:
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="omem-export-", suffix=".entities.db", dir=directory)
+            os.close(fd)
+        elif not resume:
+            for stale in (path, f"{path}-journal"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+        self._path = path
+        self._db = sqlite3.connect(path)
+        if self._temporary:
+            self._db.execute("PRAGMA synchronous=OFF")  # nothing to resume from
+        self._db.execute("CREATE TABLE IF NOT EXISTS entities (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE)")
+        self._db.commit()
+
+    def add(self, eid: str) -> None:
+        self._db.execute("INSERT OR IGNORE INTO entities (id) VALUES (?)", (eid,))
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def __iter__(self) -> Iterator[str]:
+        last = 0
+        while True:
+            rows = self._db.execute(
+                "SELECT seq, id FROM entities WHERE seq > ? ORDER BY seq LIMIT ?", (last, _ENTITY_BATCH)
+            ).fetchall()
+            if not rows:
+                return
+            for last, eid in rows:
+                yield eid
+
+    def close(self) -> None:
+        self._db.close()  # uncommitted additions are rolled back
+        if self._temporary:
+            os.remove(self._path)
+
+
+def _entity_refs(event: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """(entity ids, entity names) referenced by an event payload.
+
+    Ids come from `entity_ids` (or `{"entity_id": ...}` objects in either
+    field); plain strings in `involves` are display names, not ids.
+    """
+    ids: List[str] = []
+    names: List[str] = []
+    for key in ("entity_ids", "involves"):
+        for ref in event.get(key) or []:
+            if isinstance(ref, dict):
+                ref = str(ref.get("entity_id") or ref.get("id") or "").strip()
+                if ref:
+                    ids.append(ref)
+                continue
+            ref = str(ref or "").strip()
+            if ref:
+                (ids if key == "entity_ids" else names).append(ref)
+    return ids, names
+
+
+def _is_utterance(item: Dict[str, Any]) -> bool:
+    return "utterance" in str(item.get("kind") or "").lower() or bool(item.get("utterance_id"))
+
+
+class TenantExporter:
+    """Export a tenant's graph (timeslices, events, entities, evidences, utterances) to JSONL."""
+
+    def __init__(
+        self,
+        client: MemoryClient,
+        path: str,
+        *,
+        start: str,
+        end: str,
+        granularity: Optional[str] = None,
+        entity_ids: Optional[Sequence[str]] = None,
+        include_entities: bool = True,
+        checkpoint_path: Optional[str] = None,
+        compress: Optional[bool] = None,
+        concurrency: int = 4,
+        page_size: int = 200,
+        checkpoint_every: int = 50,
+    ) -> None:
+        """Configure an export.
+
+        Args:
+            client: MemoryClient used for the graph calls.
+            path: Output file. Compressed with gzip when `compress` is True or,
+                by default, when the path ends with ".gz".
+            start: ISO start of the time range to walk.
+            end: ISO end of the time range to walk.
+            granularity: Optional timeslice granularity filter (e.g., "day").
+            entity_ids: Extra entities to export besides those found on events.
+            include_entities: Set False to export timeslices and events only.
+            checkpoint_path: Where to record progress for resumption.
+            compress: Force gzip on/off.
+            concurrency: Number of timeslices/entities fetched in parallel.
+            page_size: Page size for the graph listing calls.
+            checkpoint_every: Units of work (timeslices or entities) between checkpoints.
+        """
+        self._client = client
+        self._path = str(path)
+        self._start = str(start)
+        self._end = str(end)
+        self._granularity = granularity
+        self._seed_entities = [str(e).strip() for e in (entity_ids or []) if str(e).strip()]
+        self._include_entities = bool(include_entities)
+        self._checkpoint_path = str(checkpoint_path) if checkpoint_path else None
+        self._compress = self._path.endswith(".gz") if compress is None else bool(compress)
+        self._concurrency = max(1, int(concurrency))
+        self._page_size = max(1, int(page_size))
+        self._checkpoint_every = max(1, int(checkpoint_every))
+
+        self._spill_dir = os.path.dirname(os.path.abspath(self._path))
+        self._entity_queue: Optional[_EntityQueue] = None
+        self._resolved: "collections.OrderedDict[str, Optional[str]]" = collections.OrderedDict()
+        self._resolved_lock = threading.Lock()
+
+    # ---- public ----
+
+    def run(self) -> ExportStats:
+        """Run (or resume) the export and return its counters."""
+        state = self._load_checkpoint()
+        stats = ExportStats(**state["stats"]) if state else ExportStats()
+        if state and state["phase"] == "done":
+            return stats
+        stats.resumed = state is not None
+
+        sink = _JsonlSink(self._path, compress=self._compress, resume_offset=(state["out_bytes"] if state else None))
+        self._entity_queue = _EntityQueue(
+            f"{self._checkpoint_path}.entities.db" if self._checkpoint_path else None,
+            resume=state is not None,
+            directory=self._spill_dir,
+        )
+        phase = state["phase"] if state else "timeslices"
+        done = {
+            "timeslices": int(state["timeslices_done"]) if state else 0,
+            "entities": int(state["entities_done"]) if state else 0,
+        }
+        try:
+            for eid in self._seed_entities:
+                self._entity_queue.add(eid)
+            if phase == "timeslices":
+                self._export_timeslices(sink, stats, done)
+                phase = "entities"
+                self._checkpoint(sink, stats, phase, done)
+            if self._include_entities:
+                self._export_entities(sink, stats, done)
+            stats.completed = True
+            self._checkpoint(sink, stats, "done", done)
+        finally:
+            stats.bytes_written = sink.close()
+            self._entity_queue.close()
+            self._entity_queue = None
+        return stats
+
+    # ---- phases ----
+
+    def _export_timeslices(self, sink: _JsonlSink, stats: ExportStats, done: Dict[str, int]) -> None:
+        timeslices = self._client.iter_timeslices_range(
+            self._start, self._end, granularity=self._granularity, page_size=self._page_size
+        )
+
+        def fetch(ts: Dict[str, Any]) -> Tuple[Dict[str, Any], _Spill]:
+            ts_id = str(ts.get("id") or "")
+            spill = _Spill(self._spill_dir)
+            try:
+                if ts_id:
+                    for ev in self._client.iter_timeslice_events(ts_id, page_size=self._page_size, prefetch=False):
+                        refs = self._entity_ids(ev) if self._include_entities else []
+                        spill.add({"type": "event", "timeslice_id": ts_id, "data": ev}, refs)
+            except BaseException:
+                spill.close()
+                raise
+            return ts, spill
+
+        def write(result: Tuple[Dict[str, Any], _Spill]) -> None:
+            ts, spill = result
+            assert self._entity_queue is not None
+            try:
+                sink.write({"type": "timeslice", "data": ts})
+                stats.timeslices += 1
+                for line, refs in spill.drain():
+                    sink.write_line(line)
+                    for eid in refs:
+                        self._entity_queue.add(eid)
+                stats.events += spill.counts["event"]
+            finally:
+                spill.close()
+
+        self._pipeline(_skip(timeslices, done["timeslices"]), fetch, write, sink, stats, "timeslices", done)
+
+    def _export_entities(self, sink: _JsonlSink, stats: ExportStats, done: Dict[str, int]) -> None:
+        def fetch(eid: str) -> Tuple[str, Optional[_Spill]]:
+            spill = _Spill(self._spill_dir)
+            try:
+                for ev in self._client.iter_entity_evidences(eid, page_size=self._page_size, prefetch=False):
+                    spill.add({"type": "evidence", "entity_id": eid, "data": ev})
+                for t in self._client.iter_entity_timeline(eid, page_size=self._page_size, prefetch=False):
+                    if _is_utterance(t):
+                        spill.add({"type": "utterance", "entity_id": eid, "data": t})
+            except OmemHttpError as exc:
+                spill.close()
+                if exc.status_code == 404:
+                    return eid, None  # deleted since it was referenced; skip it
+                raise
+            except BaseException:
+                spill.close()
+                raise
+            return eid, spill
+
+        def write(result: Tuple[str, Optional[_Spill]]) -> None:
+            eid, spill = result
+            if spill is None:
+                stats.missing_entities += 1
+                return
+            try:
+                sink.write({"type": "entity", "data": {"id": eid}})
+                stats.entities += 1
+                for line, _ in spill.drain():
+                    sink.write_line(line)
+                stats.evidences += spill.counts["evidence"]
+                stats.utterances += spill.counts["utterance"]
+            finally:
+                spill.close()
+
+        assert self._entity_queue is not None
+        self._pipeline(_skip(self._entity_queue, done["entities"]), fetch, write, sink, stats, "entities", done)
+
+    def _pipeline(
+        self,
+        units: Iterable[Any],
+        fetch: Callable[[Any], Any],
+        write: Callable[[Any], None],
+        sink: _JsonlSink,
+        stats: ExportStats,
+        phase: str,
+        done: Dict[str, int],
+    ) -> None:
+        """Fetch units concurrently, write them in order, checkpoint periodically."""
+        window: Deque[Future] = collections.deque()
+        with ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="omem-export") as pool:
+
+            def drain_one() -> None:
+                write(window.popleft().result())
+                done[phase] += 1
+                if done[phase] % self._checkpoint_every == 0:
+                    self._checkpoint(sink, stats, phase, done)
+
+            for unit in units:
+                window.append(pool.submit(fetch, unit))
+                if len(window) >= self._concurrency * 2:
+                    drain_one()
+            while window:
+                drain_one()
+
+    # ---- entity references ----
+
+    def _entity_ids(self, event: Dict[str, Any]) -> List[str]:
+        """Entity ids of an event, resolving `involves` names when it carries no ids."""
+        ids, names = _entity_refs(event)
+        if ids:
+            return ids
+        out: List[str] = []
+        for name in names:
+            eid = self._resolve(name)
+            if eid:
+                out.append(eid)
+        return out
+
+    def _resolve(self, name: str) -> Optional[str]:
+        """Entity id whose name or alias is exactly `name` (case-insensitive), else None."""
+        key = name.casefold()
+        with self._resolved_lock:
+            if key in self._resolved:
+                self._resolved.move_to_end(key)
+                return self._resolved[key]
+        try:
+            items = self._client.graph_resolve_entities(name, limit=5).get("items") or []
+        except OmemHttpError as exc:
+            if exc.status_code != 404:
+                raise
+            items = []
+        eid: Optional[str] = None
+        for item in items:
+            labels = [item.get("name"), *(item.get("aliases") or [])]
+            if any(str(label or "").strip().casefold() == key for label in labels):
+                eid = str(item.get("entity_id") or item.get("id") or "").strip() or None
+                break
+        with self._resolved_lock:
+            self._resolved[key] = eid
+            if len(self._resolved) > _RESOLVE_CACHE_SIZE:
+                self._resolved.popitem(last=False)
+        return eid
+
+    # ---- checkpoints ----
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        return {
+            "version": _CHECKPOINT_VERSION,
+            "output": os.path.abspath(self._path),
+            "start": self._start,
+            "end": self._end,
+            "granularity": self._granularity,
+            "compress": self._compress,
+        }
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return None
+        with open(self._checkpoint_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if any(state.get(k) != v for k, v in self._fingerprint().items()):
+            raise ValueError(
+                f"checkpoint {self._checkpoint_path} belongs to a different export; "
+                "remove it or use another checkpoint_path"
+            )
+        return state
+
+    def _checkpoint(self, sink: _JsonlSink, stats: ExportStats, phase: str, done: Dict[str, int]) -> None:
+        offset = sink.commit()
+        if self._entity_queue is not None:
+            self._entity_queue.commit()
+        if not self._checkpoint_path:
+            return
+        state = dict(self._fingerprint())
+        state.update(
+            {
+                "phase": phase,
+                "timeslices_done": done["timeslices"],
+                "entities_done": done["entities"],
+                "out_bytes": offset,
+                "stats": dict(asdict(stats), bytes_written=offset, resumed=False),
+            }
+        )
+        tmp = f"{self._checkpoint_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._checkpoint_path)
+
+
+def _skip(items: Iterable[Any], n: int) -> Iterable[Any]:
+    for i, item in enumerate(items):
+        if i >= n:
+            yield item
+
+
+def export_tenant(
+    client: MemoryClient,
+    path: str,
+    *,
+    start: str,
+    end: str,
+    **kwargs: Any,
+) -> ExportStats:
+    """Export a tenant's graph to JSONL. See TenantExporter for options."""
+    return TenantExporter(client, path, start=start, end=end, **kwargs).run()
+
+
+__all__ = [
+    "ExportStats",
+    "TenantExporter",
+    "export_tenant",
+]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .memory import DEFAULT_ENDPOINT
+
+    parser = argparse.ArgumentParser(prog="python -m omem.exporter", description="Export tenant memory to JSONL.")
+    parser.add_argument("--api-key", default=os.environ.get("OMEM_API_KEY"), help="API key (default: $OMEM_API_KEY)")
+    parser.add_argument("--endpoint", default=os.environ.get("OMEM_ENDPOINT") or DEFAULT_ENDPOINT)
+    parser.add_argument("--start", required=True, help="ISO start time")
+    parser.add_argument("--end", required=True, help="ISO end time")
+    parser.add_argument("--out", required=True, help="Output path (.jsonl or .jsonl.gz)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file for resumable exports")
+    parser.add_argument("--granularity", default=None)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--no-entities", action="store_true", help="Skip the entity phase")
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error("--api-key (or $OMEM_API_KEY) is required")
+
+    client = MemoryClient(
+        base_url=args.endpoint,
+        tenant_id="__from_api_key__",
+        api_token=args.api_key,
+        mode="saas",
+    )
+    try:
+        stats = export_tenant(
+            client,
+            args.out,
+            start=args.start,
+            end=args.end,
+            granularity=args.granularity,
+            include_entities=not args.no_entities,
+            checkpoint_path=args.checkpoint,
+            concurrency=args.concurrency,
+            page_size=args.page_size,
+        )
+    finally:
+        client.close()
+    print(json.dumps(asdict(stats)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
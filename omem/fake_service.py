@@ -0,0 +1,570 @@
+"""In-process fake of the omem service for load and integration testing.
+
+`FakeOmemService` is an httpx transport (sync and async) implementing the
+routes the SDK talks to, backed by in-memory state:
+
+- POST /ingest, GET /ingest/jobs/{job_id}, GET /ingest/sessions/{session_id}
+- POST /retrieval (keyword index over ingested turns)
+- /graph/v0 entities, events, timeslices, evidences, explain; POST /graph/v1/search
+- GET/PUT /attachments/{sha256}, GET /debug/config
+
+Ingested turns become searchable when their job completes (`job_delay_s`
+after ingest). Listing routes return opaque `next_cursor` tokens like the
+real service. Latency, error rate, rate limiting (429 + Retry-After) and
+payload limits (413) are configurable, so throughput and resilience features
+can be exercised on a laptop:
+
+    >>> from omem.fake_service import FakeOmemService, FakeServiceConfig, lognormal_latency
+    >>> fake = FakeOmemService(FakeServiceConfig(latency=lognormal_latency(40), error_rate=0.01))
+    >>> mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client())
+    >>> mem.add("conv-1", [{"role": "user", "content": "I moved to Hangzhou"}])
+    >>> mem.search("Hangzhou")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+import httpx
+
+# Returns a latency in milliseconds.
+LatencyFn = Callable[[random.Random], float]
+
+
+def fixed_latency(ms: float) -> LatencyFn:
+    return lambda rng: float(ms)
+
+
+def uniform_latency(low_ms: float, high_ms: float) -> LatencyFn:
+    return lambda rng: rng.uniform(float(low_ms), float(high_ms))
+
+
+def lognormal_latency(median_ms: float, sigma: float = 0.5) -> LatencyFn:
+    """Long-tailed latency: median `median_ms`, p99 about median * e^(2.33 * sigma)."""
+    mu = math.log(max(float(median_ms), 1e-6))
+    return lambda rng: rng.lognormvariate(mu, float(sigma))
+
+
+@dataclass(frozen=True)
+class FakeServiceConfig:
+    """Behaviour knobs for FakeOmemService."""
+
+    latency: Optional[LatencyFn] = None
+    # Per route template (e.g. "/retrieval") overrides of `latency`.
+    route_latency: Mapping[str, LatencyFn] = field(default_factory=dict)
+    # Probability of answering 503 instead of serving the request.
+    error_rate: float = 0.0
+    # Probability of answering 429 (on top of the token bucket below).
+    rate_limit_rate: float = 0.0
+    # Token bucket (requests/s and burst); None disables it.
+    rate_limit_rps: Optional[float] = None
+    rate_limit_burst: int = 10
+    retry_after_s: int = 1
+    # Fault injection only applies to these route templates when set.
+    fault_routes: Optional[Sequence[str]] = None
+    max_body_bytes: int = 4 << 20
+    max_turns_per_ingest: int = 500
+    max_page_size: int = 200
+    # Seconds until an ingest job completes and its turns become searchable.
+    job_delay_s: float = 0.0
+    # Accepted API keys; None accepts any request.
+    api_keys: Optional[Sequence[str]] = None
+    seed: Optional[int] = None
+
+
+_ROUTES: List[Tuple[str, str, "re.Pattern[str]"]] = [
+    (method, template, re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", template) + "$"))
+    for method, template in [
+        ("POST", "/ingest"),
+        ("GET", "/ingest/jobs/{job_id}"),
+        ("GET", "/ingest/sessions/{session_id}"),
+        ("POST", "/retrieval"),
+        ("GET", "/debug/config"),
+        ("GET", "/attachments/{sha256}"),
+        ("PUT", "/attachments/{sha256}"),
+        ("GET", "/graph/v0/entities/resolve"),
+        ("GET", "/graph/v0/entities/{entity_id}/timeline"),
+        ("GET", "/graph/v0/entities/{entity_id}/evidences"),
+        ("GET", "/graph/v0/explain/event/{event_id}"),
+        ("GET", "/graph/v0/events"),
+        ("GET", "/graph/v0/timeslices/range"),
+        ("GET", "/graph/v0/timeslices/{timeslice_id}/events"),
+        ("POST", "/graph/v1/search"),
+    ]
+]
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+|[\u3400-\u9fff]")
+_ENTITY_RE = re.compile(r"\b[A-Z][a-zA-Z]+\b")
+_NOT_ENTITIES = {"I", "The", "A", "An", "And", "But", "We", "You", "He", "She", "It", "They", "My", "Our", "See"}
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "-", name.lower()).strip("-") or "x"
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, error: str, headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.headers = headers or {}
+
+
+class FakeOmemService(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Thread-safe in-memory omem backend usable as an httpx transport."""
+
+    def __init__(self, config: Optional[FakeServiceConfig] = None) -> None:
+        self.config = config or FakeServiceConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._commits: Dict[Tuple[str, str], str] = {}
+        self._pending: List[str] = []
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._event_order: List[str] = []
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        self._entity_events: Dict[str, List[str]] = {}
+        self._timeslices: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._attachments: Dict[str, Dict[str, Any]] = {}
+        self._bucket = float(self.config.rate_limit_burst)
+        self._bucket_ts = time.monotonic()
+        self.requests: Counter = Counter()  # route template -> count
+        self.faults: Counter = Counter()  # "429" / "503" / "413" -> count
+
+    # ---- convenience -------------------------------------------------------
+
+    def http_client(self, **kwargs: Any) -> httpx.Client:
+        """An httpx.Client routed to this fake (pass as `http=`)."""
+        return httpx.Client(transport=self, **kwargs)
+
+    def async_http_client(self, **kwargs: Any) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=self, **kwargs)
+
+    # ---- transport ---------------------------------------------------------
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay_s, resp = self._handle(request, request.read())
+        if delay_s > 0:
+            time.sleep(delay_s)
+        return resp
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay_s, resp = self._handle(request, await request.aread())
+        if delay_s > 0:
+            await asyncio.sleep(delay_s)
+        return resp
+
+    def _handle(self, request: httpx.Request, body: bytes) -> Tuple[float, httpx.Response]:
+        t0 = time.perf_counter()
+        method, path = request.method.upper(), request.url.path
+        template, params = None, {}
+        for m, tpl, rx in _ROUTES:
+            match = rx.match(path)
+            if match and m == method:
+                template, params = tpl, match.groupdict()
+                break
+        if template is None:
+            return 0.0, self._json(request, 404, {"error": "not_found"})
+
+        cfg = self.config
+        with self._lock:
+            self.requests[template] += 1
+            latency_fn = cfg.route_latency.get(template, cfg.latency)
+            delay_s = max(0.0, latency_fn(self._rng)) / 1000 if latency_fn else 0.0
+        try:
+            self._check_auth(request)
+            self._inject_faults(template)
+            if len(body) > cfg.max_body_bytes:
+                raise _HttpError(413, "payload_too_large")
+            handler = getattr(self, "_r_" + re.sub(r"\W+", "_", template.replace("{", "").replace("}", "")).strip("_"))
+            payload = handler(request, body, **params)
+        except _HttpError as exc:
+            if exc.status in (413, 429, 503):
+                with self._lock:
+                    self.faults[str(exc.status)] += 1
+            return delay_s, self._json(request, exc.status, {"error": exc.error}, exc.headers)
+
+        server_ms = (time.perf_counter() - t0) * 1000
+        headers = {"Server-Timing": f"app;dur={server_ms:.3f}, total;dur={server_ms + delay_s * 1000:.3f}"}
+        return delay_s, self._json(request, 200, payload, headers)
+
+    @staticmethod
+    def _json(request: httpx.Request, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        h = {"x-request-id": request.headers.get("x-request-id", "")}
+        h.update(headers or {})
+        return httpx.Response(status, json=payload, headers=h, request=request)
+
+    def _check_auth(self, request: httpx.Request) -> None:
+        keys = self.config.api_keys
+        if keys is None:
+            return
+        auth = request.headers.get("authorization", "")
+        token = request.headers.get("x-api-key") or request.headers.get("x-api-token") or auth.replace("Bearer ", "")
+        if token not in keys:
+            raise _HttpError(401, "invalid_api_key")
+
+    def _inject_faults(self, template: str) -> None:
+        cfg = self.config
+        if cfg.fault_routes is not None and template not in cfg.fault_routes:
+            return
+        retry = {"Retry-After": str(int(cfg.retry_after_s))}
+        with self._lock:
+            if cfg.rate_limit_rps:
+                now = time.monotonic()
+                self._bucket = min(float(cfg.rate_limit_burst), self._bucket + (now - self._bucket_ts) * cfg.rate_limit_rps)
+                self._bucket_ts = now
+                if self._bucket < 1.0:
+                    raise _HttpError(429, "rate_limited", retry)
+                self._bucket -= 1.0
+            roll = self._rng.random()
+        if roll < cfg.rate_limit_rate:
+            raise _HttpError(429, "rate_limited", retry)
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            raise _HttpError(503, "service_unavailable")
+
+    # ---- pagination --------------------------------------------------------
+
+    def _page(self, request: httpx.Request, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        q = request.url.params
+        limit = max(1, min(int(q.get("limit") or 50), int(self.config.max_page_size)))
+        offset = int(q.get("offset") or 0)
+        cursor = q.get("cursor")
+        if cursor:
+            try:
+                offset = int(json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())["o"])
+            except Exception:
+                raise _HttpError(400, "invalid_cursor")
+        page = items[offset : offset + limit]
+        end = offset + len(page)
+        has_more = end < len(items)
+        next_cursor = base64.urlsafe_b64encode(json.dumps({"o": end}).encode()).decode() if has_more else None
+        return {"items": page, "next_cursor": next_cursor, "has_more": has_more}
+
+    # ---- ingest ------------------------------------------------------------
+
+    def _advance(self) -> None:
+        """Complete due jobs and index their turns. Caller holds the lock."""
+        now = time.monotonic()
+        still: List[str] = []
+        for jid in self._pending:
+            job = self._jobs[jid]
+            if job["ready_at"] > now:
+                still.append(jid)
+                continue
+            for turn in job.pop("turns"):
+                self._index_turn(job["session_id"], turn)
+            job["status"] = "COMPLETED"
+            sess = self._sessions[job["session_id"]]
+            if sess["latest_job_id"] == jid:
+                sess["latest_status"] = "COMPLETED"
+        self._pending = still
+
+    def _index_turn(self, session_id: str, turn: Dict[str, Any]) -> None:
+        text = str(turn.get("text") or "")
+        ts = str(turn.get("timestamp_iso") or _now_iso())
+        eid = f"ev-{len(self._event_order) + 1}"
+        names = sorted({w for w in _ENTITY_RE.findall(text) if w not in _NOT_ENTITIES})
+        involves: List[str] = []
+        for name in names:
+            ent_id = f"ent-{_slug(name)}"
+            self._entities.setdefault(ent_id, {"entity_id": ent_id, "id": ent_id, "name": name, "type": "entity", "aliases": []})
+            self._entity_events.setdefault(ent_id, []).append(eid)
+            involves.append(name)
+        ts_id = f"ts-{session_id}"
+        slice_ = self._timeslices.setdefault(
+            ts_id,
+            {"id": ts_id, "kind": "dialog_session", "session_id": session_id, "t_abs_start": ts, "t_abs_end": ts, "events": []},
+        )
+        slice_["t_abs_start"] = min(slice_["t_abs_start"], ts)
+        slice_["t_abs_end"] = max(slice_["t_abs_end"], ts)
+        slice_["events"].append(eid)
+        self._events[eid] = {
+            "id": eid,
+            "summary": text,
+            "t_abs_start": ts,
+            "involves": involves,
+            "entity_ids": [f"ent-{_slug(n)}" for n in names],
+            "session_id": session_id,
+            "timeslice_id": ts_id,
+            "utterance": {
+                "utterance_id": f"utt-{eid}",
+                "id": f"utt-{eid}",
+                "raw_text": text,
+                "speaker": turn.get("name") or turn.get("role"),
+                "t_media_start": ts,
+                "segment_id": None,
+            },
+        }
+        self._event_order.append(eid)
+        for tok in set(_tokens(text)):
+            self._postings.setdefault(tok, set()).add(eid)
+
+    def _r_ingest(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        data = json.loads(body or b"{}")
+        sid = str(data.get("session_id") or "").strip()
+        turns = list(data.get("turns") or [])
+        if not sid:
+            raise _HttpError(400, "session_id_required")
+        if len(turns) > self.config.max_turns_per_ingest:
+            raise _HttpError(413, "too_many_turns")
+        cid = str(data.get("commit_id") or "")
+        with self._lock:
+            self._advance()
+            if cid and (sid, cid) in self._commits:
+                job = self._jobs[self._commits[(sid, cid)]]
+                return {"job_id": job["job_id"], "session_id": sid, "status": job["status"], "deduped": True}
+            sess = self._sessions.setdefault(
+                sid, {"session_id": sid, "latest_job_id": None, "latest_status": None, "cursor_committed": None}
+            )
+            # Turns at or before the committed cursor were already accepted.
+            cursor = sess["cursor_committed"]
+            fresh = [t for t in turns if cursor is None or str(t.get("turn_id") or "") > cursor]
+            jid = f"job-{len(self._jobs) + 1}"
+            self._jobs[jid] = {
+                "job_id": jid,
+                "session_id": sid,
+                "status": "PENDING",
+                "attempts": {"total": 1},
+                "metrics": {"turns": len(fresh)},
+                "ready_at": time.monotonic() + float(self.config.job_delay_s),
+                "turns": fresh,
+            }
+            self._pending.append(jid)
+            if cid:
+                self._commits[(sid, cid)] = jid
+            if fresh:
+                sess["cursor_committed"] = max(str(t.get("turn_id") or "") for t in fresh)
+            sess["latest_job_id"], sess["latest_status"] = jid, "PENDING"
+            self._advance()
+            return {"job_id": jid, "session_id": sid, "status": self._jobs[jid]["status"], "deduped": False}
+
+    def _r_ingest_jobs_job_id(self, request: httpx.Request, body: bytes, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise _HttpError(404, "job_not_found")
+            return {k: v for k, v in job.items() if k not in ("ready_at", "turns")}
+
+    def _r_ingest_sessions_session_id(self, request: httpx.Request, body: bytes, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            sess = self._sessions.get(session_id)
+            if sess is None:
+                raise _HttpError(404, "session_not_found")
+            return dict(sess)
+
+    # ---- retrieval ---------------------------------------------------------
+
+    def _search(self, query: str, topk: int, session_id: Optional[str] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """Rank events by summed IDF of matched query tokens (normalized to 0..1)."""
+        qtok = list(dict.fromkeys(_tokens(query)))
+        n = max(1, len(self._events))
+        idf = {t: math.log(1 + n / (1 + len(self._postings.get(t, ())))) for t in qtok}
+        scores: Dict[str, float] = {}
+        for t in qtok:
+            for eid in self._postings.get(t, ()):
+                scores[eid] = scores.get(eid, 0.0) + idf[t]
+        norm = sum(idf.values()) or 1.0
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        out: List[Tuple[float, Dict[str, Any]]] = []
+        for eid, s in ranked:
+            ev = self._events[eid]
+            if session_id and ev["session_id"] != session_id:
+                continue
+            out.append((s / norm, ev))
+            if len(out) >= topk:
+                break
+        return out
+
+    def _r_retrieval(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        data = json.loads(body or b"{}")
+        query = str(data.get("query") or "").strip()
+        if not query:
+            raise _HttpError(400, "query_required")
+        t0 = time.perf_counter()
+        with self._lock:
+            self._advance()
+            hits = self._search(query, max(1, int(data.get("topk") or 30)), data.get("run_id"))
+        details = [
+            {
+                "text": ev["summary"],
+                "score": round(score, 6),
+                "timestamp": ev["t_abs_start"],
+                "source": "tkg",
+                "entities": list(ev["involves"]),
+                "event_id": ev["id"],
+                "tkg_event_id": ev["id"],
+            }
+            for score, ev in hits
+        ]
+        out: Dict[str, Any] = {
+            "strategy": str(data.get("strategy") or "dialog_v2"),
+            "evidence_details": details,
+            "metrics": {"timings": {"keyword_ms": round((time.perf_counter() - t0) * 1000, 3)}},
+        }
+        if data.get("debug"):
+            out["debug"] = {"backend": "fake", "candidates": len(details)}
+        return out
+
+    def _r_debug_config(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        return {"backend": "fake", "max_page_size": self.config.max_page_size}
+
+    # ---- attachments -------------------------------------------------------
+
+    def _r_attachments_sha256(self, request: httpx.Request, body: bytes, sha256: str) -> Dict[str, Any]:
+        with self._lock:
+            if request.method.upper() == "PUT":
+                self._attachments.setdefault(
+                    sha256, {"ref": f"fake://attachments/{sha256}", "size": len(body)}
+                )
+                return dict(self._attachments[sha256])
+            att = self._attachments.get(sha256)
+        if att is None:
+            raise _HttpError(404, "attachment_not_found")
+        return dict(att)
+
+    # ---- graph -------------------------------------------------------------
+
+    @staticmethod
+    def _event_view(ev: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: ev[k] for k in ("id", "summary", "t_abs_start", "involves", "session_id", "timeslice_id")}
+
+    def _r_graph_v0_entities_resolve(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        name = str(request.url.params.get("name") or "").strip().lower()
+        limit = int(request.url.params.get("limit") or 20)
+        with self._lock:
+            self._advance()
+            hits = [dict(e) for e in self._entities.values() if name and name in e["name"].lower()]
+        hits.sort(key=lambda e: (e["name"].lower() != name, e["name"]))
+        return {"items": hits[:limit]}
+
+    def _entity_or_404(self, entity_id: str) -> List[Dict[str, Any]]:
+        if entity_id not in self._entities:
+            raise _HttpError(404, "entity_not_found")
+        return [self._events[e] for e in self._entity_events.get(entity_id, [])]
+
+    def _r_graph_v0_entities_entity_id_timeline(self, request: httpx.Request, body: bytes, entity_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            events = self._entity_or_404(entity_id)
+        items = [{"kind": "utterance", "event_id": ev["id"], **ev["utterance"]} for ev in events]
+        return self._page(request, items)
+
+    def _r_graph_v0_entities_entity_id_evidences(self, request: httpx.Request, body: bytes, entity_id: str) -> Dict[str, Any]:
+        source_id = request.url.params.get("source_id")
+        with self._lock:
+            self._advance()
+            events = self._entity_or_404(entity_id)
+        items = [
+            {
+                "evidence_id": f"evd-{ev['id']}",
+                "id": f"evd-{ev['id']}",
+                "subtype": "utterance",
+                "source_id": ev["session_id"],
+                "text": ev["summary"],
+                "confidence": 0.9,
+                "t_media_start": ev["t_abs_start"],
+                "event_id": ev["id"],
+            }
+            for ev in events
+            if not source_id or ev["session_id"] == source_id
+        ]
+        return self._page(request, items)
+
+    def _r_graph_v0_explain_event_event_id(self, request: httpx.Request, body: bytes, event_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            ev = self._events.get(event_id)
+            if ev is None:
+                raise _HttpError(404, "event_not_found")
+            entities = [dict(self._entities[e]) for e in ev["entity_ids"]]
+            ts = self._timeslices[ev["timeslice_id"]]
+            slice_view = {k: ts[k] for k in ("id", "kind", "t_abs_start", "t_abs_end")}
+        return {
+            "item": {
+                "event": self._event_view(ev),
+                "entities": entities,
+                "utterances": [dict(ev["utterance"])],
+                "evidences": [],
+                "knowledge": [{"id": f"k-{event_id}", "summary": ev["summary"], "importance": 0.5, "t_abs_start": ev["t_abs_start"]}],
+                "places": [],
+                "timeslices": [slice_view],
+            }
+        }
+
+    def _r_graph_v0_events(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        entity_id = request.url.params.get("entity_id")
+        with self._lock:
+            self._advance()
+            if entity_id:
+                events = [self._events[e] for e in self._entity_events.get(entity_id, [])]
+            else:
+                events = [self._events[e] for e in self._event_order]
+        return self._page(request, [self._event_view(ev) for ev in events])
+
+    def _r_graph_v0_timeslices_range(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        start = str(request.url.params.get("start") or "")
+        end = str(request.url.params.get("end") or "\uffff")
+        with self._lock:
+            self._advance()
+            slices = [
+                {k: ts[k] for k in ("id", "kind", "t_abs_start", "t_abs_end")}
+                for ts in self._timeslices.values()
+                if ts["t_abs_end"] >= start and ts["t_abs_start"] <= end
+            ]
+        slices.sort(key=lambda s: (s["t_abs_start"], s["id"]))
+        return self._page(request, slices)
+
+    def _r_graph_v0_timeslices_timeslice_id_events(self, request: httpx.Request, body: bytes, timeslice_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            ts = self._timeslices.get(timeslice_id)
+            if ts is None:
+                raise _HttpError(404, "timeslice_not_found")
+            events = [self._event_view(self._events[e]) for e in ts["events"]]
+        return self._page(request, events)
+
+    def _r_graph_v1_search(self, request: httpx.Request, body: bytes) -> Dict[str, Any]:
+        data = json.loads(body or b"{}")
+        with self._lock:
+            self._advance()
+            hits = self._search(str(data.get("query") or ""), max(1, int(data.get("topk") or 10)))
+        items = []
+        for score, ev in hits:
+            item = {**self._event_view(ev), "score": round(score, 6)}
+            if data.get("include_evidence", True):
+                item["evidence"] = ev["summary"]
+            items.append(item)
+        return {"items": items}
+
+
+__all__ = [
+    "FakeOmemService",
+    "FakeServiceConfig",
+    "LatencyFn",
+    "fixed_latency",
+    "uniform_latency",
+    "lognormal_latency",
+]
@@ -0,0 +1,339 @@
+"""Local fallback search for when the memory service is down or slow.
+
+`Memory(fallback=LocalFallbackStore(path))` keeps a bounded local copy of
+what the agent has seen: items returned by successful searches and turns it
+committed. search() answers from it, in milliseconds, with items marked
+`source="local"` when
+
+- the circuit breaker is open (recent searches kept failing), or
+- the server has not answered within `latency_budget_ms`, or
+- the server call fails and `fail_silent=True`.
+
+The store is an in-memory BM25 index (omem.textindex) backed, optionally,
+by a directory of append-only JSON Lines segments (`fb-000000000001.jsonl`,
+...), so it survives restarts. Beyond `max_items` the oldest entries are
+evicted; once the segments hold twice that many records they are compacted
+into fresh ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, List, Optional, Union
+
+from .metrics import CIRCUIT_STATE, MetricsRegistry
+from .models import MemoryItem, parse_datetime
+from .segments import list_segments, segment_path
+from .textindex import BM25Index, saturate
+from .types import CanonicalTurnV1
+
+LOCAL_SOURCE = "local"
+
+SEGMENT_PREFIX = "fb-"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed).
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    allow() returns False for `reset_timeout_s`; then a single probe request
+    is let through (half-open), and its outcome closes or re-opens the
+    circuit. The state is exported as the `omem_circuit_state` gauge
+    (0 closed, 1 half-open, 2 open) when a metrics registry is given.
+    """
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    _GAUGE = {CLOSED: 0.0, HALF_OPEN: 1.0, OPEN: 2.0}
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        name: str = "search",
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        if int(failure_threshold) <= 0:
+            raise ValueError("failure_threshold must be > 0")
+        self.failure_threshold = int(failure_threshold)
+        self.reset_timeout_s = float(reset_timeout_s)
+        self.name = name
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._export()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_s:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a request should be attempted now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout_s:
+                    return False
+                self._set(self.HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != self.CLOSED:
+                self._set(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                if self._state != self.OPEN:
+                    self._set(self.OPEN)
+
+    def release_probe(self) -> None:
+        """End a request that says nothing about service health (e.g. a 4xx).
+
+        The state is unchanged; if it was the half-open probe, the next
+        allow() lets another probe through.
+        """
+        with self._lock:
+            self._probing = False
+
+    def _set(self, state: str) -> None:
+        self._state = state
+        self._export()
+
+    def _export(self) -> None:
+        if self.metrics is not None:
+            self.metrics.set_gauge(CIRCUIT_STATE, self._GAUGE[self._state], {"circuit": self.name})
+
+
+def _record(
+    text: str,
+    *,
+    timestamp: Optional[datetime] = None,
+    session_id: Optional[str] = None,
+    event_id: Optional[str] = None,
+    entities: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    text = str(text or "").strip()
+    if not text:
+        return None
+    return {
+        "id": _doc_id(text, event_id),
+        "text": text,
+        "ts": timestamp.isoformat() if timestamp is not None else None,
+        "session_id": session_id,
+        "event_id": event_id,
+        "entities": list(entities or []),
+    }
+
+
+def _doc_id(text: str, event_id: Optional[str]) -> str:
+    if event_id:
+        return f"e:{event_id}"
+    norm = " ".join(str(text).split()).lower()
+    return "t:" + hashlib.sha1(norm.encode("utf-8")).hexdigest()[:20]
+
+
+class LocalFallbackStore:
+    """Bounded, optionally persistent BM25 store of memories seen by this process."""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, "os.PathLike[str]"]] = None,
+        *,
+        max_items: int = 5000,
+        segment_max_records: int = 1000,
+    ) -> None:
+        """Open a store.
+
+        Args:
+            directory: Where to persist segments; in-memory only when None.
+                Existing segments are loaded.
+            max_items: Entries kept; the oldest are evicted beyond this.
+            segment_max_records: Records per segment file before rotating.
+        """
+        if int(max_items) <= 0:
+            raise ValueError("max_items must be > 0")
+        self.max_items = int(max_items)
+        self.segment_max_records = max(1, int(segment_max_records))
+        self.directory = os.fspath(directory) if directory is not None else None
+        self._lock = threading.RLock()
+        self._index = BM25Index()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._fh: Optional[IO[str]] = None
+        self._seg_records = 0
+        self._disk_records = 0
+        self._next_seq = 1
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    # ---- writing -----------------------------------------------------------
+
+    def add(
+        self,
+        text: str,
+        *,
+        timestamp: Optional[datetime] = None,
+        session_id: Optional[str] = None,
+        event_id: Optional[str] = None,
+        entities: Optional[List[str]] = None,
+    ) -> None:
+        rec = _record(text, timestamp=timestamp, session_id=session_id, event_id=event_id, entities=entities)
+        if rec is not None:
+            self._add_records([rec])
+
+    def add_items(self, items: Iterable[MemoryItem], *, session_id: Optional[str] = None) -> None:
+        """Store items returned by a successful server search (one write per call)."""
+        recs = [
+            _record(it.text, timestamp=it.timestamp, session_id=session_id, event_id=it.event_id, entities=it.entities)
+            for it in items
+            if it.source not in (LOCAL_SOURCE, "overlay")
+        ]
+        self._add_records([r for r in recs if r is not None])
+
+    def add_turns(self, session_id: str, turns: Iterable[CanonicalTurnV1]) -> None:
+        """Store committed turns (one write per call)."""
+        recs = [_record(t.text, timestamp=parse_datetime(t.timestamp_iso), session_id=session_id) for t in turns]
+        self._add_records([r for r in recs if r is not None])
+
+    def _add_records(self, recs: List[Dict[str, Any]]) -> None:
+        if not recs:
+            return
+        with self._lock:
+            for rec in recs:
+                self._apply(rec)
+            self._append(recs)
+
+    def _apply(self, rec: Dict[str, Any]) -> None:
+        doc_id = rec["id"]
+        self._docs.pop(doc_id, None)  # re-insert as newest
+        self._docs[doc_id] = rec
+        self._index.add(doc_id, rec["text"])
+        while len(self._docs) > self.max_items:
+            old = next(iter(self._docs))
+            del self._docs[old]
+            self._index.remove(old)
+
+    # ---- persistence -------------------------------------------------------
+
+    def _path(self, seq: int) -> str:
+        assert self.directory is not None
+        return segment_path(self.directory, SEGMENT_PREFIX, seq)
+
+    def _segments(self) -> List[int]:
+        assert self.directory is not None
+        return list_segments(self.directory, SEGMENT_PREFIX)
+
+    def _load(self) -> None:
+        seqs = self._segments()
+        for seq in seqs:
+            with open(self._path(seq), "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn write
+                    if isinstance(rec, dict) and rec.get("id") and rec.get("text"):
+                        self._apply(rec)
+                        self._disk_records += 1
+        self._next_seq = (seqs[-1] + 1) if seqs else 1
+
+    def _append(self, recs: List[Dict[str, Any]]) -> None:
+        if self.directory is None:
+            return
+        for rec in recs:
+            if self._fh is None or self._seg_records >= self.segment_max_records:
+                self._rotate()
+            assert self._fh is not None
+            self._fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+            self._seg_records += 1
+            self._disk_records += 1
+        if self._fh is not None:
+            self._fh.flush()
+        if self._disk_records > 2 * self.max_items:
+            self.compact()
+
+    def _rotate(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = open(self._path(self._next_seq), "a", encoding="utf-8")
+        self._next_seq += 1
+        self._seg_records = 0
+
+    def compact(self) -> None:
+        """Rewrite the segments to hold only live entries."""
+        if self.directory is None:
+            return
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            old = self._segments()
+            self._disk_records = 0
+            self._append(list(self._docs.values()))
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            for seq in old:
+                os.remove(self._path(seq))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    # ---- reading -----------------------------------------------------------
+
+    def search(self, query: str, *, limit: int = 10, session_id: Optional[str] = None) -> List[MemoryItem]:
+        """Best local matches as MemoryItems with source="local"."""
+        with self._lock:
+            docs = self._docs
+            where = None if session_id is None else (lambda d: docs.get(d, {}).get("session_id") == session_id)
+            hits = self._index.search(query, limit, where=where)
+            out: List[MemoryItem] = []
+            for score, doc_id in hits:
+                rec = docs.get(doc_id)
+                if rec is None:
+                    continue
+                out.append(
+                    MemoryItem(
+                        text=rec["text"],
+                        score=saturate(score),
+                        timestamp=parse_datetime(rec.get("ts")),
+                        source=LOCAL_SOURCE,
+                        entities=list(rec.get("entities") or []),
+                        event_id=rec.get("event_id"),
+                    )
+                )
+            return out
+
+
+__all__ = ["CircuitBreaker", "LOCAL_SOURCE", "LocalFallbackStore"]
@@ -0,0 +1,471 @@
+"""Bulk importer for historical conversation archives.
+
+Streams a JSONL or CSV archive (never loading it whole), groups messages into
+conversations, and commits them in chunks through `MemoryClient.ingest_dialog_v1`:
+
+- commits for one conversation are strictly serialized (each chunk uses the
+  previous chunk's last turn as its cursor); different conversations commit
+  concurrently on a worker pool, optionally capped by a commits/s rate limit;
+- turn ids and commit ids are derived from the message position in the
+  archive, so retries and resumed runs are idempotent on the server;
+- with a checkpoint file, the per-conversation cursor is appended after every
+  successful commit, and a re-run skips what has already been committed;
+- live throughput (turns/s, bytes/s) and ETA are reported via a callback.
+
+Accepted input:
+    JSONL, one message per line:
+        {"conversation_id": "c1", "role": "user", "content": "Hi", "timestamp": "..."}
+    or one conversation per line:
+        {"conversation_id": "c1", "messages": [{"role": "user", "content": "Hi"}, ...]}
+    CSV with a header row: conversation_id, role, content (or text), name, timestamp
+
+Usage:
+    >>> from omem.importer import import_archive
+    >>> result = import_archive(client, "chats.jsonl", checkpoint_path="chats.ckpt")
+
+Or from the command line:
+    python -m omem.importer chats.jsonl --api-key qbk_xxx --checkpoint chats.ckpt
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .client import MemoryClient, _turn_id_from_index
+from .types import CanonicalTurnV1
+
+_ROLES = ("user", "assistant", "tool", "system")
+_MAX_ERRORS_KEPT = 20
+
+# (conversation_id, message, bytes consumed so far)
+_Row = Tuple[str, Dict[str, Any], int]
+
+
+@dataclass
+class ImportProgress:
+    """Snapshot of a running (or finished) import."""
+
+    turns_read: int = 0
+    turns_committed: int = 0
+    turns_skipped: int = 0
+    commits: int = 0
+    failed_commits: int = 0
+    conversations: int = 0
+    bytes_read: int = 0
+    total_bytes: Optional[int] = None
+    elapsed_s: float = 0.0
+    turns_per_s: float = 0.0
+    bytes_per_s: float = 0.0
+    eta_s: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        pct = f"{100.0 * self.bytes_read / self.total_bytes:5.1f}% " if self.total_bytes else ""
+        eta = f" eta {self.eta_s:.0f}s" if self.eta_s is not None else ""
+        return (
+            f"{pct}{self.turns_committed} turns committed ({self.turns_per_s:.1f} turns/s, "
+            f"{self.bytes_per_s / 1024:.1f} KiB/s), {self.commits} commits, "
+            f"{self.failed_commits} failed{eta}"
+        )
+
+
+class _RateLimiter:
+    """Token bucket shared by the commit workers."""
+
+    def __init__(self, rate_per_s: Optional[float]) -> None:
+        self._rate = float(rate_per_s) if rate_per_s else None
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> None:
+        if self._rate is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1.0 / self._rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _Checkpoint:
+    """Append-only log of per-conversation cursors (last committed turn index)."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.cursors: Dict[str, int] = {}
+        self._f = None
+        self._lock = threading.Lock()
+        if not path:
+            return
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                        self.cursors[str(rec["c"])] = int(rec["n"])
+                    except Exception:
+                        # A torn last line from a crash is expected; ignore it.
+                        continue
+        self._f = open(path, "a", encoding="utf-8")
+
+    def record(self, conversation_id: str, last_index: int) -> None:
+        with self._lock:
+            self.cursors[conversation_id] = last_index
+            if self._f is not None:
+                self._f.write(json.dumps({"c": conversation_id, "n": last_index}) + "\n")
+                self._f.flush()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._f.close()
+            self._f = None
+
+
+def _iter_lines(path: str) -> Iterator[Tuple[bytes, int]]:
+    consumed = 0
+    with open(path, "rb") as f:
+        for line in f:
+            consumed += len(line)
+            yield line, consumed
+
+
+def _read_jsonl(path: str, conversation_key: str) -> Iterator[_Row]:
+    for line, consumed in _iter_lines(path):
+        line = line.strip()
+        if not line:
+            continue
+        rec = json.loads(line)
+        cid = str(rec.get(conversation_key) or rec.get("session_id") or "").strip()
+        messages = rec.get("messages")
+        if isinstance(messages, list):
+            for msg in messages:
+                yield cid, msg, consumed
+        else:
+            yield cid, rec, consumed
+
+
+def _read_csv(path: str, conversation_key: str) -> Iterator[_Row]:
+    state = {"consumed": 0}
+
+    def lines() -> Iterator[str]:
+        for line, consumed in _iter_lines(path):
+            state["consumed"] = consumed
+            yield line.decode("utf-8-sig" if consumed == len(line) else "utf-8")
+
+    for row in csv.DictReader(lines()):
+        cid = str(row.get(conversation_key) or row.get("session_id") or "").strip()
+        yield cid, row, state["consumed"]
+
+
+def _message_to_turn(message: Dict[str, Any], turn_id: str) -> Optional[CanonicalTurnV1]:
+    """Convert an archived message to a turn (None if it has no usable content)."""
+    role = str(message.get("role") or "user").strip().lower()
+    if role not in _ROLES:
+        return None
+    text = str(message.get("content") or message.get("text") or message.get("message") or "")
+    if not text.strip():
+        return None
+    timestamp_iso = message.get("timestamp") or message.get("timestamp_iso")
+    return CanonicalTurnV1(
+        turn_id=turn_id,
+        role=role,  # type: ignore[arg-type]
+        text=text,
+        name=(str(message.get("name")).strip() if message.get("name") else None),
+        timestamp_iso=(str(timestamp_iso).strip() if timestamp_iso else None),
+    )
+
+
+class _Chunk:
+    __slots__ = ("conversation_id", "turns", "first_index", "last_index")
+
+    def __init__(self, conversation_id: str, turns: List[CanonicalTurnV1], first_index: int, last_index: int) -> None:
+        self.conversation_id = conversation_id
+        self.turns = turns
+        self.first_index = first_index
+        self.last_index = last_index
+
+
+class ConversationImporter:
+    """Stream an archive into the memory service. See the module docstring."""
+
+    def __init__(
+        self,
+        client: MemoryClient,
+        *,
+        format: str = "auto",
+        conversation_key: str = "conversation_id",
+        chunk_size: int = 50,
+        concurrency: int = 4,
+        max_commits_per_s: Optional[float] = None,
+        max_open_conversations: int = 1000,
+        checkpoint_path: Optional[str] = None,
+        progress_callback: Optional[Callable[[ImportProgress], None]] = None,
+        progress_interval_s: float = 1.0,
+    ) -> None:
+        """Configure an importer.
+
+        Args:
+            client: MemoryClient used for /ingest.
+            format: "jsonl", "csv", or "auto" (by file extension).
+            conversation_key: Field holding the conversation id.
+            chunk_size: Maximum turns per commit.
+            concurrency: Number of conversations committing in parallel.
+            max_commits_per_s: Optional rate limit across all workers.
+            max_open_conversations: Bound on conversations buffered at once;
+                beyond it the oldest buffer is committed early.
+            checkpoint_path: Cursor log for resumable imports.
+            progress_callback: Called with ImportProgress while importing.
+            progress_interval_s: Minimum seconds between progress callbacks.
+        """
+        fmt = str(format or "auto").strip().lower()
+        if fmt not in ("auto", "jsonl", "csv"):
+            raise ValueError("format must be one of: auto, jsonl, csv")
+        if int(chunk_size) <= 0:
+            raise ValueError("chunk_size must be > 0")
+        self._client = client
+        self._format = fmt
+        self._conversation_key = str(conversation_key or "conversation_id")
+        self._chunk_size = int(chunk_size)
+        self._concurrency = max(1, int(concurrency))
+        self._limiter = _RateLimiter(max_commits_per_s)
+        self._max_open = max(1, int(max_open_conversations))
+        self._checkpoint_path = checkpoint_path
+        self._progress_callback = progress_callback
+        self._progress_interval_s = float(progress_interval_s)
+
+    def run(self, path: str) -> ImportProgress:
+        """Import one archive file and return the final progress snapshot."""
+        fmt = self._format
+        if fmt == "auto":
+            fmt = "csv" if str(path).lower().endswith(".csv") else "jsonl"
+        rows = _read_csv(path, self._conversation_key) if fmt == "csv" else _read_jsonl(path, self._conversation_key)
+
+        run = _ImportRun(self, total_bytes=os.path.getsize(path))
+        try:
+            run.consume(rows)
+        finally:
+            run.finish()
+        return run.snapshot()
+
+
+class _ImportRun:
+    """State of a single ConversationImporter.run() call."""
+
+    def __init__(self, importer: ConversationImporter, *, total_bytes: int) -> None:
+        self._imp = importer
+        self._checkpoint = _Checkpoint(importer._checkpoint_path)
+        self._pool = ThreadPoolExecutor(max_workers=importer._concurrency, thread_name_prefix="omem-import")
+        self._lock = threading.Lock()
+        # Chunks waiting for their conversation's previous commit, plus a cap
+        # on all queued chunks so a fast reader cannot outrun the network.
+        self._queued: Dict[str, Deque[_Chunk]] = {}
+        self._slots = threading.BoundedSemaphore(importer._concurrency * 4)
+        self._failed: Set[str] = set()
+
+        self._buffers: "collections.OrderedDict[str, List[CanonicalTurnV1]]" = collections.OrderedDict()
+        self._buffer_start: Dict[str, int] = {}
+        self._index: Dict[str, int] = {}
+
+        self._progress = ImportProgress(total_bytes=total_bytes)
+        self._t0 = time.monotonic()
+        self._last_report = 0.0
+
+    # ---- reader side (calling thread) ----
+
+    def consume(self, rows: Iterator[_Row]) -> None:
+        cursors = self._checkpoint.cursors
+        for cid, message, consumed in rows:
+            self._progress.bytes_read = consumed
+            if not cid or not isinstance(message, dict):
+                self._progress.turns_skipped += 1
+                continue
+            idx = self._index.get(cid)
+            if idx is None:
+                self._progress.conversations += 1
+                idx = 0
+            turn = _message_to_turn(message, _turn_id_from_index(idx + 1))
+            if turn is None:
+                self._progress.turns_skipped += 1
+                continue
+            idx += 1
+            self._index[cid] = idx
+            self._progress.turns_read += 1
+            if idx <= cursors.get(cid, 0):
+                continue  # committed by a previous run
+            buf = self._buffers.get(cid)
+            if buf is None:
+                buf = self._buffers[cid] = []
+                self._buffer_start[cid] = idx
+                if len(self._buffers) > self._imp._max_open:
+                    self._flush(next(iter(self._buffers)))
+            buf.append(turn)
+            if len(buf) >= self._imp._chunk_size:
+                self._flush(cid)
+            self._maybe_report()
+        for cid in list(self._buffers):
+            self._flush(cid)
+
+    def _flush(self, cid: str) -> None:
+        turns = self._buffers.pop(cid, None)
+        first = self._buffer_start.pop(cid, 0)
+        if not turns:
+            return
+        self._slots.acquire()
+        chunk = _Chunk(cid, turns, first, first + len(turns) - 1)
+        with self._lock:
+            if cid in self._queued:
+                # A commit for this conversation is in flight; run after it.
+                self._queued[cid].append(chunk)
+                return
+            self._queued[cid] = collections.deque()
+        self._pool.submit(self._commit, chunk)
+
+    # ---- worker side ----
+
+    def _commit(self, chunk: _Chunk) -> None:
+        cid = chunk.conversation_id
+        try:
+            with self._lock:
+                skip = cid in self._failed
+            if not skip:
+                self._imp._limiter.acquire()
+                base = _turn_id_from_index(chunk.first_index - 1) if chunk.first_index > 1 else None
+                try:
+                    self._client_commit(chunk, base)
+                except Exception as exc:
+                    with self._lock:
+                        # Later chunks would break the cursor chain; stop this conversation.
+                        self._failed.add(cid)
+                        self._progress.failed_commits += 1
+                        if len(self._progress.errors) < _MAX_ERRORS_KEPT:
+                            self._progress.errors.append(f"{cid}: {type(exc).__name__}: {str(exc)[:200]}")
+                else:
+                    self._checkpoint.record(cid, chunk.last_index)
+                    with self._lock:
+                        self._progress.commits += 1
+                        self._progress.turns_committed += len(chunk.turns)
+        finally:
+            self._slots.release()
+            with self._lock:
+                nxt = self._queued[cid].popleft() if self._queued[cid] else None
+                if nxt is None:
+                    del self._queued[cid]
+            if nxt is not None:
+                self._pool.submit(self._commit, nxt)
+
+    def _client_commit(self, chunk: _Chunk, base_turn_id: Optional[str]) -> None:
+        self._imp._client.ingest_dialog_v1(
+            session_id=chunk.conversation_id,
+            turns=chunk.turns,
+            commit_id=f"import:{chunk.conversation_id}:{chunk.turns[0].turn_id}-{chunk.turns[-1].turn_id}",
+            base_turn_id=base_turn_id,
+        )
+
+    # ---- progress ----
+
+    def snapshot(self) -> ImportProgress:
+        with self._lock:
+            p = ImportProgress(**asdict(self._progress))
+        p.elapsed_s = time.monotonic() - self._t0
+        if p.elapsed_s > 0:
+            p.turns_per_s = p.turns_committed / p.elapsed_s
+            p.bytes_per_s = p.bytes_read / p.elapsed_s
+        if p.total_bytes and p.bytes_per_s > 0:
+            p.eta_s = max(0.0, (p.total_bytes - p.bytes_read) / p.bytes_per_s)
+        return p
+
+    def _maybe_report(self, force: bool = False) -> None:
+        cb = self._imp._progress_callback
+        if cb is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_report >= self._imp._progress_interval_s:
+            self._last_report = now
+            cb(self.snapshot())
+
+    def finish(self) -> None:
+        # Wait for every queued chunk (chained submissions included).
+        while True:
+            with self._lock:
+                if not self._queued:
+                    break
+            time.sleep(0.01)
+        self._pool.shutdown(wait=True)
+        self._checkpoint.close()
+        self._maybe_report(force=True)
+
+
+def import_archive(client: MemoryClient, path: str, **kwargs: Any) -> ImportProgress:
+    """Import a JSONL/CSV conversation archive. See ConversationImporter for options."""
+    return ConversationImporter(client, **kwargs).run(path)
+
+
+__all__ = [
+    "ConversationImporter",
+    "ImportProgress",
+    "import_archive",
+]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .memory import DEFAULT_ENDPOINT
+
+    parser = argparse.ArgumentParser(prog="python -m omem.importer", description="Import conversation archives.")
+    parser.add_argument("path", help="JSONL or CSV archive")
+    parser.add_argument("--api-key", default=os.environ.get("OMEM_API_KEY"), help="API key (default: $OMEM_API_KEY)")
+    parser.add_argument("--endpoint", default=os.environ.get("OMEM_ENDPOINT") or DEFAULT_ENDPOINT)
+    parser.add_argument("--format", default="auto", choices=("auto", "jsonl", "csv"))
+    parser.add_argument("--conversation-key", default="conversation_id")
+    parser.add_argument("--checkpoint", default=None, help="Cursor log for resumable imports")
+    parser.add_argument("--chunk-size", type=int, default=50, help="Max turns per commit")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None, help="Max commits per second")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error("--api-key (or $OMEM_API_KEY) is required")
+
+    def report(p: ImportProgress) -> None:
+        print(f"\r{p}", end="", file=sys.stderr, flush=True)
+
+    client = MemoryClient(
+        base_url=args.endpoint,
+        tenant_id="__from_api_key__",
+        api_token=args.api_key,
+        mode="saas",
+    )
+    try:
+        result = import_archive(
+            client,
+            args.path,
+            format=args.format,
+            conversation_key=args.conversation_key,
+            chunk_size=args.chunk_size,
+            concurrency=args.concurrency,
+            max_commits_per_s=args.rate,
+            checkpoint_path=args.checkpoint,
+            progress_callback=(None if args.quiet else report),
+        )
+    finally:
+        client.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(json.dumps(asdict(result)))
+    return 1 if result.failed_commits else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
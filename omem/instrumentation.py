@@ -0,0 +1,148 @@
+"""Per-request instrumentation for MemoryClient.
+
+Register a callable with `MemoryClient(hooks=[...])` or
+`client.add_request_hook(fn)`; it receives one `RequestEvent` per HTTP
+attempt (retries included), after the attempt finishes:
+
+    >>> def log_event(ev):
+    ...     print(ev.endpoint, ev.status_code, f"{ev.duration_ms:.1f}ms", ev.phases_ms)
+    >>> client.add_request_hook(log_event)
+
+Phase timings come from httpcore's "trace" extension and are only collected
+while at least one hook is registered; without hooks the request path is
+unchanged. Hooks run on the calling thread and must be fast; exceptions
+raised by a hook are swallowed so instrumentation can never break a request.
+
+OpenTelemetry is supported through `enable_opentelemetry(client)`, which
+registers a span-per-attempt hook only when `opentelemetry` is installed.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import MemoryClient
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """One HTTP attempt made by MemoryClient."""
+
+    method: str
+    endpoint: str  # Route template, e.g. "/ingest/jobs/{job_id}"
+    url: str
+    attempt: int  # 0 for the first try, 1 for the first retry, ...
+    request_id: str
+    status_code: Optional[int] = None  # None when no response was received
+    error_type: Optional[str] = None  # OmemHttpError subclass or transport exception name
+    will_retry: bool = False
+    backoff_s: float = 0.0  # Time slept before this attempt
+    request_bytes: int = 0
+    response_bytes: int = 0
+    start_time: float = 0.0  # Epoch seconds when the attempt started
+    duration_ms: float = 0.0
+    # connect / tls / send / server (time to first response byte) / receive
+    phases_ms: Dict[str, float] = field(default_factory=dict)
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+# httpcore trace event prefix -> phase name
+_TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "tls",
+    "send_request_headers": "send",
+    "send_request_body": "send",
+    "receive_response_headers": "server",
+    "receive_response_body": "receive",
+}
+
+
+class PhaseTracer:
+    """Collects phase durations from httpcore's trace extension callbacks."""
+
+    __slots__ = ("phases_ms", "_started")
+
+    def __init__(self) -> None:
+        self.phases_ms: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        # e.g. "connection.connect_tcp.started", "http11.receive_response_headers.complete"
+        parts = event_name.split(".")
+        if len(parts) != 3:
+            return
+        phase = _TRACE_PHASES.get(parts[1])
+        if phase is None:
+            return
+        if parts[2] == "started":
+            self._started[parts[1]] = time.perf_counter()
+        elif parts[2] in ("complete", "failed"):
+            t0 = self._started.pop(parts[1], None)
+            if t0 is not None:
+                self.phases_ms[phase] = self.phases_ms.get(phase, 0.0) + (time.perf_counter() - t0) * 1000
+
+
+class OpenTelemetryHook:
+    """Request hook that records each attempt as an OpenTelemetry client span."""
+
+    def __init__(self, tracer: Any = None) -> None:
+        from opentelemetry import trace  # optional dependency
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("omem")
+
+    def __call__(self, ev: RequestEvent) -> None:
+        start_ns = int(ev.start_time * 1e9)
+        attributes: Dict[str, Any] = {
+            "http.request.method": ev.method,
+            "http.route": ev.endpoint,
+            "url.full": ev.url,
+            "http.request.resend_count": ev.attempt,
+            "http.request.body.size": ev.request_bytes,
+            "http.response.body.size": ev.response_bytes,
+            "omem.request_id": ev.request_id,
+            "omem.backoff_s": ev.backoff_s,
+        }
+        if ev.status_code is not None:
+            attributes["http.response.status_code"] = ev.status_code
+        if ev.error_type:
+            attributes["error.type"] = ev.error_type
+        for phase, ms in ev.phases_ms.items():
+            attributes[f"omem.phase.{phase}_ms"] = ms
+        span = self._tracer.start_span(
+            f"{ev.method} {ev.endpoint}",
+            kind=self._trace.SpanKind.CLIENT,
+            start_time=start_ns,
+            attributes=attributes,
+        )
+        if ev.error_type:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, ev.error_type))
+        span.end(end_time=start_ns + int(ev.duration_ms * 1e6))
+
+
+def enable_opentelemetry(client: "MemoryClient", tracer: Any = None) -> bool:
+    """Emit OpenTelemetry spans for `client` requests if opentelemetry is installed.
+
+    Returns:
+        True if the span hook was registered, False if opentelemetry is missing.
+    """
+    try:
+        hook = OpenTelemetryHook(tracer)
+    except ImportError:
+        return False
+    client.add_request_hook(hook)
+    return True
+
+
+__all__ = [
+    "RequestEvent",
+    "RequestHook",
+    "PhaseTracer",
+    "OpenTelemetryHook",
+    "enable_opentelemetry",
+]
@@ -0,0 +1,382 @@
+"""Load generator for mixed add/search workloads.
+
+Drives `Memory` with an open-loop schedule: adds and searches arrive as
+Poisson processes at the configured rates, independently of how fast the
+service answers, so a slow backend shows up as growing latency rather than
+as silently reduced load. Latency is measured from each operation's
+scheduled start (it includes time spent waiting for a free worker).
+
+    python -m omem.loadgen --fake --duration 30 --conversations 50 \\
+        --turns-per-s 100 --search-qps 20 --mode threaded --output run.json
+
+    python -m omem.loadgen --endpoint https://... --api-key qbk_... --mode async
+
+Programmatic use:
+    >>> from omem.loadgen import LoadConfig, run_load
+    >>> report = run_load(mem, LoadConfig(duration_s=10, search_qps=5))
+    >>> print(report.to_dict()["ops"]["search"]["p99_ms"])
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .memory import Memory
+from .metrics import ERRORS_TOTAL, RETRIES_TOTAL, LogHistogram
+
+_MODES = ("sync", "threaded", "async")
+
+DEFAULT_QUERIES: Tuple[Tuple[str, float], ...] = (
+    ("What did Caroline say about the trip?", 3.0),
+    ("budget review", 2.0),
+    ("West Lake", 2.0),
+    ("when is the next meeting", 1.0),
+)
+
+_WORDS = (
+    "the meeting trip budget review Friday Caroline Alice Bob West Lake Hangzhou project deadline "
+    "dinner flight hotel report design launch notes tea coffee weekend plan call team update"
+).split()
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """Workload shape for run_load()."""
+
+    duration_s: float = 30.0
+    conversations: int = 20
+    # Aggregate rate of turns added across all conversations.
+    turns_per_s: float = 20.0
+    turns_per_add: int = 2
+    search_qps: float = 5.0
+    # (query, weight) pairs; queries are drawn proportionally to weight.
+    queries: Sequence[Tuple[str, float]] = DEFAULT_QUERIES
+    # Message length in words: lognormal with this median and sigma, capped.
+    message_words_median: float = 20.0
+    message_words_sigma: float = 0.6
+    message_words_max: int = 400
+    search_limit: int = 10
+    mode: str = "threaded"
+    concurrency: int = 8
+    seed: Optional[int] = None
+
+
+@dataclass
+class OpStats:
+    count: int = 0
+    errors: int = 0
+    throughput_per_s: float = 0.0
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    mean_ms: Optional[float] = None
+
+
+@dataclass
+class LoadReport:
+    """Result of a load run; `to_dict()` is JSON-serializable."""
+
+    mode: str
+    duration_s: float
+    scheduled: int
+    completed: int
+    turns_added: int
+    ops: Dict[str, OpStats] = field(default_factory=dict)
+    # Exceptions raised to the caller, by class name.
+    errors: Dict[str, int] = field(default_factory=dict)
+    # Failed HTTP attempts (retried or not), by error class, from client metrics.
+    http_errors: Dict[str, int] = field(default_factory=dict)
+    retries: int = 0
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _schedule(cfg: LoadConfig, rng: random.Random) -> List[Tuple[float, str]]:
+    """Poisson arrival times (seconds from start) for adds and searches."""
+    ops: List[Tuple[float, str]] = []
+    add_rate = float(cfg.turns_per_s) / max(1, int(cfg.turns_per_add))
+    for kind, rate in (("add", add_rate), ("search", float(cfg.search_qps))):
+        if rate <= 0:
+            continue
+        t = rng.expovariate(rate)
+        while t < cfg.duration_s:
+            ops.append((t, kind))
+            t += rng.expovariate(rate)
+    ops.sort()
+    return ops
+
+
+class _Workload:
+    """Builds operations and records their outcomes (thread-safe)."""
+
+    def __init__(self, mem: Memory, cfg: LoadConfig, rng: random.Random) -> None:
+        self._mem = mem
+        self._cfg = cfg
+        self._rng = rng
+        self._rng_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._run_id = f"{int(time.time())}-{rng.randrange(1 << 30):x}"
+        self.hist: Dict[str, LogHistogram] = {"add": LogHistogram(), "search": LogHistogram()}
+        self.counts: Counter = Counter()
+        self.failures: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.turns = 0
+        queries = list(cfg.queries) or list(DEFAULT_QUERIES)
+        self._queries = [q for q, _ in queries]
+        self._weights = [max(0.0, float(w)) for _, w in queries]
+
+    def _message(self) -> str:
+        mu = math.log(max(1.0, float(self._cfg.message_words_median)))
+        with self._rng_lock:
+            n = int(min(self._cfg.message_words_max, max(1, self._rng.lognormvariate(mu, self._cfg.message_words_sigma))))
+            return " ".join(self._rng.choice(_WORDS) for _ in range(n))
+
+    def build(self, kind: str) -> Callable[[], None]:
+        if kind == "add":
+            with self._rng_lock:
+                conv = f"loadgen-{self._run_id}-{self._rng.randrange(max(1, self._cfg.conversations))}"
+            n = max(1, int(self._cfg.turns_per_add))
+            msgs = [
+                {"role": ("user" if i % 2 == 0 else "assistant"), "content": self._message()} for i in range(n)
+            ]
+
+            def add() -> None:
+                self._mem.add(conv, msgs)
+                with self._lock:
+                    self.turns += len(msgs)
+
+            return add
+        with self._rng_lock:
+            query = self._rng.choices(self._queries, weights=self._weights)[0]
+        return lambda: self._mem.search(query, limit=self._cfg.search_limit)
+
+    def run(self, kind: str, fn: Callable[[], None], scheduled_at: float) -> None:
+        try:
+            fn()
+        except Exception as exc:
+            with self._lock:
+                self.failures[kind] += 1
+                self.errors[type(exc).__name__] += 1
+        finally:
+            self.hist[kind].record((time.perf_counter() - scheduled_at) * 1000)
+            with self._lock:
+                self.counts[kind] += 1
+
+
+def _run_sync(w: _Workload, ops: List[Tuple[float, str]], t0: float) -> None:
+    for at, kind in ops:
+        fn = w.build(kind)
+        due = t0 + at
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        w.run(kind, fn, due)
+
+
+def _run_threaded(w: _Workload, ops: List[Tuple[float, str]], t0: float, concurrency: int) -> None:
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="omem-loadgen") as pool:
+        for at, kind in ops:
+            fn = w.build(kind)
+            due = t0 + at
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(w.run, kind, fn, due)
+
+
+async def _run_async(w: _Workload, ops: List[Tuple[float, str]], t0: float, concurrency: int) -> None:
+    # Memory is synchronous; the event loop schedules arrivals and the calls
+    # run on a bounded executor.
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="omem-loadgen")
+    tasks: List["asyncio.Future[None]"] = []
+    try:
+        for at, kind in ops:
+            fn = w.build(kind)
+            due = t0 + at
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(loop.run_in_executor(pool, w.run, kind, fn, due))
+        await asyncio.gather(*tasks)
+    finally:
+        pool.shutdown(wait=True)
+
+
+def run_load(mem: Memory, config: Optional[LoadConfig] = None) -> LoadReport:
+    """Run a mixed add/search workload against `mem` and report the results."""
+    cfg = config or LoadConfig()
+    if cfg.mode not in _MODES:
+        raise ValueError("mode must be one of: sync, threaded, async")
+    rng = random.Random(cfg.seed)
+    ops = _schedule(cfg, rng)
+    w = _Workload(mem, cfg, rng)
+    before = mem.metrics()
+    concurrency = max(1, int(cfg.concurrency))
+
+    t0 = time.perf_counter()
+    if cfg.mode == "sync":
+        _run_sync(w, ops, t0)
+    elif cfg.mode == "threaded":
+        _run_threaded(w, ops, t0, concurrency)
+    else:
+        asyncio.run(_run_async(w, ops, t0, concurrency))
+    elapsed = time.perf_counter() - t0
+    after = mem.metrics()
+
+    stats: Dict[str, OpStats] = {}
+    for kind, hist in w.hist.items():
+        snap = hist.snapshot()
+        stats[kind] = OpStats(
+            count=snap.count,
+            errors=w.failures[kind],
+            throughput_per_s=(snap.count / elapsed if elapsed > 0 else 0.0),
+            p50_ms=snap.percentile(0.5),
+            p95_ms=snap.percentile(0.95),
+            p99_ms=snap.percentile(0.99),
+            max_ms=(snap.max if snap.count else None),
+            mean_ms=snap.mean,
+        )
+
+    def delta(name: str) -> Dict[Tuple[Tuple[str, str], ...], float]:
+        out: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        for (n, labels), v in after.counters.items():
+            if n == name:
+                out[labels] = v - before.counters.get((n, labels), 0.0)
+        return out
+
+    http_errors = {dict(labels).get("error", "?"): int(v) for labels, v in delta(ERRORS_TOTAL).items() if v}
+    retries = int(sum(delta(RETRIES_TOTAL).values()))
+
+    return LoadReport(
+        mode=cfg.mode,
+        duration_s=elapsed,
+        scheduled=len(ops),
+        completed=sum(w.counts.values()),
+        turns_added=w.turns,
+        ops=stats,
+        errors=dict(w.errors),
+        http_errors=http_errors,
+        retries=retries,
+        config={k: (list(v) if isinstance(v, tuple) else v) for k, v in asdict(cfg).items()},
+    )
+
+
+__all__ = [
+    "LoadConfig",
+    "LoadReport",
+    "OpStats",
+    "run_load",
+]
+
+
+def _format(report: LoadReport) -> str:
+    lines = [f"{report.completed}/{report.scheduled} ops in {report.duration_s:.1f}s ({report.mode}), {report.turns_added} turns"]
+    for kind, s in report.ops.items():
+        if not s.count:
+            continue
+        lines.append(
+            f"  {kind:6s} {s.count:6d} ops {s.throughput_per_s:7.1f}/s  "
+            f"p50 {s.p50_ms or 0:7.1f}ms  p95 {s.p95_ms or 0:7.1f}ms  p99 {s.p99_ms or 0:7.1f}ms  errors {s.errors}"
+        )
+    if report.errors:
+        lines.append("  errors: " + ", ".join(f"{k}={v}" for k, v in sorted(report.errors.items())))
+    lines.append(f"  retries: {report.retries}")
+    return "\n".join(lines)
+
+
+def _parse_query(raw: str) -> Tuple[str, float]:
+    text, sep, weight = raw.rpartition(":")
+    if sep:
+        try:
+            return text, float(weight)
+        except ValueError:
+            pass
+    return raw, 1.0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .memory import DEFAULT_ENDPOINT
+
+    parser = argparse.ArgumentParser(prog="python -m omem.loadgen", description="Mixed add/search load generator.")
+    target = parser.add_argument_group("target")
+    target.add_argument("--fake", action="store_true", help="Run against the in-process fake service")
+    target.add_argument("--fake-latency-ms", type=float, default=0.0, help="Median fake latency (lognormal)")
+    target.add_argument("--fake-error-rate", type=float, default=0.0)
+    target.add_argument("--api-key", default=os.environ.get("OMEM_API_KEY"), help="API key (default: $OMEM_API_KEY)")
+    target.add_argument("--endpoint", default=os.environ.get("OMEM_ENDPOINT") or DEFAULT_ENDPOINT)
+    parser.add_argument("--mode", default="threaded", choices=_MODES)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load to schedule")
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--turns-per-s", type=float, default=20.0)
+    parser.add_argument("--turns-per-add", type=int, default=2)
+    parser.add_argument("--search-qps", type=float, default=5.0)
+    parser.add_argument("--query", action="append", default=None, help='Query, optionally weighted: "text:3" (repeatable)')
+    parser.add_argument("--message-words", type=float, default=20.0, help="Median words per message")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    http = None
+    api_key = args.api_key
+    endpoint = args.endpoint
+    if args.fake:
+        from .fake_service import FakeOmemService, FakeServiceConfig, lognormal_latency
+
+        fake = FakeOmemService(
+            FakeServiceConfig(
+                latency=(lognormal_latency(args.fake_latency_ms) if args.fake_latency_ms > 0 else None),
+                error_rate=args.fake_error_rate,
+                seed=args.seed,
+            )
+        )
+        http = fake.http_client()
+        api_key, endpoint = api_key or "qbk_fake", "http://omem.fake"
+    elif not api_key:
+        parser.error("--api-key (or $OMEM_API_KEY) is required unless --fake is used")
+
+    cfg = LoadConfig(
+        duration_s=args.duration,
+        conversations=args.conversations,
+        turns_per_s=args.turns_per_s,
+        turns_per_add=args.turns_per_add,
+        search_qps=args.search_qps,
+        queries=(tuple(_parse_query(q) for q in args.query) if args.query else DEFAULT_QUERIES),
+        message_words_median=args.message_words,
+        mode=args.mode,
+        concurrency=args.concurrency,
+        seed=args.seed,
+    )
+    mem = Memory(api_key=api_key, endpoint=endpoint, http=http, max_workers=args.concurrency)
+    try:
+        report = run_load(mem, cfg)
+    finally:
+        mem.close()
+
+    print(_format(report), file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    else:
+        print(json.dumps(report.to_dict()))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
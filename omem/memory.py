@@ -13,11 +13,19 @@ Design principles:
 
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as _FutureTimeout
+from concurrent.futures import wait as _wait_futures
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from .client import MemoryClient, OmemClientError
+from .client import MemoryClient, OmemClientError, OmemHttpError
+from .metrics import MetricsSnapshot
 from .models import (
     AddResult,
     Entity,
@@ -27,28 +35,36 @@ from .models import (
     ExtractedKnowledge,
     MemoryItem,
     SearchResult,
+    parse_datetime,
 )
-from .types import CanonicalTurnV1
+from .timings import build_search_timings, record_search_timings
+from .types import CanonicalAttachmentV1, CanonicalTurnV1
+
+if TYPE_CHECKING:
+    import httpx
+
+    # Imported where first used: attachments, the fallback store and the
+    # read-your-writes overlay are opt-in, and a plain Memory should not pay for them.
+    from .attachments import AttachmentSource, AttachmentUploader
+    from .fallback import CircuitBreaker, LocalFallbackStore
+    from .overlay import RecentWritesOverlay
 
 # Default cloud service endpoint
 DEFAULT_ENDPOINT = "https://zdfdulpnyaci.sealoshzh.site/api/v1/memory"
 
+_ENRICH_MODES = ("context", "evidence")
+_FUSION_MODES = ("rrf", "max")
 
-def _parse_datetime(val: Any) -> Optional[datetime]:
-    """Parse datetime from various formats."""
-    if val is None:
-        return None
-    if isinstance(val, datetime):
-        return val
+
+_parse_datetime = parse_datetime
+
+
+def _interned(values: Any) -> List[Any]:
+    """List of `values` with strings interned (entity names repeat across items)."""
     try:
-        s = str(val).strip()
-        if not s:
-            return None
-        # Handle ISO format with Z suffix
-        s = s.replace("Z", "+00:00")
-        return datetime.fromisoformat(s)
-    except Exception:
-        return None
+        return [sys.intern(v) for v in values or ()]
+    except TypeError:  # not all strings
+        return [sys.intern(v) if type(v) is str else v for v in values]
 
 
 def _now_iso() -> str:
@@ -56,6 +72,193 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _evidences_from_explain(data: Dict[str, Any]) -> List[Evidence]:
+    """Build Evidence objects from an explain/event payload."""
+    evidences: List[Evidence] = []
+
+    # Prefer utterance-level evidence when available (dialog data)
+    for u in data.get("utterances") or []:
+        text = str(u.get("raw_text") or u.get("text") or "")
+        if not text:
+            continue
+        evidences.append(
+            Evidence(
+                id=str(u.get("id") or ""),
+                text=text,
+                entity_id="",  # entity is implicit in the event; leave empty for now
+                confidence=float(u.get("confidence") or 0.0),
+                timestamp=u.get("t_media_start") or u.get("timestamp"),
+                segment_id=str(u.get("segment_id")) if u.get("segment_id") else None,
+            )
+        )
+
+    # Fallback: use generic evidences array if utterances are missing
+    if not evidences:
+        for ev in data.get("evidences") or []:
+            text = str(ev.get("text") or "")
+            if not text:
+                continue
+            evidences.append(
+                Evidence(
+                    id=str(ev.get("id") or ""),
+                    text=text,
+                    entity_id="",
+                    confidence=float(ev.get("confidence") or 0.0),
+                    timestamp=ev.get("t_media_start") or ev.get("timestamp"),
+                    segment_id=str(ev.get("segment_id")) if ev.get("segment_id") else None,
+                )
+            )
+
+    return evidences
+
+
+def _event_context_from_explain(
+    event_id: str,
+    data: Dict[str, Any],
+    *,
+    fallback_summary: str = "",
+) -> EventContext:
+    """Build an EventContext from an explain/event payload."""
+    # Extract entities
+    entities: List[str] = []
+    for ent in data.get("entities") or []:
+        name = ent.get("name", "")
+        etype = ent.get("type", "")
+        if name:
+            entities.append(f"{name} ({etype})" if etype else name)
+
+    # Extract knowledge (structured facts)
+    knowledge: List[ExtractedKnowledge] = []
+    for k in data.get("knowledge") or []:
+        summary = k.get("summary") or k.get("text") or ""
+        if summary:
+            knowledge.append(
+                ExtractedKnowledge(
+                    id=str(k.get("id") or ""),
+                    summary=summary,
+                    importance=float(k.get("importance") or 0.5),
+                    timestamp=k.get("t_abs_start"),
+                )
+            )
+
+    # Extract places
+    places: List[str] = []
+    for p in data.get("places") or []:
+        name = p.get("name", "")
+        if name:
+            places.append(name)
+
+    # Extract source utterances
+    utterances: List[str] = []
+    for u in data.get("utterances") or []:
+        text = u.get("raw_text") or u.get("text") or ""
+        if text:
+            utterances.append(text)
+
+    # Get event summary and timestamp
+    event = data.get("event") or {}
+    summary = event.get("summary") or fallback_summary
+    timestamp = _parse_datetime(event.get("t_abs_start"))
+
+    # Get session kind from timeslices
+    session_kind = None
+    timeslices = data.get("timeslices") or []
+    if timeslices:
+        session_kind = timeslices[0].get("kind")
+
+    return EventContext(
+        event_id=event_id,
+        summary=summary,
+        entities=entities,
+        knowledge=knowledge,
+        places=places,
+        utterances=utterances,
+        timestamp=timestamp,
+        session_kind=session_kind,
+    )
+
+
+def _items_from_retrieval(resp: Dict[str, Any]) -> List[MemoryItem]:
+    """Build MemoryItems from a /retrieval response."""
+    items: List[MemoryItem] = []
+    for e in resp.get("evidence_details") or []:
+        text = str(e.get("text") or "").strip()
+        if not text:
+            continue
+        # Prefer tkg_event_id (actual TKG event ID) over event_id (logical ID)
+        # tkg_event_id is needed for get_evidence_for() to work with explain endpoint
+        event_id = str(e.get("tkg_event_id") or e.get("event_id") or "").strip() or None
+        items.append(
+            MemoryItem(
+                text=text,
+                score=float(e.get("score") or 0.0),
+                timestamp=e.get("timestamp"),
+                source=sys.intern(str(e.get("source") or "unknown")),
+                entities=_interned(e.get("entities")),
+                event_id=event_id,
+            )
+        )
+    return items
+
+
+def _event_from_graph(item: Dict[str, Any], *, timestamp: Any = None, evidence: Optional[str] = None) -> Event:
+    """Build an Event from a graph listing item; `timestamp` is used when it has no t_abs_start."""
+    return Event(
+        id=str(item.get("id") or ""),
+        summary=str(item.get("summary") or ""),
+        timestamp=item.get("t_abs_start") or timestamp,
+        entities=_interned(item.get("involves")),
+        evidence=evidence,
+    )
+
+
+def _evidence_from_timeline(item: Dict[str, Any], entity_id: str) -> Evidence:
+    """Build an Evidence from an entity timeline item (Evidence or UtteranceEvidence)."""
+    return Evidence(
+        id=str(item.get("evidence_id") or item.get("utterance_id") or item.get("id") or ""),
+        text=str(item.get("text") or item.get("raw_text") or ""),
+        entity_id=entity_id,
+        # Use confidence from response, default to 0.9 for utterances
+        confidence=float(item.get("confidence") or 0.9),
+        timestamp=item.get("t_media_start") or item.get("timestamp"),
+        segment_id=str(item.get("segment_id")) if item.get("segment_id") else None,
+    )
+
+
+def _dedup_key(item: MemoryItem) -> str:
+    """Identity of a memory across queries: event id, else normalized text hash."""
+    if item.event_id:
+        return f"e:{item.event_id}"
+    norm = " ".join(item.text.lower().split())
+    return "t:" + hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+def _fuse_ranked(ranked: Sequence[List[MemoryItem]], mode: str, rrf_k: int) -> List[MemoryItem]:
+    """Deduplicate and fuse several ranked item lists into one.
+
+    "rrf" sums 1 / (rrf_k + rank) over the lists an item appears in; "max"
+    keeps the best retrieval score. The returned items carry the fused score.
+    """
+    fused: Dict[str, float] = {}
+    best: Dict[str, MemoryItem] = {}
+    for items in ranked:
+        seen = set()
+        for rank, item in enumerate(items, 1):
+            key = _dedup_key(item)
+            if key in seen:
+                continue
+            seen.add(key)
+            if mode == "rrf":
+                fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            else:
+                fused[key] = max(fused.get(key, item.score), item.score)
+            if key not in best or item.score > best[key].score:
+                best[key] = item
+    # sorted() is stable, so ties keep first-seen order.
+    order = sorted(fused, key=lambda k: fused[k], reverse=True)
+    return [dataclasses.replace(best[k], score=fused[k]) for k in order]
+
+
 class Memory:
     """High-level Memory API for omem.
 
@@ -92,6 +295,15 @@ class Memory:
         endpoint: Optional[str] = None,
         user_id: Optional[str] = None,
         timeout_s: float = 30.0,
+        max_workers: int = 8,
+        http: Optional[httpx.Client] = None,
+        warm_on_init: bool = False,
+        keepalive_s: Optional[float] = None,
+        shared_transport: bool = False,
+        read_your_writes: bool = False,
+        fallback: Optional[LocalFallbackStore] = None,
+        latency_budget_ms: Optional[float] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
     ) -> None:
         """Initialize Memory client.
 
@@ -103,6 +315,30 @@ class Memory:
                 Use this to separate memories for different end users.
                 If not provided, all memories are shared under your API key.
             timeout_s: Request timeout in seconds.
+            max_workers: Size of the shared thread pool used for concurrent
+                calls (search(enrich=...), search_many()).
+            http: Optional pre-configured httpx.Client (e.g. routed to
+                omem.fake_service.FakeOmemService or a cassette transport).
+            warm_on_init: Open a pooled connection in the background right
+                away, so the first search() does not pay connection setup.
+            keepalive_s: If set, ping the service whenever the client has been
+                idle this long, keeping the pooled connection open.
+            shared_transport: Reuse one process-wide connection pool per
+                endpoint across all Memory instances (for apps that create a
+                Memory per end user or per request).
+            read_your_writes: Index committed turns locally until their
+                ingest job completes, and merge matching ones into search()
+                results (source="overlay"), so recent messages are found
+                before the backend has processed them.
+            fallback: Local store (omem.fallback.LocalFallbackStore) fed by
+                successful searches and committed turns. search() answers
+                from it, with source="local" items, while the circuit breaker
+                is open or the server misses `latency_budget_ms`.
+            latency_budget_ms: With a fallback, how long search() waits for
+                the server before answering locally.
+            circuit_breaker: Breaker guarding search() when a fallback is
+                set; defaults to CircuitBreaker(metrics=...) with 5
+                consecutive failures and a 30 s reset.
         """
         if not api_key:
             raise ValueError("api_key is required")
@@ -114,6 +350,15 @@ class Memory:
         # but does not currently affect SaaS data partitioning.
         self._user_id = str(user_id).strip() if user_id else None
         self._timeout_s = float(timeout_s)
+        self._max_workers = max(1, int(max_workers))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._uploader: Optional[AttachmentUploader] = None
+        self._overlay: Optional[RecentWritesOverlay] = None
+        if read_your_writes:
+            from .overlay import RecentWritesOverlay
+
+            self._overlay = RecentWritesOverlay(parse_timestamp=_parse_datetime)
 
         self._client = MemoryClient(
             base_url=self._endpoint,
@@ -122,8 +367,26 @@ class Memory:
             memory_domain="dialog",
             api_token=self._api_key,
             timeout_s=self._timeout_s,
+            http=http,
             mode="saas",
+            shared_transport=shared_transport,
         )
+        self._fallback = fallback
+        # Search results waiting to be written to the fallback store, off the search path.
+        self._feed_lock = threading.Lock()
+        self._feed_pending: List[Tuple[Optional[str], List[MemoryItem]]] = []
+        self._feed_scheduled = False
+        self._feed_write_lock = threading.Lock()
+        self._latency_budget_s = float(latency_budget_ms) / 1000 if latency_budget_ms is not None else None
+        self._breaker = circuit_breaker
+        if fallback is not None and circuit_breaker is None:
+            from .fallback import CircuitBreaker
+
+            self._breaker = CircuitBreaker(metrics=self._client.metrics)
+        if keepalive_s is not None:
+            self._client.start_keepalive(keepalive_s)
+        if warm_on_init:
+            self.warmup(wait=False)
 
     # ========== Write API ==========
 
@@ -145,7 +408,8 @@ class Memory:
             conversation_id: Unique identifier for the conversation.
             messages: List of messages in OpenAI format:
                 [{"role": "user", "content": "Hello"}, ...]
-                Supported fields: role, content (or text), name, timestamp
+                Supported fields: role, content (or text), name, timestamp,
+                attachments (file paths/bytes, uploaded once per unique content)
             wait: If True, wait for backend processing to complete.
             timeout_s: Timeout (seconds) when wait=True.
 
@@ -204,8 +468,26 @@ class Memory:
             conversation_id=conversation_id,
             sync_cursor=sync_cursor,
             auto_timestamp=True,
+            uploader=self._attachment_uploader(),
+            on_commit=self._on_commit,
         )
 
+    def _on_commit(self, conversation_id: str, job_id: Optional[str], turns: List[CanonicalTurnV1], completed: bool) -> None:
+        """Feed committed turns to the local search layers."""
+        if self._overlay is not None and not completed:
+            self._overlay.record(conversation_id, job_id, turns)
+        if self._fallback is not None:
+            self._fallback.add_turns(conversation_id, turns)
+
+    def _attachment_uploader(self) -> AttachmentUploader:
+        """Return the uploader shared by all conversations (and its dedup cache)."""
+        with self._pool_lock:
+            if self._uploader is None:
+                from .attachments import AttachmentUploader
+
+                self._uploader = AttachmentUploader(self._client)
+            return self._uploader
+
     # ========== Search API ==========
 
     def search(
@@ -216,6 +498,9 @@ class Memory:
         session_id: Optional[str] = None,
         fail_silent: bool = False,
         debug: bool = False,
+        enrich: Optional[str] = None,
+        enrich_top: int = 5,
+        enrich_timeout_s: float = 2.0,
     ) -> SearchResult:
         """Search memories.
 
@@ -228,12 +513,21 @@ class Memory:
             fail_silent: If True, return empty result on error instead of raising.
                 Use this to ensure memory failures don't break your agent.
             debug: If True, include detailed debug info in the result.
+            enrich: Optionally attach TKG data to the top results in the same call:
+                "context" sets `item.context` (as explain_event()), "evidence" sets
+                `item.evidence` (as get_evidence_for()).
+            enrich_top: Number of top items to enrich (default: 5).
+            enrich_timeout_s: Time budget for enrichment. Explain calls run
+                concurrently; items whose call has not finished in time are
+                returned un-enriched. Reported as `result.enrich_latency_ms`.
 
         Returns:
             SearchResult with items and helper methods:
             - Truthy when results exist: `if result: ...`
             - Iterable: `for item in result: ...`
             - Formattable: `result.to_prompt()` for LLM injection
+            - `result.timings`: client (queue/encode/network/decode) and
+              server-reported (Server-Timing, metrics/debug) latency phases
 
         Example:
             >>> result = mem.search("meeting with Caroline")
@@ -251,58 +545,308 @@ class Memory:
             >>> # With debug info
             >>> result = mem.search("query", debug=True)
             >>> print(result.debug)  # See executed_calls, plan, etc.
+
+            >>> # Search + explain top results in one call
+            >>> result = mem.search("Caroline", enrich="context", enrich_top=3)
+            >>> for item in result:
+            ...     if item.context:
+            ...         print(item.context.knowledge)
         """
+        if enrich is not None and enrich not in _ENRICH_MODES:
+            raise ValueError("enrich must be one of: context, evidence")
+
         t0 = time.perf_counter()
+        if self._fallback is not None and self._breaker is not None and not self._breaker.allow():
+            return self._local_search(query, limit, session_id, t0, "circuit_open")
         try:
-            resp = self._client.retrieve_dialog_v2(
-                query=query,
-                session_id=session_id,
-                topk=limit,
-                with_answer=False,
-                debug=debug,
-            )
-            latency_ms = (time.perf_counter() - t0) * 1000
-
-            items: List[MemoryItem] = []
-            for e in resp.get("evidence_details") or []:
-                text = str(e.get("text") or "").strip()
-                if not text:
-                    continue
-                # Prefer tkg_event_id (actual TKG event ID) over event_id (logical ID)
-                # tkg_event_id is needed for get_evidence_for() to work with explain endpoint
-                event_id = str(e.get("tkg_event_id") or e.get("event_id") or "").strip() or None
-                items.append(
-                    MemoryItem(
-                        text=text,
-                        score=float(e.get("score") or 0.0),
-                        timestamp=_parse_datetime(e.get("timestamp")),
-                        source=str(e.get("source") or "unknown"),
-                        entities=list(e.get("entities") or []),
-                        event_id=event_id,
-                    )
-                )
+            meta: Dict[str, Any] = {}
+            call = lambda: self._guarded_retrieve(query, session_id, limit, debug, meta)  # noqa: E731
+            if self._fallback is not None and self._latency_budget_s is not None:
+                fut = self._executor().submit(call)
+                try:
+                    resp = fut.result(timeout=self._latency_budget_s)
+                except _FutureTimeout:
+                    # The late response still feeds the store and the breaker.
+                    return self._local_search(query, limit, session_id, t0, "latency_budget_exceeded")
+            else:
+                resp = call()
+            t1 = time.perf_counter()
+            timings = build_search_timings(meta, resp, queued_since=t0, finished=t1)
+            record_search_timings(self._client.metrics, timings)
 
-            return SearchResult(
+            result = SearchResult(
                 query=query,
-                items=items,
-                latency_ms=latency_ms,
+                items=self._with_overlay(_items_from_retrieval(resp), query, limit, session_id),
+                latency_ms=(t1 - t0) * 1000,
                 debug=resp.get("debug") if debug else None,
                 strategy=resp.get("strategy"),
+                timings=timings,
             )
 
         except Exception as exc:
             if fail_silent:
+                error = f"{type(exc).__name__}: {str(exc)[:200]}"
+                if self._fallback is not None:
+                    return self._local_search(query, limit, session_id, t0, error)
                 return SearchResult(
                     query=query,
-                    items=[],
+                    items=self._with_overlay([], query, limit, session_id),
                     latency_ms=(time.perf_counter() - t0) * 1000,
-                    error=f"{type(exc).__name__}: {str(exc)[:200]}",
+                    error=error,
                 )
             # Let structured HTTP errors bubble up so callers can inspect
             # status_code / error codes. For SaaS, remember that data is
             # isolated at account level (not per user_id) by the backend.
             raise
 
+        if enrich is not None:
+            t1 = time.perf_counter()
+            self._enrich_items(result.items[: max(0, int(enrich_top))], enrich, enrich_timeout_s)
+            result.enrich_latency_ms = (time.perf_counter() - t1) * 1000
+        return result
+
+    def _guarded_retrieve(
+        self, query: str, session_id: Optional[str], limit: int, debug: bool, meta: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """retrieve_dialog_v2 that reports to the circuit breaker and feeds the fallback store."""
+        healthy: Optional[bool] = None
+        try:
+            resp = self._client.retrieve_dialog_v2(
+                query=query,
+                session_id=session_id,
+                topk=limit,
+                with_answer=False,
+                debug=debug,
+                timing=meta,
+            )
+            healthy = True
+        except Exception as exc:
+            # Client errors (bad request, auth) say nothing about service health.
+            client_side = isinstance(exc, OmemHttpError) and exc.status_code < 500 and exc.status_code != 429
+            if not client_side:
+                healthy = False
+            raise
+        finally:
+            if self._breaker is not None:
+                if healthy is True:
+                    self._breaker.record_success()
+                elif healthy is False:
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.release_probe()
+        if self._fallback is not None:
+            self._feed_fallback(_items_from_retrieval(resp), session_id)
+        return resp
+
+    def _feed_fallback(self, items: List[MemoryItem], session_id: Optional[str]) -> None:
+        """Queue search results for the fallback store; a pool task writes them in batches."""
+        assert self._fallback is not None
+        if not items:
+            return
+        with self._feed_lock:
+            self._feed_pending.append((session_id, items))
+            # Bounded: beyond what the store keeps anyway, the oldest results are dropped.
+            queued = sum(len(batch) for _, batch in self._feed_pending)
+            while queued > self._fallback.max_items and len(self._feed_pending) > 1:
+                queued -= len(self._feed_pending.pop(0)[1])
+            if self._feed_scheduled:
+                return
+            self._feed_scheduled = True
+        try:
+            self._executor().submit(self._drain_fallback)
+        except Exception:
+            # e.g. the pool was shut down; close() writes what is left.
+            with self._feed_lock:
+                self._feed_scheduled = False
+
+    def _drain_fallback(self) -> None:
+        """Write queued search results to the fallback store, one write per search response."""
+        assert self._fallback is not None
+        with self._feed_write_lock:
+            while True:
+                with self._feed_lock:
+                    pending, self._feed_pending = self._feed_pending, []
+                    if not pending:
+                        self._feed_scheduled = False
+                        return
+                for session_id, items in pending:
+                    try:
+                        self._fallback.add_items(items, session_id=session_id)
+                    except Exception:
+                        pass  # best effort: a full disk must not break searches
+
+    def _local_search(
+        self, query: str, limit: int, session_id: Optional[str], t0: float, reason: str
+    ) -> SearchResult:
+        assert self._fallback is not None
+        items = self._fallback.search(query, limit=limit, session_id=session_id)
+        return SearchResult(
+            query=query,
+            items=self._with_overlay(items, query, limit, session_id),
+            latency_ms=(time.perf_counter() - t0) * 1000,
+            strategy="local_fallback",
+            error=reason,
+        )
+
+    def _with_overlay(
+        self, items: List[MemoryItem], query: str, limit: int, session_id: Optional[str]
+    ) -> List[MemoryItem]:
+        overlay = self._overlay
+        if overlay is None:
+            return items
+        if overlay.refresh_due():
+            # Poll job statuses off the request path; completed jobs drop out.
+            try:
+                self._executor().submit(overlay.refresh, lambda job_id: self._client.get_job(job_id).status)
+            except Exception:
+                # e.g. the pool was shut down; retry on a later search.
+                overlay.cancel_refresh()
+        from .overlay import merge_items
+
+        return merge_items(items, overlay.search(query, limit=limit, session_id=session_id), limit)
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        *,
+        limit: int = 10,
+        session_id: Optional[str] = None,
+        fusion: str = "rrf",
+        rrf_k: int = 60,
+        fail_silent: bool = False,
+    ) -> SearchResult:
+        """Search several query reformulations concurrently and fuse the results.
+
+        All queries are sent to /retrieval at the same time over the shared
+        thread pool, so wall time is roughly that of the slowest query.
+        Items are deduplicated by event_id (or normalized text when there is
+        none) and ranked by the fused score, which replaces `item.score`.
+
+        Args:
+            queries: Query strings. Empty and duplicate queries are ignored.
+            limit: Maximum number of items per query and in the fused result.
+            session_id: Optional conversation/session ID to filter results.
+            fusion: "rrf" (reciprocal rank fusion, default) or "max" (best score).
+            rrf_k: RRF damping constant (default: 60).
+            fail_silent: If True, failed queries are skipped and reported in
+                `result.error` instead of raising.
+
+        Returns:
+            SearchResult whose `query_latencies_ms` maps each query to its
+            retrieval latency; `latency_ms` is the total wall time.
+
+        Example:
+            >>> result = mem.search_many([
+            ...     "when is the trip to West Lake?",
+            ...     "Caroline West Lake plans",
+            ... ])
+            >>> print(result.query_latencies_ms)
+        """
+        qs = list(dict.fromkeys(str(q or "").strip() for q in queries))
+        qs = [q for q in qs if q]
+        if not qs:
+            raise ValueError("queries must be non-empty")
+        if fusion not in _FUSION_MODES:
+            raise ValueError("fusion must be one of: rrf, max")
+
+        def _run(q: str, submitted: float) -> Tuple[Dict[str, Any], float]:
+            t = time.perf_counter()
+            meta: Dict[str, Any] = {}
+            resp = self._client.retrieve_dialog_v2(
+                query=q,
+                session_id=session_id,
+                topk=limit,
+                with_answer=False,
+                timing=meta,
+            )
+            done = time.perf_counter()
+            # Queue time here includes waiting for a pool thread.
+            record_search_timings(
+                self._client.metrics,
+                build_search_timings(meta, resp, queued_since=submitted, finished=done),
+            )
+            return resp, (done - t) * 1000
+
+        t0 = time.perf_counter()
+        pool = self._executor()
+        futures = [(q, pool.submit(_run, q, time.perf_counter())) for q in qs]
+
+        ranked: List[List[MemoryItem]] = []
+        latencies: Dict[str, float] = {}
+        errors: List[str] = []
+        strategy: Optional[str] = None
+        for q, fut in futures:
+            try:
+                resp, ms = fut.result()
+            except Exception as exc:
+                if not fail_silent:
+                    raise
+                errors.append(f"{q}: {type(exc).__name__}: {str(exc)[:200]}")
+                continue
+            latencies[q] = ms
+            strategy = strategy or resp.get("strategy")
+            ranked.append(_items_from_retrieval(resp))
+
+        return SearchResult(
+            query=" | ".join(qs),
+            items=_fuse_ranked(ranked, fusion, int(rrf_k))[: max(0, int(limit))],
+            latency_ms=(time.perf_counter() - t0) * 1000,
+            error=("; ".join(errors) if errors else None),
+            strategy=strategy,
+            query_latencies_ms=latencies,
+        )
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Return the shared thread pool, creating it on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="omem",
+                )
+            return self._pool
+
+    def _explain_payload(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch the explain/event payload for one event (None on any failure)."""
+        try:
+            resp = self._client.graph_explain_event(event_id)
+        except Exception:
+            return None
+        data = resp.get("item") or resp
+        return data if isinstance(data, dict) else None
+
+    def _enrich_items(self, items: List[MemoryItem], mode: str, timeout_s: float) -> None:
+        """Explain items concurrently and attach results that arrive in time.
+
+        Workers only fetch payloads; items are mutated here, on the calling
+        thread, so explain calls that overrun the budget can never touch a
+        result that has already been returned.
+        """
+        pending: Dict[Future, MemoryItem] = {}
+        pool = self._executor()
+        for item in items:
+            eid = str(item.event_id or "").strip()
+            if eid:
+                pending[pool.submit(self._explain_payload, eid)] = item
+        if not pending:
+            return
+
+        done, not_done = _wait_futures(list(pending), timeout=max(0.0, float(timeout_s)))
+        for fut in not_done:
+            # Un-started calls are dropped; in-flight ones finish in the background.
+            fut.cancel()
+        for fut in done:
+            item = pending[fut]
+            data = fut.result()
+            if data is None:
+                continue
+            if mode == "context":
+                item.context = _event_context_from_explain(
+                    str(item.event_id), data, fallback_summary=item.text
+                )
+            else:
+                item.evidence = _evidences_from_explain(data)
+
     def debug_config(self) -> Dict[str, Any]:
         """Fetch effective backend configuration for this Memory client.
 
@@ -312,6 +856,22 @@ class Memory:
         """
         return self._client.debug_config()
 
+    def metrics(self) -> MetricsSnapshot:
+        """Snapshot of client-side request metrics.
+
+        Includes per-endpoint latency histograms (p50/p95/p99), request and
+        error counts by OmemHttpError subclass, retries and cache hits.
+
+        Returns:
+            MetricsSnapshot; pass it to `omem.metrics.render_prometheus()` for
+            the Prometheus text format.
+
+        Example:
+            >>> snap = mem.metrics()
+            >>> snap.summary()["omem_request_duration_ms{endpoint=/retrieval,method=POST}"]["p99"]
+        """
+        return self._client.metrics.snapshot()
+
     # ========== TKG API (tenant-level) ==========
 
     def resolve_entity(
@@ -348,8 +908,8 @@ class Memory:
             e = items[0]
             return Entity(
                 id=str(e.get("entity_id") or e.get("id") or ""),
-                name=str(e.get("name") or e.get("cluster_label") or name),
-                type=str(e.get("type") or "unknown"),
+                name=sys.intern(str(e.get("name") or e.get("cluster_label") or name)),
+                type=sys.intern(str(e.get("type") or "unknown")),
                 aliases=list(e.get("aliases") or []),
             )
         except Exception:
@@ -433,36 +993,8 @@ class Memory:
                 entity_id=resolved.id,
                 limit=limit,
             )
-            evidences: List[Evidence] = []
-            for item in resp.get("items") or []:
-                evidence_id = str(
-                    item.get("evidence_id")
-                    or item.get("utterance_id")
-                    or item.get("id")
-                    or ""
-                )
-                text = str(item.get("text") or item.get("raw_text") or "")
-                # Use confidence from response, default to 0.9 for utterances
-                confidence = float(item.get("confidence") or 0.9)
-                timestamp = _parse_datetime(
-                    item.get("t_media_start") or item.get("timestamp")
-                )
-                segment_id = (
-                    str(item.get("segment_id")) if item.get("segment_id") else None
-                )
-
-                evidences.append(
-                    Evidence(
-                        id=evidence_id,
-                        text=text,
-                        entity_id=resolved.id,
-                        confidence=confidence,
-                        timestamp=timestamp,
-                        segment_id=segment_id,
-                    )
-                )
-
-            return evidences
+            entity_id = sys.intern(resolved.id)
+            return [_evidence_from_timeline(item, entity_id) for item in resp.get("items") or []]
         except Exception:
             return []
 
@@ -480,66 +1012,14 @@ class Memory:
         Returns:
             List of Evidence objects derived from the event's evidence chain.
         """
-        from .models import Evidence as _EvidenceModel  # avoid circulars in type checkers
-
         eid = str(getattr(item, "event_id", None) or "").strip()
         if not eid:
             return []
 
-        try:
-            resp = self._client.graph_explain_event(eid)
-        except Exception:
-            return []
-
-        data = resp.get("item") or resp
-        if not isinstance(data, dict):
+        data = self._explain_payload(eid)
+        if data is None:
             return []
-
-        evidences: List[Evidence] = []
-
-        # Prefer utterance-level evidence when available (dialog data)
-        utterances = data.get("utterances") or []
-        for u in utterances:
-            text = str(u.get("raw_text") or u.get("text") or "")
-            if not text:
-                continue
-            evidence_id = str(u.get("id") or "")
-            timestamp = _parse_datetime(u.get("t_media_start") or u.get("timestamp"))
-            segment_id = str(u.get("segment_id")) if u.get("segment_id") else None
-
-            evidences.append(
-                _EvidenceModel(  # type: ignore[call-arg]
-                    id=evidence_id,
-                    text=text,
-                    entity_id="",  # entity is implicit in the event; leave empty for now
-                    confidence=float(u.get("confidence") or 0.0),
-                    timestamp=timestamp,
-                    segment_id=segment_id,
-                )
-            )
-
-        # Fallback: use generic evidences array if utterances are missing
-        if not evidences:
-            for ev in data.get("evidences") or []:
-                text = str(ev.get("text") or "")
-                if not text:
-                    continue
-                evidence_id = str(ev.get("id") or "")
-                timestamp = _parse_datetime(ev.get("t_media_start") or ev.get("timestamp"))
-                segment_id = str(ev.get("segment_id")) if ev.get("segment_id") else None
-
-                evidences.append(
-                    _EvidenceModel(  # type: ignore[call-arg]
-                        id=evidence_id,
-                        text=text,
-                        entity_id="",
-                        confidence=float(ev.get("confidence") or 0.0),
-                        timestamp=timestamp,
-                        segment_id=segment_id,
-                    )
-                )
-
-        return evidences
+        return _evidences_from_explain(data)
 
     def explain_event(self, item: MemoryItem) -> Optional["EventContext"]:
         """Get full TKG context for a search result - the real value of extraction.
@@ -568,78 +1048,14 @@ class Memory:
             ...     for k in ctx.knowledge:
             ...         print(f"Fact: {k.summary}")
         """
-        from .models import EventContext, ExtractedKnowledge
-
         eid = str(getattr(item, "event_id", None) or "").strip()
         if not eid:
             return None
 
-        try:
-            resp = self._client.graph_explain_event(eid)
-        except Exception:
-            return None
-
-        data = resp.get("item") or resp
-        if not isinstance(data, dict):
+        data = self._explain_payload(eid)
+        if data is None:
             return None
-
-        # Extract entities
-        entities: List[str] = []
-        for ent in data.get("entities") or []:
-            name = ent.get("name", "")
-            etype = ent.get("type", "")
-            if name:
-                entities.append(f"{name} ({etype})" if etype else name)
-
-        # Extract knowledge (structured facts)
-        knowledge: List[ExtractedKnowledge] = []
-        for k in data.get("knowledge") or []:
-            summary = k.get("summary") or k.get("text") or ""
-            if summary:
-                knowledge.append(
-                    ExtractedKnowledge(
-                        id=str(k.get("id") or ""),
-                        summary=summary,
-                        importance=float(k.get("importance") or 0.5),
-                        timestamp=_parse_datetime(k.get("t_abs_start")),
-                    )
-                )
-
-        # Extract places
-        places: List[str] = []
-        for p in data.get("places") or []:
-            name = p.get("name", "")
-            if name:
-                places.append(name)
-
-        # Extract source utterances
-        utterances: List[str] = []
-        for u in data.get("utterances") or []:
-            text = u.get("raw_text") or u.get("text") or ""
-            if text:
-                utterances.append(text)
-
-        # Get event summary and timestamp
-        event = data.get("event") or {}
-        summary = event.get("summary") or item.text
-        timestamp = _parse_datetime(event.get("t_abs_start"))
-
-        # Get session kind from timeslices
-        session_kind = None
-        timeslices = data.get("timeslices") or []
-        if timeslices:
-            session_kind = timeslices[0].get("kind")
-
-        return EventContext(
-            event_id=eid,
-            summary=summary,
-            entities=entities,
-            knowledge=knowledge,
-            places=places,
-            utterances=utterances,
-            timestamp=timestamp,
-            session_kind=session_kind,
-        )
+        return _event_context_from_explain(eid, data, fallback_summary=item.text)
 
     def search_events(
         self,
@@ -686,20 +1102,14 @@ class Memory:
                 )
                 items = resp.get("events") or resp.get("items") or []
 
-            events: List[Event] = []
-            for item in items:
-                events.append(
-                    Event(
-                        id=str(item.get("id") or ""),
-                        summary=str(item.get("summary") or ""),
-                        timestamp=_parse_datetime(
-                            item.get("t_abs_start") or item.get("timestamp")
-                        ),
-                        entities=list(item.get("involves") or []),
-                        evidence=str(item.get("evidence") or item.get("text") or ""),
-                    )
+            return [
+                _event_from_graph(
+                    item,
+                    timestamp=item.get("timestamp"),
+                    evidence=str(item.get("evidence") or item.get("text") or ""),
                 )
-            return events
+                for item in items
+            ]
         except Exception:
             return []
 
@@ -747,16 +1157,7 @@ class Memory:
                         limit=limit // 10 + 1,
                     )
                     for item in ts_resp.get("items") or []:
-                        events.append(
-                            Event(
-                                id=str(item.get("id") or ""),
-                                summary=str(item.get("summary") or ""),
-                                timestamp=_parse_datetime(
-                                    item.get("t_abs_start") or ts.get("t_abs_start")
-                                ),
-                                entities=list(item.get("involves") or []),
-                            )
-                        )
+                        events.append(_event_from_graph(item, timestamp=ts.get("t_abs_start")))
                 except Exception:
                     continue
 
@@ -766,8 +1167,33 @@ class Memory:
 
     # ========== Lifecycle ==========
 
+    def warmup(self, *, connections: int = 1, wait: bool = True) -> int:
+        """Open pooled connections to the service ahead of the first request.
+
+        Args:
+            connections: How many connections to open concurrently (useful
+                before bursts of search(enrich=...) or search_many()).
+            wait: If False, warm up on a background thread and return 0
+                immediately.
+
+        Returns:
+            Number of connections confirmed warm (0 when not waiting).
+        """
+        if not wait:
+            threading.Thread(
+                target=self._client.warmup, kwargs={"connections": connections}, name="omem-warmup", daemon=True
+            ).start()
+            return 0
+        return self._client.warmup(connections=connections)
+
     def close(self) -> None:
-        """Close the underlying HTTP client."""
+        """Close the underlying HTTP client and the shared thread pool."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        if self._fallback is not None:
+            self._drain_fallback()  # waits for a write in progress, then flushes the rest
         self._client.close()
 
     def __enter__(self) -> "Memory":
@@ -795,6 +1221,8 @@ class Conversation:
         conversation_id: str,
         sync_cursor: bool = True,
         auto_timestamp: bool = True,
+        uploader: Optional[AttachmentUploader] = None,
+        on_commit: Optional[Callable[[str, Optional[str], List[CanonicalTurnV1], bool], None]] = None,
     ) -> None:
         """Initialize conversation buffer.
 
@@ -804,6 +1232,10 @@ class Conversation:
             sync_cursor: Whether to sync cursor from server.
             auto_timestamp: If True, auto-generate timestamp for messages
                 without explicit timestamp. Defaults to True.
+            uploader: AttachmentUploader for message attachments. Created on
+                first use when not provided.
+            on_commit: Called after each successful commit with
+                (conversation_id, job_id, committed turns, completed).
         """
         cid = str(conversation_id or "").strip()
         if not cid:
@@ -815,6 +1247,10 @@ class Conversation:
         self._next_turn_index = 1
         self._cursor_last_committed: Optional[str] = None
         self._auto_timestamp = bool(auto_timestamp)
+        self._uploader = uploader
+        self._on_commit = on_commit
+        # turn_id -> attachment sources still to be uploaded at commit time
+        self._pending_attachments: Dict[str, List[AttachmentSource]] = {}
 
         if sync_cursor:
             self._sync_cursor_from_server()
@@ -851,6 +1287,9 @@ class Conversation:
                 - content or text: Message content
                 - name: Optional speaker name
                 - timestamp: Optional ISO timestamp (auto-generated if auto_timestamp=True)
+                - attachments: Optional list of file paths, bytes, dicts with
+                  "path"/"data" (+ "type", "name"), or CanonicalAttachmentV1.
+                  Files are uploaded at commit time, deduplicated by sha256.
 
         Example:
             >>> conv.add({"role": "user", "content": "Hello"})
@@ -877,12 +1316,23 @@ class Conversation:
         elif self._auto_timestamp:
             timestamp_iso = _now_iso()
 
+        ready: List[CanonicalAttachmentV1] = []
+        pending: List[AttachmentSource] = []
+        for att in message.get("attachments") or []:
+            if isinstance(att, CanonicalAttachmentV1):
+                ready.append(att)
+            else:
+                pending.append(att)
+        if pending:
+            self._pending_attachments[turn_id] = pending
+
         turn = CanonicalTurnV1(
             turn_id=turn_id,
             role=role,  # type: ignore[arg-type]
             text=text,
             name=str(message.get("name")).strip() if message.get("name") else None,
             timestamp_iso=timestamp_iso if timestamp_iso else None,
+            attachments=(ready if ready else None),
         )
         self._buffer.append(turn)
 
@@ -917,6 +1367,7 @@ class Conversation:
                 completed=True,
             )
 
+        delta = self._upload_attachments(delta)
         handle = self._client.ingest_dialog_v1(
             session_id=self._conversation_id,
             turns=delta,
@@ -933,6 +1384,9 @@ class Conversation:
 
         # Clear buffer after successful commit
         self._buffer.clear()
+        self._pending_attachments.clear()
+        if self._on_commit is not None:
+            self._on_commit(self._conversation_id, handle.job_id or None, delta, completed)
 
         return AddResult(
             conversation_id=self._conversation_id,
@@ -941,6 +1395,28 @@ class Conversation:
             completed=completed,
         )
 
+    def _upload_attachments(self, turns: List[CanonicalTurnV1]) -> List[CanonicalTurnV1]:
+        """Upload pending attachments for `turns` and return turns with refs filled in."""
+        sources: List[AttachmentSource] = []
+        for t in turns:
+            sources.extend(self._pending_attachments.get(t.turn_id) or [])
+        if not sources:
+            return turns
+        if self._uploader is None:
+            from .attachments import AttachmentUploader
+
+            self._uploader = AttachmentUploader(self._client)
+        uploaded = iter(self._uploader.upload_many(sources))
+
+        out: List[CanonicalTurnV1] = []
+        for t in turns:
+            pending = self._pending_attachments.get(t.turn_id)
+            if pending:
+                extra = [next(uploaded) for _ in pending]
+                t = dataclasses.replace(t, attachments=list(t.attachments or []) + extra)
+            out.append(t)
+        return out
+
     def _get_delta_turns(self) -> List[CanonicalTurnV1]:
         """Get turns that haven't been committed yet."""
         base = str(self._cursor_last_committed or "").strip()
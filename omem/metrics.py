@@ -0,0 +1,318 @@
+"""In-process metrics for the omem SDK.
+
+Every MemoryClient owns a `MetricsRegistry` (shareable between clients) that
+records, per HTTP attempt:
+
+- `omem_request_duration_ms{endpoint, method}`: log-bucketed latency histogram
+- `omem_requests_total{endpoint, status}`: attempts by HTTP status ("error" when
+  no response was received)
+- `omem_errors_total{error}`: failed attempts by OmemHttpError subclass or
+  transport exception name
+- `omem_retries_total{endpoint}`: attempts that were retried
+
+Other SDK components add their own counters and gauges (cache hits, circuit
+state, server-side timing phases, ...) through the same registry.
+
+Histograms use logarithmic buckets (growth factor 2^(1/8), about 9% relative
+error), so they are small, cheap to update and exactly mergeable across
+threads, clients or processes:
+
+    >>> snap = mem.metrics()
+    >>> snap.percentile("omem_request_duration_ms", {"endpoint": "/retrieval", "method": "POST"}, 0.99)
+    >>> print(render_prometheus(snap))
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Bucket i covers (GROWTH**i, GROWTH**(i+1)].
+GROWTH = 2 ** 0.125
+_LOG_GROWTH = math.log(GROWTH)
+_MIN_VALUE = 1e-3
+
+Labels = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, Labels]
+
+REQUEST_DURATION = "omem_request_duration_ms"
+REQUESTS_TOTAL = "omem_requests_total"
+ERRORS_TOTAL = "omem_errors_total"
+RETRIES_TOTAL = "omem_retries_total"
+CACHE_HITS_TOTAL = "omem_cache_hits_total"
+CIRCUIT_STATE = "omem_circuit_state"
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _labels(labels: Optional[Mapping[str, str]]) -> Labels:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _bucket_index(value: float) -> int:
+    return int(math.floor(math.log(max(float(value), _MIN_VALUE)) / _LOG_GROWTH))
+
+
+def bucket_upper_bound(index: int) -> float:
+    return GROWTH ** (index + 1)
+
+
+@dataclass
+class HistogramSnapshot:
+    """Immutable-by-convention copy of a histogram; mergeable."""
+
+    buckets: Dict[int, int] = field(default_factory=dict)
+    count: int = 0
+    sum: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def merge(self, other: "HistogramSnapshot") -> "HistogramSnapshot":
+        buckets = dict(self.buckets)
+        for i, n in other.buckets.items():
+            buckets[i] = buckets.get(i, 0) + n
+        return HistogramSnapshot(
+            buckets=buckets,
+            count=self.count + other.count,
+            sum=self.sum + other.sum,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+        )
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0..1); None if the histogram is empty."""
+        if self.count <= 0:
+            return None
+        rank = max(1, int(math.ceil(float(q) * self.count)))
+        seen = 0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen >= rank:
+                # Geometric midpoint of the bucket, clamped to observed range.
+                mid = math.sqrt(GROWTH ** i * bucket_upper_bound(i))
+                return min(max(mid, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class LogHistogram:
+    """Thread-safe log-bucketed histogram."""
+
+    __slots__ = ("_lock", "_buckets", "_count", "_sum", "_min", "_max")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[int, int] = {}
+        self._count = 0
+        self._sum = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    def record(self, value: float) -> None:
+        v = float(value)
+        i = _bucket_index(v)
+        with self._lock:
+            self._buckets[i] = self._buckets.get(i, 0) + 1
+            self._count += 1
+            self._sum += v
+            if v < self._min:
+                self._min = v
+            if v > self._max:
+                self._max = v
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            return HistogramSnapshot(dict(self._buckets), self._count, self._sum, self._min, self._max)
+
+
+@dataclass
+class MetricsSnapshot:
+    """Point-in-time copy of a MetricsRegistry."""
+
+    histograms: Dict[MetricKey, HistogramSnapshot] = field(default_factory=dict)
+    counters: Dict[MetricKey, float] = field(default_factory=dict)
+    gauges: Dict[MetricKey, float] = field(default_factory=dict)
+
+    def merge(self, other: "MetricsSnapshot") -> "MetricsSnapshot":
+        """Combine two snapshots (histograms and counters add; gauges take `other`)."""
+        histograms = dict(self.histograms)
+        for k, h in other.histograms.items():
+            histograms[k] = histograms[k].merge(h) if k in histograms else h
+        counters = dict(self.counters)
+        for k, v in other.counters.items():
+            counters[k] = counters.get(k, 0.0) + v
+        gauges = dict(self.gauges)
+        gauges.update(other.gauges)
+        return MetricsSnapshot(histograms, counters, gauges)
+
+    def histogram(self, name: str, labels: Optional[Mapping[str, str]] = None) -> Optional[HistogramSnapshot]:
+        return self.histograms.get((name, _labels(labels)))
+
+    def percentile(self, name: str, labels: Optional[Mapping[str, str]], q: float) -> Optional[float]:
+        h = self.histogram(name, labels)
+        return h.percentile(q) if h is not None else None
+
+    def counter(self, name: str, labels: Optional[Mapping[str, str]] = None) -> float:
+        return self.counters.get((name, _labels(labels)), 0.0)
+
+    def gauge(self, name: str, labels: Optional[Mapping[str, str]] = None) -> Optional[float]:
+        return self.gauges.get((name, _labels(labels)))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{"<name>{labels}": {"count", "mean", "p50", "p95", "p99", "max"}} for every histogram."""
+        out: Dict[str, Dict[str, float]] = {}
+        for (name, labels), h in sorted(self.histograms.items()):
+            if not h.count:
+                continue
+            key = name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+            out[key] = {
+                "count": float(h.count),
+                "mean": float(h.mean or 0.0),
+                "p50": float(h.percentile(0.5) or 0.0),
+                "p95": float(h.percentile(0.95) or 0.0),
+                "p99": float(h.percentile(0.99) or 0.0),
+                "max": float(h.max),
+            }
+        return out
+
+
+class MetricsRegistry:
+    """Named histograms, counters and gauges, keyed by (name, labels)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[MetricKey, LogHistogram] = {}
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        key = (name, _labels(labels))
+        h = self._histograms.get(key)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(key, LogHistogram())
+        h.record(value)
+
+    def incr(self, name: str, labels: Optional[Mapping[str, str]] = None, by: float = 1.0) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + by
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._gauges[key] = float(value)
+
+    def record_attempt(
+        self,
+        *,
+        method: str,
+        endpoint: str,
+        status_code: Optional[int],
+        duration_ms: float,
+        error_type: Optional[str],
+        will_retry: bool,
+    ) -> None:
+        """Record one HTTP attempt made by MemoryClient."""
+        self.observe(REQUEST_DURATION, duration_ms, {"endpoint": endpoint, "method": method})
+        status = str(status_code) if status_code is not None else "error"
+        with self._lock:
+            k = (REQUESTS_TOTAL, (("endpoint", endpoint), ("status", status)))
+            self._counters[k] = self._counters.get(k, 0.0) + 1
+            if error_type:
+                k = (ERRORS_TOTAL, (("error", error_type),))
+                self._counters[k] = self._counters.get(k, 0.0) + 1
+            if will_retry:
+                k = (RETRIES_TOTAL, (("endpoint", endpoint),))
+                self._counters[k] = self._counters.get(k, 0.0) + 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        return MetricsSnapshot({k: h.snapshot() for k, h in histograms}, counters, gauges)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    items = list(labels)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+def render_prometheus(snapshot: MetricsSnapshot) -> str:
+    """Render a snapshot in the Prometheus text exposition format (v0.0.4).
+
+    Histograms recorded in milliseconds (names ending in "_ms") are exposed
+    in seconds as "<name>_seconds", together with a
+    "<name>_quantile_seconds" gauge for p50/p95/p99.
+    """
+    lines: List[str] = []
+
+    by_name: Dict[str, List[Tuple[Labels, HistogramSnapshot]]] = {}
+    for (name, labels), h in snapshot.histograms.items():
+        by_name.setdefault(name, []).append((labels, h))
+    for name in sorted(by_name):
+        scale = 1000.0 if name.endswith("_ms") else 1.0
+        base = name[:-3] + "_seconds" if name.endswith("_ms") else name
+        lines.append(f"# TYPE {base} histogram")
+        for labels, h in sorted(by_name[name]):
+            cumulative = 0
+            for i in sorted(h.buckets):
+                cumulative += h.buckets[i]
+                le = _fmt_value(bucket_upper_bound(i) / scale)
+                lines.append(f"{base}_bucket{_fmt_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{base}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {h.count}")
+            lines.append(f"{base}_sum{_fmt_labels(labels)} {_fmt_value(h.sum / scale)}")
+            lines.append(f"{base}_count{_fmt_labels(labels)} {h.count}")
+        qname = base[: -len("_seconds")] + "_quantile_seconds" if base.endswith("_seconds") else base + "_quantile"
+        lines.append(f"# TYPE {qname} gauge")
+        for labels, h in sorted(by_name[name]):
+            for q in _QUANTILES:
+                val = h.percentile(q)
+                if val is not None:
+                    lines.append(f"{qname}{_fmt_labels(labels + (('quantile', str(q)),))} {_fmt_value(val / scale)}")
+
+    for kind, values in (("counter", snapshot.counters), ("gauge", snapshot.gauges)):
+        grouped: Dict[str, List[Tuple[Labels, float]]] = {}
+        for (name, labels), v in values.items():
+            grouped.setdefault(name, []).append((labels, v))
+        for name in sorted(grouped):
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, v in sorted(grouped[name]):
+                lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(v)}")
+
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "LogHistogram",
+    "HistogramSnapshot",
+    "MetricsRegistry",
+    "MetricsSnapshot",
+    "render_prometheus",
+]
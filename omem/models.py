@@ -2,33 +2,135 @@
 
 These dataclasses provide type-safe, IDE-friendly return values
 for Memory class methods, replacing raw Dict responses.
+
+The high-volume models (MemoryItem, Entity, Event, Evidence,
+ExtractedKnowledge) use `__slots__` instead of a per-instance `__dict__`,
+and their `timestamp` accepts the raw ISO string from the payload: it is
+parsed on first access and cached, so listings whose timestamps are never
+read skip the parsing cost.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type, TypeVar
+
+_T = TypeVar("_T")
+
+
+def parse_datetime(val: Any) -> Optional[datetime]:
+    """Parse datetime from various formats."""
+    if val is None:
+        return None
+    if isinstance(val, datetime):
+        return val
+    try:
+        s = str(val).strip()
+        if not s:
+            return None
+        # Handle ISO format with Z suffix
+        s = s.replace("Z", "+00:00")
+        return datetime.fromisoformat(s)
+    except Exception:
+        return None
+
+
+class _LazyDatetime:
+    """Field descriptor over a raw-value slot; parses (and caches) on first read."""
+
+    __slots__ = ("_slot",)
+
+    def __init__(self, slot: Any) -> None:
+        self._slot = slot  # member descriptor of the backing slot
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        value = self._slot.__get__(obj, owner)
+        if value is None or isinstance(value, datetime):
+            return value
+        value = parse_datetime(value)
+        self._slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self._slot.__set__(obj, value)
+
+    @classmethod
+    def over(cls, slot: Any) -> "_LazyDatetime":
+        # Writes happen on every construction: route __set__ straight to the
+        # slot's C setter instead of through a Python frame.
+        fast = type(cls.__name__, (cls,), {"__slots__": (), "__set__": staticmethod(slot.__set__)})
+        return fast(slot)
+
+
+def _slotted(*lazy: str) -> Callable[[Type[_T]], Type[_T]]:
+    """Rebuild a dataclass with __slots__ (what `dataclass(slots=True)` does on 3.10+).
+
+    Fields named in `lazy` are backed by a `_<name>_raw` slot behind a
+    _LazyDatetime descriptor.
+    """
+
+    def wrap(cls: Type[_T]) -> Type[_T]:
+        names = [f.name for f in fields(cls)]
+        ns = {k: v for k, v in cls.__dict__.items() if k not in names and k not in ("__dict__", "__weakref__")}
+        ns["__slots__"] = tuple(f"_{n}_raw" if n in lazy else n for n in names)
+        new = type(cls)(cls.__name__, cls.__bases__, ns)
+        for name in lazy:
+            setattr(new, name, _LazyDatetime.over(new.__dict__[f"_{name}_raw"]))
+        return new  # type: ignore[return-value]
+
+    return wrap
 
 
+@_slotted("timestamp")
 @dataclass
 class MemoryItem:
     """A single memory item from search results."""
 
     text: str
     score: float = 0.0
-    timestamp: Optional[datetime] = None
+    timestamp: Optional[datetime] = None  # also accepts the raw ISO string (parsed lazily)
     source: str = "unknown"
     entities: List[str] = field(default_factory=list)
     # Optional logical event identifier from TKG-backed retrieval.
     # When present, this can be used with get_evidence_for() to fetch
     # a structured evidence chain for this specific memory item.
     event_id: Optional[str] = None
+    # Populated by search(enrich="context"|"evidence") when the explain call
+    # for this item finished within the enrichment budget.
+    context: Optional["EventContext"] = None
+    evidence: Optional[List["Evidence"]] = None
 
     def __str__(self) -> str:
         return f"[{self.score:.2f}] {self.text}"
 
 
+@dataclass
+class SearchTimings:
+    """Latency breakdown of one /retrieval call (all values in milliseconds)."""
+
+    total_ms: float = 0.0
+    queue_ms: float = 0.0  # Waiting before the request started (e.g. for a pool thread)
+    encode_ms: float = 0.0  # Request body serialization
+    network_ms: float = 0.0  # Time inside HTTP attempts, server time included
+    backoff_ms: float = 0.0  # Sleeping between retries
+    decode_ms: float = 0.0  # Response JSON parsing
+    attempts: int = 1
+    # Server-reported phases (Server-Timing header, metrics/debug fields),
+    # e.g. {"vector": 12.4, "graph": 30.1}
+    server_ms: Dict[str, float] = field(default_factory=dict)
+    server_total_ms: Optional[float] = None
+
+    @property
+    def transit_ms(self) -> Optional[float]:
+        """Network time not accounted for by the server, if it reported a total."""
+        if self.server_total_ms is None:
+            return None
+        return max(0.0, self.network_ms - self.server_total_ms)
+
+
 @dataclass
 class SearchResult:
     """Search result containing memory items."""
@@ -39,6 +141,13 @@ class SearchResult:
     error: Optional[str] = None  # For fail_silent mode
     debug: Optional[Dict[str, Any]] = None  # Debug info when debug=True
     strategy: Optional[str] = None  # Strategy used (dialog_v1, dialog_v2)
+    # Wall time spent enriching items (search(enrich=...)); None when not requested.
+    # latency_ms only covers retrieval.
+    enrich_latency_ms: Optional[float] = None
+    # Per-query retrieval latency for search_many(); None for single searches.
+    query_latencies_ms: Optional[Dict[str, float]] = None
+    # Client/server latency breakdown for search(); None for search_many().
+    timings: Optional[SearchTimings] = None
 
     def __iter__(self) -> Iterator[MemoryItem]:
         return iter(self.items)
@@ -49,23 +158,68 @@ class SearchResult:
     def __len__(self) -> int:
         return len(self.items)
 
-    def to_prompt(self, max_items: int = 5) -> str:
+    def to_prompt(
+        self,
+        max_items: Optional[int] = 5,
+        *,
+        token_budget: Optional[int] = None,
+        estimator: Optional[Callable[[str], int]] = None,
+        **pack_options: Any,
+    ) -> str:
         """Format search results for LLM prompt injection.
 
         Args:
-            max_items: Maximum number of items to include.
+            max_items: Maximum number of items to include (None: no cap).
+                Also applies with `token_budget`; pass None to let the
+                budget alone decide.
+            token_budget: If set, pack items into at most this many tokens
+                rather than listing them in order: near-duplicates are
+                dropped, items are ranked by score and enriched items carry
+                their knowledge lines (see omem.packing.pack_items, which
+                also accepts the extra `pack_options`).
+            estimator: Token counter for `token_budget` (default: a fast
+                heuristic).
 
         Returns:
             Formatted string suitable for LLM context.
         """
         if not self.items:
             return ""
+        if token_budget is not None:
+            from .packing import estimate_tokens, pack_items
+
+            return pack_items(
+                self.items,
+                token_budget,
+                estimator=estimator or estimate_tokens,
+                max_items=max_items,
+                **pack_options,
+            ).text
+        if max_items is None:
+            max_items = len(self.items)
         lines = []
         for i, item in enumerate(self.items[:max_items], 1):
             lines.append(f"{i}. {item.text}")
         return "\n".join(lines)
 
+    def to_numpy(self, *, entities: str = "list") -> Dict[str, Any]:
+        """Items as a dict of NumPy column arrays (see omem.columnar.to_numpy).
+
+        Columns: text, score (float64), timestamp (datetime64[us]), source,
+        event_id and entities. Requires numpy.
+        """
+        from .columnar import to_numpy
+
+        return to_numpy(self.items, "search", entities=entities)
+
+    def to_arrow(self, *, entities: str = "list") -> Any:
+        """Items as a pyarrow.Table with the to_numpy() columns. Requires pyarrow."""
+        from .columnar import to_arrow
+
+        return to_arrow(self.items, "search", entities=entities)
+
 
+@_slotted()
 @dataclass
 class Entity:
     """An entity from the TKG (Temporal Knowledge Graph)."""
@@ -76,6 +230,7 @@ class Entity:
     aliases: List[str] = field(default_factory=list)
 
 
+@_slotted("timestamp")
 @dataclass
 class Event:
     """An event from the TKG (Temporal Knowledge Graph)."""
@@ -87,6 +242,7 @@ class Event:
     evidence: Optional[str] = None
 
 
+@_slotted("timestamp")
 @dataclass
 class Evidence:
     """Evidence linking knowledge to source utterance."""
@@ -99,6 +255,7 @@ class Evidence:
     segment_id: Optional[str] = None  # Media segment if from video
 
 
+@_slotted("timestamp")
 @dataclass
 class ExtractedKnowledge:
     """A structured fact extracted by TKG from raw utterances."""
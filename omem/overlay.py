@@ -0,0 +1,182 @@
+"""Read-your-writes overlay for turns committed but not yet searchable.
+
+After `add()` the backend needs a few seconds to process a commit before it
+shows up in /retrieval. With `Memory(read_your_writes=True)`, committed
+turns are also indexed here (per session, tagged with their ingest job) and
+search() merges matching overlay hits with the server's results. Entries are
+evicted once their job reports COMPLETED (the server now returns them
+itself), or after `ttl_s` as a safety net; the TTL is enforced on every
+record() and search(), so turns committed without a job id expire too.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .models import MemoryItem
+from .textindex import BM25Index, saturate
+from .types import CanonicalTurnV1
+
+OVERLAY_SOURCE = "overlay"
+
+DocId = Tuple[str, str]  # (session_id, turn_id)
+
+
+@dataclass
+class _Doc:
+    text: str
+    session_id: str
+    job_id: Optional[str]
+    added_at: float
+    timestamp: Optional[datetime]
+
+
+class RecentWritesOverlay:
+    """Per-session BM25 index of recently committed turns, evicted by job status."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2000,
+        ttl_s: float = 300.0,
+        poll_interval_s: float = 2.0,
+        parse_timestamp: Optional[Callable[[Optional[str]], Optional[datetime]]] = None,
+    ) -> None:
+        """Create an overlay.
+
+        Args:
+            max_entries: Oldest turns are evicted beyond this many.
+            ttl_s: Turns are evicted this long after commit even if their job
+                never reports COMPLETED.
+            poll_interval_s: Minimum seconds between job-status refreshes.
+            parse_timestamp: Converts a turn's `timestamp_iso` for MemoryItem.
+        """
+        if int(max_entries) <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.max_entries = int(max_entries)
+        self.ttl_s = float(ttl_s)
+        self.poll_interval_s = float(poll_interval_s)
+        self._parse_ts = parse_timestamp
+        self._lock = threading.Lock()
+        self._index = BM25Index()
+        self._docs: Dict[DocId, _Doc] = {}
+        self._jobs: Dict[str, Set[DocId]] = {}
+        self._last_poll = 0.0
+        self._polling = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    @property
+    def pending_jobs(self) -> List[str]:
+        with self._lock:
+            return list(self._jobs)
+
+    def record(self, session_id: str, job_id: Optional[str], turns: Sequence[CanonicalTurnV1]) -> None:
+        """Index turns from one commit (called by Conversation.commit)."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire_locked(now)
+            for turn in turns:
+                text = str(turn.text or "").strip()
+                if not text:
+                    continue
+                doc_id = (session_id, turn.turn_id)
+                self._drop_locked(doc_id)
+                ts = self._parse_ts(turn.timestamp_iso) if self._parse_ts is not None else None
+                self._docs[doc_id] = _Doc(text, session_id, job_id, now, ts)
+                self._index.add(doc_id, text)
+                if job_id:
+                    self._jobs.setdefault(job_id, set()).add(doc_id)
+            while len(self._docs) > self.max_entries:
+                self._drop_locked(next(iter(self._docs)))
+
+    def complete(self, job_id: str) -> None:
+        """Evict everything committed by `job_id`."""
+        with self._lock:
+            for doc_id in list(self._jobs.pop(job_id, ())):
+                self._drop_locked(doc_id)
+
+    def _drop_locked(self, doc_id: DocId) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._index.remove(doc_id)
+        if doc.job_id and doc.job_id in self._jobs:
+            self._jobs[doc.job_id].discard(doc_id)
+            if not self._jobs[doc.job_id]:
+                del self._jobs[doc.job_id]
+
+    def expire(self) -> None:
+        """Evict entries older than ttl_s."""
+        with self._lock:
+            self._expire_locked(time.monotonic())
+
+    def _expire_locked(self, now: float) -> None:
+        # _docs is in commit order (re-recorded turns are re-inserted), so
+        # expired entries are a prefix.
+        cutoff = now - self.ttl_s
+        while self._docs:
+            doc_id, doc = next(iter(self._docs.items()))
+            if doc.added_at >= cutoff:
+                break
+            self._drop_locked(doc_id)
+
+    def refresh_due(self) -> bool:
+        """True (and marks a refresh in progress) if job statuses should be polled now."""
+        with self._lock:
+            if self._polling or not self._jobs or time.monotonic() - self._last_poll < self.poll_interval_s:
+                return False
+            self._polling = True
+            return True
+
+    def cancel_refresh(self) -> None:
+        """Clear the in-progress mark set by refresh_due() when refresh() will not run."""
+        with self._lock:
+            self._polling = False
+
+    def refresh(self, job_status: Callable[[str], str]) -> None:
+        """Poll `job_status(job_id)` for pending jobs and evict completed ones."""
+        try:
+            for job_id in self.pending_jobs:
+                try:
+                    status = str(job_status(job_id) or "").upper()
+                except Exception:
+                    continue
+                if status == "COMPLETED":
+                    self.complete(job_id)
+            self.expire()
+        finally:
+            with self._lock:
+                self._last_poll = time.monotonic()
+                self._polling = False
+
+    def search(self, query: str, *, limit: int = 10, session_id: Optional[str] = None) -> List[MemoryItem]:
+        """Overlay hits as MemoryItems (source="overlay"), scores squashed into [0, 1)."""
+        self.expire()
+        where = None if session_id is None else (lambda d: d[0] == session_id)
+        hits = self._index.search(query, limit, where=where)
+        out: List[MemoryItem] = []
+        with self._lock:
+            for score, doc_id in hits:
+                doc = self._docs.get(doc_id)
+                if doc is not None:
+                    out.append(MemoryItem(text=doc.text, score=saturate(score), timestamp=doc.timestamp, source=OVERLAY_SOURCE))
+        return out
+
+
+def merge_items(server: List[MemoryItem], local: List[MemoryItem], limit: int) -> List[MemoryItem]:
+    """Merge local hits into server results by score, skipping texts the server already has."""
+    if not local:
+        return server
+    seen = {" ".join(it.text.split()).lower() for it in server}
+    extra = [it for it in local if " ".join(it.text.split()).lower() not in seen]
+    return sorted(server + extra, key=lambda it: -it.score)[: max(0, int(limit))]
+
+
+__all__ = ["OVERLAY_SOURCE", "RecentWritesOverlay", "merge_items"]
@@ -0,0 +1,227 @@
+"""Token-budgeted packing of memory items into an LLM prompt.
+
+`SearchResult.to_prompt(token_budget=...)` uses `pack_items()` to fit as
+much useful memory as possible into a fixed number of context tokens:
+
+1. near-duplicates are removed with 64-bit SimHash (Hamming distance
+   <= `dedupe_bits`; the higher-ranked copy wins),
+2. items are ordered by score, recency, or kept in the given order,
+3. item blocks (the item line plus its `EventContext` knowledge lines,
+   most important first) are fitted greedily, trimming knowledge lines
+   before skipping an item, or chosen by 0/1 knapsack to maximize total
+   score.
+
+Token counts come from a pluggable estimator; the default is a fast
+heuristic (about one token per CJK character and per four other
+characters). Pass e.g. `lambda s: len(enc.encode(s))` for exact counts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from datetime import timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .models import MemoryItem
+from .textindex import tokenize
+
+TokenEstimator = Callable[[str], int]
+
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+_ORDERS = {"score", "recency", None}
+_STRATEGIES = {"greedy", "knapsack"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast token estimate: one per CJK character plus one per ~4 other characters."""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the text's tokens (0 for text without tokens)."""
+    return _simhash_tokens(tokenize(text))
+
+
+def _simhash_tokens(tokens: Sequence[str]) -> int:
+    weights = [0] * 64
+    for tok in tokens:
+        h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    out = 0
+    for bit, w in enumerate(weights):
+        if w > 0:
+            out |= 1 << bit
+    return out
+
+
+def _hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class PackedContext:
+    """Result of pack_items()."""
+
+    text: str
+    items: List[MemoryItem] = field(default_factory=list)
+    tokens: int = 0
+    duplicates_removed: int = 0
+    items_dropped: int = 0  # did not fit the budget (after deduplication)
+    knowledge_trimmed: int = 0  # knowledge lines cut to make items fit
+
+
+def _recency_key(item: MemoryItem) -> float:
+    ts = item.timestamp
+    if ts is None:
+        return float("-inf")
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _dedupe(items: Sequence[MemoryItem], bits: int) -> Tuple[List[MemoryItem], int]:
+    kept: List[MemoryItem] = []
+    hashes: List[int] = []
+    for item in items:
+        tokens = tokenize(item.text)
+        if not tokens:
+            # Nothing to compare (e.g. emoji only); never call it a duplicate.
+            kept.append(item)
+            continue
+        h = _simhash_tokens(tokens)
+        if any(_hamming(h, other) <= bits for other in hashes):
+            continue
+        kept.append(item)
+        hashes.append(h)
+    return kept, len(items) - len(kept)
+
+
+def _knowledge_lines(item: MemoryItem) -> List[str]:
+    ctx = item.context
+    if ctx is None or not ctx.knowledge:
+        return []
+    ranked = sorted(ctx.knowledge, key=lambda k: -float(k.importance or 0.0))
+    return [f"   - {k.summary}" for k in ranked if str(k.summary or "").strip()]
+
+
+def pack_items(
+    items: Sequence[MemoryItem],
+    token_budget: int,
+    *,
+    estimator: TokenEstimator = estimate_tokens,
+    dedupe_bits: Optional[int] = 3,
+    order: Optional[str] = "score",
+    strategy: str = "greedy",
+    include_knowledge: bool = True,
+    max_items: Optional[int] = None,
+) -> PackedContext:
+    """Select and format items to fit `token_budget` tokens.
+
+    Args:
+        items: Candidate items, typically `SearchResult.items`.
+        token_budget: Maximum tokens for the formatted text (newlines count
+            towards the lines they end).
+        estimator: Callable returning the token count of a string.
+        dedupe_bits: SimHash Hamming distance at or below which two items are
+            near-duplicates; None disables deduplication.
+        order: "score" (highest first), "recency" (newest first) or None
+            (keep input order).
+        strategy: "greedy" fills in order, trimming an item's knowledge
+            lines before skipping it; "knapsack" picks the subset of whole
+            blocks with the highest total score, then lists it in `order`.
+        include_knowledge: Add `item.context.knowledge` summaries under
+            enriched items (see search(enrich="context")).
+        max_items: Optional cap on the number of items.
+
+    Returns:
+        PackedContext with the prompt text and what was kept or dropped.
+    """
+    if int(token_budget) < 0:
+        raise ValueError("token_budget must be >= 0")
+    if order not in _ORDERS:
+        raise ValueError("order must be one of: score, recency, None")
+    if strategy not in _STRATEGIES:
+        raise ValueError("strategy must be one of: greedy, knapsack")
+    budget = int(token_budget)
+
+    ranked = list(items)
+    if order == "score":
+        ranked.sort(key=lambda it: -float(it.score or 0.0))
+    elif order == "recency":
+        ranked.sort(key=_recency_key, reverse=True)
+    duplicates = 0
+    if dedupe_bits is not None:
+        ranked, duplicates = _dedupe(ranked, int(dedupe_bits))
+
+    # (item, text line cost, [(knowledge line, cost)]); numbering is assigned
+    # after selection, so cost the line with a two-digit placeholder.
+    blocks: List[Tuple[MemoryItem, int, List[Tuple[str, int]]]] = []
+    for item in ranked:
+        head = estimator(f"00. {item.text}\n")
+        extra = [(line, estimator(line + "\n")) for line in _knowledge_lines(item)] if include_knowledge else []
+        blocks.append((item, head, extra))
+
+    chosen: List[Tuple[MemoryItem, List[str]]] = []
+    trimmed = 0
+    if strategy == "greedy":
+        left = budget
+        for item, head, extra in blocks:
+            if max_items is not None and len(chosen) >= max_items:
+                break
+            if head > left:
+                continue
+            left -= head
+            lines: List[str] = []
+            for line, cost in extra:
+                if cost <= left:
+                    lines.append(line)
+                    left -= cost
+                else:
+                    trimmed += 1
+            chosen.append((item, lines))
+    else:
+        weighted = [(h + sum(c for _, c in e), max(float(it.score or 0.0), 1e-6)) for it, h, e in blocks]
+        picked = _knapsack(weighted, budget)
+        if max_items is not None:
+            picked = sorted(picked, key=lambda i: -float(blocks[i][0].score or 0.0))[: max(0, int(max_items))]
+        for i in sorted(picked):
+            item, _, extra = blocks[i]
+            chosen.append((item, [line for line, _ in extra]))
+
+    out_lines: List[str] = []
+    for n, (item, lines) in enumerate(chosen, 1):
+        out_lines.append(f"{n}. {item.text}")
+        out_lines.extend(lines)
+    text = "\n".join(out_lines)
+    return PackedContext(
+        text=text,
+        items=[item for item, _ in chosen],
+        tokens=estimator(text) if text else 0,
+        duplicates_removed=duplicates,
+        items_dropped=len(blocks) - len(chosen),
+        knowledge_trimmed=trimmed,
+    )
+
+
+def _knapsack(blocks: Sequence[Tuple[int, float]], budget: int) -> List[int]:
+    """Indices of the max-value subset of (cost, value) blocks with total cost <= budget."""
+    best: Dict[int, Tuple[float, Tuple[int, ...]]] = {0: (0.0, ())}
+    for i, (cost, value) in enumerate(blocks):
+        if cost > budget:
+            continue
+        for used, (val, idx) in list(best.items()):
+            total = used + cost
+            if total > budget:
+                continue
+            cand = val + value
+            cur = best.get(total)
+            if cur is None or cand > cur[0]:
+                best[total] = (cand, idx + (i,))
+    return list(max(best.values(), key=lambda v: v[0])[1])
+
+
+__all__ = ["PackedContext", "TokenEstimator", "estimate_tokens", "pack_items", "simhash"]
@@ -0,0 +1,33 @@
+"""Numbered append-only segment files shared by the on-disk stores.
+
+The usage spool (`seg-000000000001.jsonl`, ...) and the local fallback store
+(`fb-000000000001.jsonl`, ...) both keep a directory of JSON Lines segments
+named by a prefix and a zero-padded sequence number.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List
+
+SEGMENT_SUFFIX = ".jsonl"
+
+
+def segment_path(directory: str, prefix: str, seq: int) -> str:
+    """Path of segment `seq`."""
+    return os.path.join(directory, f"{prefix}{seq:012d}{SEGMENT_SUFFIX}")
+
+
+def list_segments(directory: str, prefix: str) -> List[int]:
+    """Sequence numbers of the segments in `directory`, ascending."""
+    out = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(SEGMENT_SUFFIX):
+            try:
+                out.append(int(name[len(prefix) : -len(SEGMENT_SUFFIX)]))
+            except ValueError:
+                continue
+    return sorted(out)
+
+
+__all__ = ["SEGMENT_SUFFIX", "list_segments", "segment_path"]
@@ -0,0 +1,140 @@
+"""Small in-memory inverted index with BM25 scoring.
+
+Used by the client-side search layers (the read-your-writes overlay and the
+offline fallback store). Text is NFKC-normalized and casefolded, then split
+into Unicode words (any script; combining marks stay with their word, so
+"Besançon", "Москву" and "สวัสดี" are single tokens). CJK runs become
+overlapping character bigrams, so Chinese/Japanese/Korean text matches
+without a segmenter.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+import threading
+import unicodedata
+from typing import Callable, Dict, Hashable, List, Optional, Pattern, Tuple
+
+_CJK = "\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af"
+_CJK_RE = re.compile(f"[{_CJK}]")
+
+
+@functools.lru_cache(maxsize=None)
+def _word_re() -> Pattern[str]:
+    # `\w` excludes combining marks (Thai vowels, Devanagari matras, ...),
+    # which would split words; add the BMP marks. Built on first use (~5 ms).
+    marks: List[str] = []
+    start = None
+    for cp in range(0x10000):
+        if unicodedata.category(chr(cp)).startswith("M"):
+            if start is None:
+                start = cp
+        elif start is not None:
+            marks.append(f"\\u{start:04x}-\\u{cp - 1:04x}")
+            start = None
+    return re.compile(f"[{_CJK}]+|(?:[^\\W_{_CJK}]|[{''.join(marks)}])+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded word tokens in any script; CJK runs become overlapping character bigrams."""
+    out: List[str] = []
+    for tok in _word_re().findall(unicodedata.normalize("NFKC", str(text or "")).casefold()):
+        if _CJK_RE.match(tok):
+            if len(tok) == 1:
+                out.append(tok)
+            else:
+                out.extend(tok[i : i + 2] for i in range(len(tok) - 1))
+        else:
+            out.append(tok)
+    return out
+
+
+def saturate(score: float, k: float = 5.0) -> float:
+    """Map an unbounded BM25 score into [0, 1) for merging with server scores."""
+    return score / (score + k) if score > 0 else 0.0
+
+
+class BM25Index:
+    """Thread-safe BM25 index over short documents keyed by any hashable id."""
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._lengths: Dict[Hashable, int] = {}
+        self._terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """Index `text` under `doc_id`, replacing any previous text for that id."""
+        tokens = tokenize(text)
+        tf: Dict[str, int] = {}
+        for tok in tokens:
+            tf[tok] = tf.get(tok, 0) + 1
+        with self._lock:
+            self._remove_locked(doc_id)
+            for tok, n in tf.items():
+                self._postings.setdefault(tok, {})[doc_id] = n
+            self._lengths[doc_id] = len(tokens)
+            self._terms[doc_id] = tuple(tf)
+            self._total_len += len(tokens)
+
+    def remove(self, doc_id: Hashable) -> None:
+        with self._lock:
+            self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: Hashable) -> None:
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_len -= length
+        for tok in self._terms.pop(doc_id):
+            docs = self._postings[tok]
+            del docs[doc_id]
+            if not docs:
+                del self._postings[tok]
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        *,
+        where: Optional[Callable[[Hashable], bool]] = None,
+    ) -> List[Tuple[float, Hashable]]:
+        """Top `k` (score, doc_id) pairs by BM25, best first; `where` filters ids."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._lengths)
+            if not n or not terms:
+                return []
+            avg = self._total_len / n or 1.0
+            scores: Dict[Hashable, float] = {}
+            for term in terms:
+                docs = self._postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1.0 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / avg)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+        out: List[Tuple[float, Hashable]] = []
+        for doc_id, score in ranked:
+            if where is not None and not where(doc_id):
+                continue
+            out.append((score, doc_id))
+            if len(out) >= k:
+                break
+        return out
+
+
+__all__ = ["BM25Index", "saturate", "tokenize"]
@@ -0,0 +1,137 @@
+"""Latency breakdown for /retrieval calls.
+
+Server-side phases come from the `Server-Timing` response header
+(`vector;dur=12.4, graph;dur=30.1, total;dur=48`) and from numeric timing
+fields the service reports under `metrics` or `debug` in the response body
+(`{"metrics": {"timings": {"vector_ms": 12.4}}}`, `{"debug": {"graph_ms": 30}}`).
+Client-side phases (queue, encode, network, backoff, decode) are measured by
+MemoryClient when a timing dict is passed to `retrieve_dialog_v2(timing=...)`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Mapping, Optional
+
+from .metrics import MetricsRegistry
+from .models import SearchTimings
+
+SEARCH_PHASE = "omem_search_phase_ms"
+SEARCH_SERVER_PHASE = "omem_search_server_phase_ms"
+
+_TOTAL_NAMES = ("total", "app", "server")
+_NESTED_KEYS = ("timings", "timing", "latency", "latencies", "latency_ms", "timings_ms")
+_DUR_RE = re.compile(r"(?:^|;)\s*dur\s*=\s*\"?([0-9.eE+-]+)\"?")
+
+
+def parse_server_timing(value: Optional[str]) -> Dict[str, float]:
+    """Parse a Server-Timing header value into {metric name: duration in ms}.
+
+    Metrics without a `dur` parameter are skipped; repeated names are summed.
+    """
+    out: Dict[str, float] = {}
+    for entry in str(value or "").split(","):
+        name, _, params = entry.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        m = _DUR_RE.search(";" + params)
+        if not m:
+            continue
+        try:
+            dur = float(m.group(1))
+        except ValueError:
+            continue
+        out[name] = out.get(name, 0.0) + dur
+    return out
+
+
+def _numeric_fields(d: Mapping[str, Any], out: Dict[str, float]) -> None:
+    for key, val in d.items():
+        if isinstance(val, bool) or not isinstance(val, (int, float)):
+            continue
+        k = str(key)
+        if k.endswith("_ms"):
+            out.setdefault(k[:-3], float(val))
+        elif k.endswith("_seconds"):
+            out.setdefault(k[: -len("_seconds")], float(val) * 1000)
+        elif k.endswith("_s"):
+            out.setdefault(k[:-2], float(val) * 1000)
+
+
+def timings_from_payload(data: Mapping[str, Any]) -> Dict[str, float]:
+    """Collect server-side phase durations (ms) from `metrics`/`debug` in a response body."""
+    out: Dict[str, float] = {}
+    for section in ("metrics", "debug"):
+        block = data.get(section) if isinstance(data, Mapping) else None
+        if not isinstance(block, Mapping):
+            continue
+        for key in _NESTED_KEYS:
+            nested = block.get(key)
+            if isinstance(nested, Mapping):
+                # Values of a dedicated timings block are ms even without a suffix.
+                for k, v in nested.items():
+                    if isinstance(v, (int, float)) and not isinstance(v, bool):
+                        name = str(k)[:-3] if str(k).endswith("_ms") else str(k)
+                        out.setdefault(name, float(v))
+        _numeric_fields(block, out)
+    return out
+
+
+def build_search_timings(
+    meta: Mapping[str, Any],
+    data: Mapping[str, Any],
+    *,
+    queued_since: float,
+    finished: float,
+) -> SearchTimings:
+    """Assemble SearchTimings from a client timing dict and the response body.
+
+    Args:
+        meta: Dict filled in by MemoryClient (`started`, `encode_ms`,
+            `network_ms`, `backoff_ms`, `decode_ms`, `attempts`, `server_timing`).
+        data: Decoded /retrieval response.
+        queued_since: perf_counter() when the search was requested.
+        finished: perf_counter() after the response was decoded.
+    """
+    server = timings_from_payload(data)
+    # The header is authoritative when both report the same phase.
+    server.update(parse_server_timing(meta.get("server_timing")))
+    server_total: Optional[float] = None
+    for name in _TOTAL_NAMES:
+        if name in server:
+            server_total = server.pop(name)
+            break
+    started = float(meta.get("started", queued_since))
+    return SearchTimings(
+        total_ms=(finished - queued_since) * 1000,
+        queue_ms=max(0.0, (started - queued_since) * 1000),
+        encode_ms=float(meta.get("encode_ms", 0.0)),
+        network_ms=float(meta.get("network_ms", 0.0)),
+        backoff_ms=float(meta.get("backoff_ms", 0.0)),
+        decode_ms=float(meta.get("decode_ms", 0.0)),
+        attempts=int(meta.get("attempts", 1)),
+        server_ms=server,
+        server_total_ms=server_total,
+    )
+
+
+def record_search_timings(registry: MetricsRegistry, timings: SearchTimings) -> None:
+    """Aggregate one breakdown into the client's metrics registry."""
+    for phase in ("queue", "encode", "network", "backoff", "decode"):
+        registry.observe(SEARCH_PHASE, getattr(timings, f"{phase}_ms"), {"phase": phase})
+    transit = timings.transit_ms
+    if transit is not None:
+        registry.observe(SEARCH_PHASE, transit, {"phase": "transit"})
+    if timings.server_total_ms is not None:
+        registry.observe(SEARCH_SERVER_PHASE, timings.server_total_ms, {"phase": "total"})
+    for name, ms in timings.server_ms.items():
+        registry.observe(SEARCH_SERVER_PHASE, ms, {"phase": name})
+
+
+__all__ = [
+    "parse_server_timing",
+    "timings_from_payload",
+    "build_search_timings",
+    "record_search_timings",
+]
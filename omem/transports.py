@@ -0,0 +1,171 @@
+"""Process-wide registry of shared HTTP connection pools.
+
+Apps that create a Memory/MemoryClient per end user or per request would
+otherwise build one connection pool (TLS sessions, sockets) per instance.
+With `shared_transport=True`, clients with the same origin and pool settings
+borrow a single thread-safe httpx.HTTPTransport from this registry instead:
+
+    >>> mem = Memory(api_key=user_key, shared_transport=True)
+
+Only the transport (the connection pool) is shared. Each client still wraps
+it in its own httpx.Client, so per-instance state (API key, tenant headers,
+`headers=...`, cookies) never crosses instances. Entries are reference
+counted: the pool closes when the last borrower calls close(). After
+os.fork() the child starts with an empty registry and clients rebuild their
+pools on next use, so parent sockets are never shared across processes.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+TransportKey = Tuple[str, float, Optional[int], Optional[int], Optional[float], bool]
+
+
+class SharedTransport(httpx.BaseTransport):
+    """One borrower's handle on a pooled transport.
+
+    close() is a no-op so that closing the borrowing httpx.Client leaves the
+    pool open for other clients; return the handle with
+    SharedTransportRegistry.release() instead.
+    """
+
+    def __init__(self, pool: httpx.BaseTransport) -> None:
+        self.pool = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.pool.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class _Entry:
+    pool: httpx.BaseTransport
+    refs: int
+
+
+def _origin(base_url: str) -> str:
+    u = urlsplit(str(base_url or "").strip())
+    if not u.scheme or not u.netloc:
+        raise ValueError(f"invalid base_url: {base_url!r}")
+    return f"{u.scheme.lower()}://{u.netloc.lower()}"
+
+
+class SharedTransportRegistry:
+    """Reference-counted httpx.HTTPTransports keyed by origin and pool settings. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[TransportKey, _Entry] = {}
+        self._by_id: Dict[int, TransportKey] = {}
+        self._pid = os.getpid()
+
+    @staticmethod
+    def key(base_url: str, *, timeout_s: float, limits: httpx.Limits, http2: bool = False) -> TransportKey:
+        return (
+            _origin(base_url),
+            float(timeout_s),
+            limits.max_connections,
+            limits.max_keepalive_connections,
+            limits.keepalive_expiry,
+            bool(http2),
+        )
+
+    def acquire(
+        self,
+        base_url: str,
+        *,
+        timeout_s: float = 30.0,
+        limits: Optional[httpx.Limits] = None,
+        http2: bool = False,
+    ) -> SharedTransport:
+        """Borrow the shared pool for these settings, creating it if needed.
+
+        Pass the returned handle to `httpx.Client(transport=...)`. Every
+        acquire() must be paired with a release() of the handle.
+        """
+        limits = limits or httpx.Limits()
+        key = self.key(base_url, timeout_s=timeout_s, limits=limits, http2=http2)
+        self._check_fork()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                pool = self._new_pool(limits, bool(http2))
+                entry = self._entries[key] = _Entry(pool, 0)
+                self._by_id[id(pool)] = key
+            entry.refs += 1
+            return SharedTransport(entry.pool)
+
+    @staticmethod
+    def _new_pool(limits: httpx.Limits, http2: bool) -> httpx.BaseTransport:
+        return httpx.HTTPTransport(limits=limits, http2=http2)
+
+    def _entry(self, transport: SharedTransport) -> Optional[_Entry]:
+        key = self._by_id.get(id(transport.pool))
+        entry = self._entries.get(key) if key is not None else None
+        return entry if entry is not None and entry.pool is transport.pool else None
+
+    def release(self, transport: SharedTransport) -> None:
+        """Drop one reference; the pool is closed when none remain."""
+        self._check_fork()
+        with self._lock:
+            entry = self._entry(transport)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[self._by_id.pop(id(entry.pool))]
+        entry.pool.close()
+
+    def refcount(self, transport: SharedTransport) -> int:
+        with self._lock:
+            entry = self._entry(transport)
+            return entry.refs if entry is not None else 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def close_all(self) -> None:
+        """Close every shared pool regardless of outstanding references."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._by_id.clear()
+        for entry in entries:
+            entry.pool.close()
+
+    def _check_fork(self) -> None:
+        if os.getpid() != self._pid:
+            self._after_fork()
+
+    def _after_fork(self) -> None:
+        # The parent's lock may have been held at fork time, and its sockets
+        # belong to the parent: start over without closing anything.
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._by_id = {}
+        self._pid = os.getpid()
+
+
+_default_registry = SharedTransportRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_default_registry._after_fork)
+
+
+def default_registry() -> SharedTransportRegistry:
+    """The process-wide registry used by `shared_transport=True`."""
+    return _default_registry
+
+
+__all__ = ["SharedTransport", "SharedTransportRegistry", "default_registry"]
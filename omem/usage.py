@@ -1,21 +1,30 @@
 from __future__ import annotations
 
+import collections
+import gzip
 import hashlib
+import json
+import random
+import threading
+import time
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, Iterator, Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import httpx
 
-from modules.memory import (
+from .usage_aggregate import UsageAggregationConfig, UsageAggregator, sampled
+from .usage_context import (
     LLMUsageContext,
+    record_llm_usage,
     reset_llm_usage_context,
     reset_llm_usage_hook,
     set_llm_usage_context,
     set_llm_usage_hook,
 )
+from .usage_spool import UsageSpool
 
 
 def _normalize_base_url(base_url: str) -> str:
@@ -50,6 +59,59 @@ class OmemUsageError(RuntimeError):
     pass
 
 
+@dataclass(frozen=True)
+class UsageBatchConfig:
+    """Batching mode for LLMUsageReporter.
+
+    Events are queued in memory and posted by a background thread when any
+    trigger fires: `max_events` queued, `max_bytes` of serialized events, or
+    the oldest event reaching `max_age_s`.
+    """
+
+    max_events: int = 200
+    max_bytes: int = 256 * 1024
+    max_age_s: float = 1.0
+    # Queue bound; events emitted while the queue is full are dropped.
+    max_queue: int = 10000
+    # Gzip request bodies at least this large (None disables compression).
+    gzip_min_bytes: Optional[int] = 1024
+    max_retries: int = 3
+    base_backoff_s: float = 0.5
+    max_backoff_s: float = 10.0
+
+
+@dataclass(frozen=True)
+class UsageReporterStats:
+    """Counters for a batching LLMUsageReporter."""
+
+    emitted: int = 0
+    sent: int = 0
+    batches: int = 0
+    retries: int = 0
+    dropped_queue_full: int = 0
+    dropped_send_failed: int = 0
+    queued: int = 0
+    spooled: int = 0
+    replayed: int = 0
+    aggregated: int = 0
+    summaries: int = 0
+
+
+class _RetryableUsageError(OmemUsageError):
+    pass
+
+
+# Outcomes of one batch POST: accepted, worth retrying later (transport
+# error, 429, 5xx), or permanently rejected (any other 4xx).
+_SENT = "sent"
+_RETRY = "retry"
+_REJECTED = "rejected"
+
+
+def _retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
 class LLMUsageReporter:
     def __init__(
         self,
@@ -64,7 +126,33 @@ class LLMUsageReporter:
         default_source: str = "sdk",
         http: Optional[httpx.Client] = None,
         strict: bool = False,
+        batch: Optional[UsageBatchConfig] = None,
+        spool: Optional[UsageSpool] = None,
+        spool_replay_interval_s: float = 5.0,
+        aggregate: Optional[UsageAggregationConfig] = None,
     ) -> None:
+        """Create a reporter.
+
+        By default every emit() posts synchronously. Pass
+        `batch=UsageBatchConfig()` to queue events and post them in gzip'd
+        batches from a background thread instead; emit() then never waits on
+        the network. Batches are retried with the same deterministic
+        `event_id`s, so the server can deduplicate resends. Call flush() to
+        drain the queue; close() flushes before shutting down.
+
+        With `spool=UsageSpool(dir)`, events that cannot be delivered right
+        now (transport errors, 429, 5xx) are written to disk instead of
+        dropped, and a background worker replays
+        them every `spool_replay_interval_s` (and right after any successful
+        post) until the endpoint accepts them.
+
+        With `aggregate=UsageAggregationConfig(window_s=...)`, per-call events
+        are rolled up into one summary per (tenant, api key, stage, provider,
+        model, source) and window (see omem.usage_aggregate); only summaries
+        and the sampled per-call detail are sent. Without `batch`, they are
+        posted from the aggregation thread, so emit() still never waits on
+        the network.
+        """
         self._base_url = _normalize_base_url(base_url)
         self._tenant_id = str(tenant_id or "").strip()
         if not self._tenant_id:
@@ -78,9 +166,103 @@ class LLMUsageReporter:
         self._http = http or httpx.Client(timeout=self._timeout_s)
         self._strict = bool(strict)
 
+        self._batch = batch
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[float, bytes]] = collections.deque()
+        self._queued_bytes = 0
+        self._inflight = 0
+        self._flush_requested = False
+        self._closing = False
+        self._counts: Dict[str, int] = collections.Counter()
+        self._flusher: Optional[threading.Thread] = None
+        if batch is not None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="omem-usage-flusher", daemon=True)
+            self._flusher.start()
+
+        self._spool = spool
+        self._spool_interval_s = max(0.01, float(spool_replay_interval_s))
+        self._replay_wake = threading.Event()
+        self._replay_stop = threading.Event()
+        self._replayer: Optional[threading.Thread] = None
+        if spool is not None:
+            self._replayer = threading.Thread(target=self._replay_loop, name="omem-usage-replay", daemon=True)
+            self._replayer.start()
+
+        self._aggregator: Optional[UsageAggregator] = None
+        self._roller: Optional[threading.Thread] = None
+        self._roll_stop = threading.Event()
+        self._roll_wake = threading.Event()
+        # Closed summaries and sampled detail waiting for the aggregation thread to post (no batch mode).
+        self._roll_pending: List[Dict[str, Any]] = []
+        if aggregate is not None:
+            self._aggregator = UsageAggregator(aggregate)
+            self._roller = threading.Thread(target=self._roll_loop, name="omem-usage-aggregate", daemon=True)
+            self._roller.start()
+
     def close(self) -> None:
+        if self._roller is not None:
+            self._roll_stop.set()
+            self._roll_wake.set()
+            self._roller.join()
+            self._roller = None
+        if self._flusher is not None:
+            self.flush()  # drains the aggregator into the queue while the flusher runs
+            with self._cond:
+                self._closing = True
+                self._cond.notify_all()
+            self._flusher.join()
+            self._flusher = None
+        if self._replayer is not None:
+            self._replay_stop.set()
+            self._replay_wake.set()
+            self._replayer.join()
+            self._replayer = None
+        if self._aggregator is not None:
+            # Late reports only; with the flusher gone these are posted directly.
+            self._dispatch(self._take_roll_pending() + self._aggregator.drain(force=True))
+        if self._spool is not None:
+            self._spool.close()
         self._http.close()
 
+    def flush(self, timeout_s: Optional[float] = None) -> bool:
+        """Send everything queued or aggregated so far; returns False on timeout.
+
+        Open aggregation windows are closed early (their summaries get a new
+        part number). Without batching, this returns once they are posted.
+        """
+        if self._aggregator is not None:
+            self._dispatch(self._take_roll_pending() + self._aggregator.drain(force=True))
+        if self._flusher is None:
+            return True
+        deadline = None if timeout_s is None else time.monotonic() + float(timeout_s)
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._queue or self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> UsageReporterStats:
+        """Delivery and drop counters (batching mode)."""
+        with self._cond:
+            c = dict(self._counts)
+            return UsageReporterStats(
+                emitted=c.get("emitted", 0),
+                sent=c.get("sent", 0),
+                batches=c.get("batches", 0),
+                retries=c.get("retries", 0),
+                dropped_queue_full=c.get("dropped_queue_full", 0),
+                dropped_send_failed=c.get("dropped_send_failed", 0),
+                queued=len(self._queue),
+                spooled=c.get("spooled", 0),
+                replayed=c.get("replayed", 0),
+                aggregated=c.get("aggregated", 0),
+                summaries=c.get("summaries", 0),
+            )
+
     def build_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         raw = dict(payload or {})
         tenant_id = str(raw.get("tenant_id") or self._tenant_id).strip()
@@ -140,12 +322,30 @@ class LLMUsageReporter:
         }
 
     def emit(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Report one LLM call; returns its event_id, or None if it was not accepted.
+
+        In aggregate mode the call is counted into a window summary and the
+        event_id is local only: the server sees it only if the call is
+        sampled for per-call detail.
+        """
         try:
             event = self.build_event(payload)
         except Exception as exc:
             if self._strict:
                 raise OmemUsageError(f"build_usage_event_failed: {exc}") from exc
             return None
+        if self._aggregator is not None:
+            closed = self._aggregator.add(event)
+            with self._cond:
+                self._counts["aggregated"] += 1
+            detail = [event] if sampled(event, self._aggregator.config.detail_sample_rate) else []
+            if self._batch is None and self._roller is not None:
+                self._hand_to_roller(closed + detail)
+            else:
+                self._dispatch(closed + detail)
+            return event["event_id"]
+        if self._batch is not None:
+            return event["event_id"] if self._enqueue(event) else None
         ok = self._post_events([event])
         return event.get("event_id") if ok else None
 
@@ -180,20 +380,236 @@ class LLMUsageReporter:
         return self.emit(payload)
 
     def _post_events(self, events: Iterable[Dict[str, Any]]) -> bool:
+        """POST events synchronously; True once delivered or durably spooled."""
+        events = list(events)
         url = f"{self._base_url}{self._path}"
         headers = {"Content-Type": "application/json"}
         if self._internal_key:
             headers["X-Internal-Key"] = self._internal_key
         try:
-            resp = self._http.post(url, headers=headers, json={"events": list(events)})
+            resp = self._http.post(url, headers=headers, json={"events": events})
             if resp.status_code >= 400:
-                raise OmemUsageError(f"usage_emit_failed: status={resp.status_code}")
+                exc_cls = _RetryableUsageError if _retryable_status(resp.status_code) else OmemUsageError
+                raise exc_cls(f"usage_emit_failed: status={resp.status_code}")
         except Exception as exc:
+            # A permanent rejection (4xx) would be rejected again on replay.
+            retryable = isinstance(exc, _RetryableUsageError) or not isinstance(exc, OmemUsageError)
+            spooled = retryable and self._spool_events(events)
+            if not spooled:
+                with self._cond:
+                    self._counts["dropped_send_failed"] += len(events)
             if self._strict:
                 raise OmemUsageError(f"usage_emit_failed: {exc}") from exc
+            return spooled
+        self._replay_wake.set()
+        return True
+
+    # ---- aggregation -------------------------------------------------------
+
+    def _dispatch(self, events: List[Dict[str, Any]]) -> None:
+        """Send summaries and sampled detail through the batch queue or directly.
+
+        After close() has stopped the flusher, events are posted directly
+        instead of being queued where nothing would send them.
+        """
+        if not events:
+            return
+        with self._cond:
+            self._counts["summaries"] += sum(1 for e in events if e.get("event_type") == "llm_aggregate")
+        if self._batch is not None and self._flusher is not None:
+            for event in events:
+                self._enqueue(event)
+        else:
+            self._post_events(events)
+
+    def _hand_to_roller(self, events: List[Dict[str, Any]]) -> None:
+        """Leave events for the aggregation thread to post, off the caller's thread."""
+        if not events:
+            return
+        with self._cond:
+            self._roll_pending.extend(events)
+        self._roll_wake.set()
+
+    def _take_roll_pending(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            events, self._roll_pending = self._roll_pending, []
+        return events
+
+    def _roll_loop(self) -> None:
+        assert self._aggregator is not None
+        window_s = float(self._aggregator.config.window_s)
+        while not self._roll_stop.is_set():
+            self._roll_wake.wait(min(1.0, window_s / 4))
+            self._roll_wake.clear()
+            if self._roll_stop.is_set():
+                break  # close() posts what is left
+            try:
+                self._dispatch(self._take_roll_pending() + self._aggregator.drain())
+            except OmemUsageError:
+                continue
+
+    # ---- spool -------------------------------------------------------------
+
+    def _spool_events(self, events: List[Any]) -> bool:
+        if self._spool is None:
+            return False
+        try:
+            n = self._spool.append(events)
+        except OSError:
             return False
+        with self._cond:
+            self._counts["spooled"] += n
+        return True
+
+    def _replay_loop(self) -> None:
+        assert self._spool is not None
+        while not self._replay_stop.is_set():
+            self._replay_wake.wait(self._spool_interval_s)
+            self._replay_wake.clear()
+            if self._replay_stop.is_set():
+                return
+            try:
+                self._spool.replay(self._replay_send)
+            except OSError:
+                continue
+
+    def _replay_send(self, batch: List[bytes]) -> bool:
+        """Spool replay callback: True once the batch needs no resend (sent or permanently rejected)."""
+        sent, rejected, unsent = self._deliver(batch)
+        with self._cond:
+            self._counts["replayed"] += sent
+            self._counts["dropped_send_failed"] += rejected
+        # On a retryable failure the whole batch stays spooled; parts already
+        # accepted are deduplicated server-side by event_id on the next replay.
+        return not unsent
+
+    # ---- batching ----------------------------------------------------------
+
+    def _enqueue(self, event: Dict[str, Any]) -> bool:
+        data = json.dumps(event, separators=(",", ":")).encode("utf-8")
+        cfg = self._batch
+        assert cfg is not None
+        with self._cond:
+            if len(self._queue) >= cfg.max_queue:
+                self._counts["dropped_queue_full"] += 1
+                return False
+            self._queue.append((time.monotonic(), data))
+            self._queued_bytes += len(data)
+            self._counts["emitted"] += 1
+            # Wake the flusher to start the age timer, or to send a full batch.
+            if len(self._queue) == 1 or len(self._queue) >= cfg.max_events or self._queued_bytes >= cfg.max_bytes:
+                self._cond.notify_all()
         return True
 
+    def _take_batch(self) -> List[bytes]:
+        """Wait for a flush trigger and pop one batch. Caller holds the lock."""
+        cfg = self._batch
+        assert cfg is not None
+        while True:
+            if self._queue:
+                age = time.monotonic() - self._queue[0][0]
+                if (
+                    self._flush_requested
+                    or self._closing
+                    or len(self._queue) >= cfg.max_events
+                    or self._queued_bytes >= cfg.max_bytes
+                    or age >= cfg.max_age_s
+                ):
+                    break
+                self._cond.wait(cfg.max_age_s - age)
+            elif self._closing:
+                return []
+            else:
+                self._flush_requested = False
+                self._cond.wait()
+        batch: List[bytes] = []
+        size = 0
+        while self._queue and len(batch) < cfg.max_events:
+            data = self._queue[0][1]
+            if batch and size + len(data) > cfg.max_bytes:
+                break
+            self._queue.popleft()
+            self._queued_bytes -= len(data)
+            batch.append(data)
+            size += len(data)
+        self._inflight = len(batch)
+        return batch
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+                if not batch:
+                    self._cond.notify_all()
+                    return
+            sent, rejected, unsent = self._deliver(batch)
+            with self._cond:
+                self._inflight = 0
+                self._counts["batches"] += 1
+                self._counts["sent"] += sent
+                self._counts["dropped_send_failed"] += rejected
+            if not unsent:
+                self._replay_wake.set()
+            elif not self._spool_events(unsent):
+                with self._cond:
+                    self._counts["dropped_send_failed"] += len(unsent)
+            with self._cond:
+                if not self._queue:
+                    self._flush_requested = False
+                self._cond.notify_all()
+
+    def _deliver(self, batch: List[bytes]) -> Tuple[int, int, List[bytes]]:
+        """Send `batch`, bisecting a permanently rejected batch to isolate the bad events.
+
+        Returns (events sent, events rejected, events left unsent after a
+        retryable failure).
+        """
+        outcome = self._send_batch(batch)
+        if outcome == _SENT:
+            return len(batch), 0, []
+        if outcome == _RETRY:
+            return 0, 0, batch
+        if len(batch) == 1:
+            return 0, 1, []
+        mid = len(batch) // 2
+        sent, rejected, unsent = self._deliver(batch[:mid])
+        if unsent:
+            return sent, rejected, unsent + batch[mid:]
+        sent2, rejected2, unsent2 = self._deliver(batch[mid:])
+        return sent + sent2, rejected + rejected2, unsent2
+
+    def _send_batch(self, batch: List[bytes]) -> str:
+        """POST one batch, retrying transient failures; events keep their event_id.
+
+        Returns _SENT, _RETRY (retries exhausted) or _REJECTED (non-retryable 4xx).
+        """
+        cfg = self._batch or UsageBatchConfig()
+        body = b'{"events":[' + b",".join(batch) + b"]}"
+        headers = {"Content-Type": "application/json"}
+        if self._internal_key:
+            headers["X-Internal-Key"] = self._internal_key
+        if cfg.gzip_min_bytes is not None and len(body) >= cfg.gzip_min_bytes:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        url = f"{self._base_url}{self._path}"
+        attempt = 0
+        while True:
+            try:
+                resp = self._http.post(url, headers=headers, content=body)
+                if _retryable_status(resp.status_code):
+                    raise _RetryableUsageError(f"usage_emit_failed: status={resp.status_code}")
+                return _SENT if resp.status_code < 400 else _REJECTED
+            except (httpx.TransportError, _RetryableUsageError):
+                if attempt >= cfg.max_retries:
+                    return _RETRY
+            except Exception:
+                return _RETRY
+            wait = min(cfg.max_backoff_s, cfg.base_backoff_s * (2 ** attempt))
+            attempt += 1
+            with self._cond:
+                self._counts["retries"] += 1
+            time.sleep(random.uniform(0.5 * wait, wait))
+
     @contextmanager
     def context(
         self,
@@ -206,6 +622,7 @@ class LLMUsageReporter:
         source: Optional[str] = None,
         api_key_id: Optional[str] = None,
     ) -> Iterator[LLMUsageContext]:
+        """Route record_llm_usage() calls made inside the block to this reporter."""
         rid = str(request_id or "").strip() or f"req_{uuid.uuid4().hex}"
         ctx = LLMUsageContext(
             tenant_id=self._tenant_id,
@@ -227,7 +644,13 @@ class LLMUsageReporter:
 
 
 __all__ = [
+    "LLMUsageContext",
     "LLMUsageReporter",
     "LLMUsageReporterConfig",
     "OmemUsageError",
+    "UsageAggregationConfig",
+    "UsageBatchConfig",
+    "UsageReporterStats",
+    "UsageSpool",
+    "record_llm_usage",
 ]
@@ -0,0 +1,181 @@
+"""Windowed pre-aggregation of LLM usage events.
+
+`LLMUsageReporter(aggregate=UsageAggregationConfig(window_s=60))` rolls
+per-call usage events up into one summary per
+(tenant_id, api_key_id, stage, provider, model, source) and time window,
+instead of posting one event per LLM call:
+
+    {
+      "event_id": "llmagg_…",          # deterministic, see below
+      "event_type": "llm_aggregate",
+      "tenant_id": "...", "api_key_id": "...",
+      "timestamp": "<window start>",
+      "window": {"start": "...", "end": "...", "seconds": 60.0},
+      "metrics": {"stage": ..., "provider": ..., "model": ..., "source": ...,
+                  "calls": 412, "prompt_tokens": ..., "completion_tokens": ...,
+                  "total_tokens": ..., "tokens_missing_calls": 3}
+    }
+
+Windows are aligned to multiples of `window_s` since the epoch. A summary's
+`event_id` hashes the group, the window start, this aggregator's emitter id
+and a part number (bumped when a window is flushed early), so resends of the
+same summary deduplicate while distinct summaries never collide.
+
+With `detail_sample_rate > 0`, the full per-call events of a deterministic
+sample of requests (hashed on job_id or request_id, so every call of a
+sampled request is kept) are emitted as well.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+GroupKey = Tuple[str, str, str, str, str, str]
+
+_KEY_FIELDS = ("stage", "provider", "model", "source")
+
+
+@dataclass(frozen=True)
+class UsageAggregationConfig:
+    """Aggregation mode for LLMUsageReporter."""
+
+    window_s: float = 60.0
+    # Fraction of requests whose per-call events are also emitted (0 disables).
+    detail_sample_rate: float = 0.0
+    # Open groups per window before the window is flushed early.
+    max_groups: int = 10000
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def _tokens(value: Any) -> int:
+    try:
+        return int(value) if value is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def sampled(event: Dict[str, Any], rate: float) -> bool:
+    """Deterministically decide whether `event`'s request is in the detail sample."""
+    if rate <= 0:
+        return False
+    if rate >= 1:
+        return True
+    anchor = str(event.get("job_id") or event.get("request_id") or event.get("event_id") or "")
+    bucket = int(hashlib.sha256(anchor.encode()).hexdigest()[:8], 16) / float(1 << 32)
+    return bucket < rate
+
+
+class UsageAggregator:
+    """Accumulates per-call usage events into per-window group summaries. Thread-safe."""
+
+    def __init__(self, config: Optional[UsageAggregationConfig] = None, *, emitter_id: Optional[str] = None) -> None:
+        self.config = config or UsageAggregationConfig()
+        if float(self.config.window_s) <= 0:
+            raise ValueError("window_s must be > 0")
+        if int(self.config.max_groups) <= 0:
+            raise ValueError("max_groups must be > 0")
+        self.emitter_id = str(emitter_id or "").strip() or uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._window_start: Optional[float] = None
+        self._groups: Dict[GroupKey, Dict[str, int]] = {}
+        self._parts: Dict[Tuple[GroupKey, float], int] = {}
+
+    def _align(self, ts: float) -> float:
+        w = float(self.config.window_s)
+        return (ts // w) * w
+
+    def add(self, event: Dict[str, Any], *, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Fold one per-call event in; returns summaries of any window it closed."""
+        ts = time.time() if now is None else float(now)
+        start = self._align(ts)
+        m = event.get("metrics") or {}
+        key: GroupKey = (
+            str(event.get("tenant_id") or ""),
+            str(event.get("api_key_id") or ""),
+            *(str(m.get(f) or "") for f in _KEY_FIELDS),
+        )
+        out: List[Dict[str, Any]] = []
+        with self._lock:
+            if self._window_start is not None and start != self._window_start:
+                out = self._drain_locked()
+            if key not in self._groups and len(self._groups) >= int(self.config.max_groups):
+                out.extend(self._drain_locked())
+            self._window_start = start
+            g = self._groups.get(key)
+            if g is None:
+                g = self._groups[key] = {
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "total_tokens": 0,
+                    "tokens_missing_calls": 0,
+                }
+            g["calls"] += 1
+            g["prompt_tokens"] += _tokens(m.get("prompt_tokens"))
+            g["completion_tokens"] += _tokens(m.get("completion_tokens"))
+            g["total_tokens"] += _tokens(m.get("total_tokens"))
+            if m.get("tokens_missing"):
+                g["tokens_missing_calls"] += 1
+        return out
+
+    def drain(self, *, now: Optional[float] = None, force: bool = False) -> List[Dict[str, Any]]:
+        """Summaries for the open window if it has ended (or unconditionally with force)."""
+        ts = time.time() if now is None else float(now)
+        with self._lock:
+            if self._window_start is None:
+                return []
+            if not force and self._align(ts) == self._window_start:
+                return []
+            return self._drain_locked()
+
+    @property
+    def open_groups(self) -> int:
+        with self._lock:
+            return len(self._groups)
+
+    def _drain_locked(self) -> List[Dict[str, Any]]:
+        start = self._window_start
+        if start is None or not self._groups:
+            self._window_start = None
+            return []
+        window_s = float(self.config.window_s)
+        out = []
+        for key, g in self._groups.items():
+            part = self._parts.get((key, start), 0)
+            self._parts[(key, start)] = part + 1
+            tenant_id, api_key_id, stage, provider, model, source = key
+            seed = f"{self.emitter_id}|{'|'.join(key)}|{start:.3f}|{part}"
+            out.append(
+                {
+                    "event_id": "llmagg_" + hashlib.sha256(seed.encode()).hexdigest()[:32],
+                    "event_type": "llm_aggregate",
+                    "tenant_id": tenant_id,
+                    "api_key_id": api_key_id or None,
+                    "timestamp": _iso(start),
+                    "window": {"start": _iso(start), "end": _iso(start + window_s), "seconds": window_s},
+                    "metrics": {
+                        "stage": stage,
+                        "provider": provider or None,
+                        "model": model or None,
+                        "source": source,
+                        **g,
+                    },
+                }
+            )
+        self._groups = {}
+        self._window_start = None
+        # Part numbers only matter while a window can still receive events.
+        self._parts = {k: v for k, v in self._parts.items() if k[1] >= start}
+        return out
+
+
+__all__ = ["UsageAggregationConfig", "UsageAggregator", "sampled"]
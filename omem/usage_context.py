@@ -0,0 +1,166 @@
+"""Context-local LLM usage attribution.
+
+Code that makes LLM calls reports token usage without knowing who is
+billed: it calls `record_llm_usage(...)`, and whichever reporter is active
+in the current context (see `LLMUsageReporter.context()`) receives the
+payload, merged with the request/stage/tenant fields of the active
+`LLMUsageContext`.
+
+The state lives in `contextvars`, so it follows asyncio tasks automatically.
+Thread pools do not copy context; wrap submitted callables with
+`bind_llm_usage_context(fn)` (or submit `contextvars.copy_context().run`).
+When no hook is set, `record_llm_usage` returns after a single ContextVar
+lookup.
+
+If the server-side `modules.memory` package is importable, setting a
+context or hook here also sets its equivalents, so LLM calls made through
+that module are attributed to the same reporter.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import itertools
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+UsageHook = Callable[[Dict[str, Any]], Any]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class LLMUsageContext:
+    """Attribution fields applied to every usage payload recorded in a context."""
+
+    tenant_id: str
+    api_key_id: Optional[str] = None
+    request_id: Optional[str] = None
+    stage: Optional[str] = None
+    job_id: Optional[str] = None
+    session_id: Optional[str] = None
+    call_index: Optional[int] = None
+    source: Optional[str] = None
+    _calls: "itertools.count[int]" = field(default_factory=itertools.count, init=False, repr=False, compare=False)
+
+    def next_call_index(self) -> int:
+        """Monotonic per-context call counter, so each call gets its own event_id."""
+        return next(self._calls)
+
+
+_CONTEXT: contextvars.ContextVar[Optional[LLMUsageContext]] = contextvars.ContextVar(
+    "omem_llm_usage_context", default=None
+)
+_HOOK: contextvars.ContextVar[Optional[UsageHook]] = contextvars.ContextVar("omem_llm_usage_hook", default=None)
+
+_UNSET = object()
+_external: Any = _UNSET
+
+
+def _external_module() -> Any:
+    """`modules.memory` if it is importable, else None (looked up once)."""
+    global _external
+    if _external is _UNSET:
+        try:
+            import modules.memory as mod  # type: ignore[import-not-found]
+        except ImportError:
+            mod = None
+        _external = mod
+    return _external
+
+
+def _to_external(mod: Any, ctx: LLMUsageContext) -> Any:
+    values = {f.name: getattr(ctx, f.name) for f in fields(ctx) if f.init}
+    try:
+        return mod.LLMUsageContext(**values)
+    except (AttributeError, TypeError):
+        return None
+
+
+def get_llm_usage_context() -> Optional[LLMUsageContext]:
+    return _CONTEXT.get()
+
+
+def get_llm_usage_hook() -> Optional[UsageHook]:
+    return _HOOK.get()
+
+
+def set_llm_usage_context(ctx: Optional[LLMUsageContext]) -> Tuple[contextvars.Token, Any]:
+    """Activate `ctx`; pass the returned token to reset_llm_usage_context()."""
+    token = _CONTEXT.set(ctx)
+    ext_token = None
+    mod = _external_module()
+    if mod is not None and ctx is not None:
+        ext_ctx = _to_external(mod, ctx)
+        if ext_ctx is not None:
+            ext_token = mod.set_llm_usage_context(ext_ctx)
+    return token, ext_token
+
+
+def reset_llm_usage_context(token: Tuple[contextvars.Token, Any]) -> None:
+    own, ext = token
+    _CONTEXT.reset(own)
+    if ext is not None:
+        _external_module().reset_llm_usage_context(ext)
+
+
+def set_llm_usage_hook(hook: Optional[UsageHook]) -> Tuple[contextvars.Token, Any]:
+    """Install `hook` as the usage sink; pass the returned token to reset_llm_usage_hook()."""
+    token = _HOOK.set(hook)
+    ext_token = None
+    mod = _external_module()
+    if mod is not None and hook is not None:
+        ext_token = mod.set_llm_usage_hook(hook)
+    return token, ext_token
+
+
+def reset_llm_usage_hook(token: Tuple[contextvars.Token, Any]) -> None:
+    own, ext = token
+    _HOOK.reset(own)
+    if ext is not None:
+        _external_module().reset_llm_usage_hook(ext)
+
+
+def record_llm_usage(**payload: Any) -> Any:
+    """Report one LLM call to the active hook; a no-op returning None without one.
+
+    Fields of the active LLMUsageContext fill in anything not given
+    explicitly. `call_index` defaults to the context's next call number.
+    """
+    hook = _HOOK.get()
+    if hook is None:
+        return None
+    ctx = _CONTEXT.get()
+    if ctx is not None:
+        for f in fields(ctx):
+            if f.init and payload.get(f.name) is None:
+                value = getattr(ctx, f.name)
+                if value is not None:
+                    payload[f.name] = value
+        if payload.get("call_index") is None:
+            payload["call_index"] = ctx.next_call_index()
+    return hook(payload)
+
+
+def bind_llm_usage_context(fn: F) -> F:
+    """Wrap `fn` to run in a copy of the current context (for thread pools)."""
+    ctx = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+__all__ = [
+    "LLMUsageContext",
+    "bind_llm_usage_context",
+    "get_llm_usage_context",
+    "get_llm_usage_hook",
+    "record_llm_usage",
+    "reset_llm_usage_context",
+    "reset_llm_usage_hook",
+    "set_llm_usage_context",
+    "set_llm_usage_hook",
+]
@@ -0,0 +1,336 @@
+"""Durable on-disk spool for usage events that could not be delivered.
+
+`LLMUsageReporter(spool=UsageSpool(path))` appends events that fail to post
+with a retryable error (transport error, 429, 5xx) to the spool instead of
+dropping them, and a background replay worker
+resends them in large batches once the endpoint recovers. Every event keeps
+its deterministic `event_id`, so a resend of something the server already
+accepted is deduplicated server-side.
+
+Layout: a directory of append-only JSON Lines segments
+(`seg-000000000001.jsonl`, ...). New events go to the active (highest)
+segment; it is sealed once it reaches `segment_max_bytes`. Replay progress
+within a segment is stored as a byte offset in a `.ack` sidecar, and fully
+acknowledged segments are deleted. When the spool exceeds `max_total_bytes`
+the oldest segments are discarded (counted in `dropped_events`) so disk use
+stays bounded. A replay that stops part-way compacts the spool, dropping
+acknowledged prefixes and duplicate event_ids.
+
+Writes are flushed to the OS immediately but fsync'd in batches: at most
+once per `fsync_interval_s` (0 syncs every append), and always on sync() and
+close().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple, Union
+
+from .segments import list_segments, segment_path
+
+SEGMENT_PREFIX = "seg-"
+ACK_SUFFIX = ".ack"
+
+EventLike = Union[bytes, Dict[str, object]]
+
+
+def _encode(event: EventLike) -> bytes:
+    if isinstance(event, (bytes, bytearray)):
+        data = bytes(event)
+    else:
+        data = json.dumps(event, separators=(",", ":")).encode("utf-8")
+    if b"\n" in data:
+        raise ValueError("spooled events must serialize to a single line")
+    return data
+
+
+class UsageSpool:
+    """Append-only, segment-rotated event spool with acknowledged replay."""
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        *,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        max_total_bytes: int = 256 * 1024 * 1024,
+        fsync_interval_s: float = 1.0,
+    ) -> None:
+        """Open (or create) a spool directory.
+
+        Args:
+            directory: Directory holding the segment files. Created if missing.
+            segment_max_bytes: Size at which the active segment is sealed.
+            max_total_bytes: Disk budget; the oldest segments are discarded
+                beyond it.
+            fsync_interval_s: Minimum seconds between fsyncs of the active
+                segment (0 syncs on every append).
+        """
+        if int(segment_max_bytes) <= 0:
+            raise ValueError("segment_max_bytes must be > 0")
+        if int(max_total_bytes) < int(segment_max_bytes):
+            raise ValueError("max_total_bytes must be >= segment_max_bytes")
+        self.directory = os.fspath(directory)
+        self.segment_max_bytes = int(segment_max_bytes)
+        self.max_total_bytes = int(max_total_bytes)
+        self.fsync_interval_s = max(0.0, float(fsync_interval_s))
+        self.dropped_events = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._fh: Optional[IO[bytes]] = None
+        self._active_seq = 0
+        self._active_size = 0
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        # Segments a replay is working through; compact() and other replays skip them.
+        self._replaying: set = set()
+        # Unacknowledged bytes per segment, kept current so append() does no directory scans.
+        self._sizes: Dict[int, int] = {}
+        self._total_bytes = 0
+        seqs = self._segments()
+        for seq in seqs:
+            self._set_size(seq, os.path.getsize(self._path(seq)) - self._read_ack(seq))
+        self._next_seq = (seqs[-1] + 1) if seqs else 1
+
+    # ---- paths -------------------------------------------------------------
+
+    def _path(self, seq: int) -> str:
+        return segment_path(self.directory, SEGMENT_PREFIX, seq)
+
+    def _segments(self) -> List[int]:
+        return list_segments(self.directory, SEGMENT_PREFIX)
+
+    def _read_ack(self, seq: int) -> int:
+        try:
+            with open(self._path(seq) + ACK_SUFFIX, "r", encoding="utf-8") as fh:
+                return int(fh.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def _write_ack(self, seq: int, offset: int) -> None:
+        path = self._path(seq) + ACK_SUFFIX
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(str(int(offset)))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    def _set_size(self, seq: int, size: int) -> None:
+        self._total_bytes += size - self._sizes.get(seq, 0)
+        self._sizes[seq] = size
+
+    def _remove(self, seq: int) -> None:
+        self._total_bytes -= self._sizes.pop(seq, 0)
+        for path in (self._path(seq), self._path(seq) + ACK_SUFFIX):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # ---- writing -----------------------------------------------------------
+
+    def append(self, events: Iterable[EventLike]) -> int:
+        """Append events (dicts or pre-serialized JSON bytes); returns the count."""
+        lines = [_encode(e) for e in events]
+        if not lines:
+            return 0
+        with self._lock:
+            for data in lines:
+                if self._fh is None or self._active_size + len(data) + 1 > self.segment_max_bytes:
+                    self._rotate()
+                assert self._fh is not None
+                self._fh.write(data + b"\n")
+                self._active_size += len(data) + 1
+                self._set_size(self._active_seq, self._sizes.get(self._active_seq, 0) + len(data) + 1)
+            self._fh.flush()
+            self._dirty = True
+            if time.monotonic() - self._last_sync >= self.fsync_interval_s:
+                self._sync_locked()
+            self._enforce_budget()
+        return len(lines)
+
+    def sync(self) -> None:
+        """fsync the active segment."""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._fh is not None and self._dirty:
+            os.fsync(self._fh.fileno())
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def _rotate(self) -> None:
+        """Seal the active segment (if any) and open a fresh one."""
+        if self._fh is not None:
+            self._sync_locked()
+            self._fh.close()
+            self._fh = None
+            if self._active_size == 0:
+                self._remove(self._active_seq)
+        self._active_seq = self._next_seq
+        self._next_seq += 1
+        self._fh = open(self._path(self._active_seq), "ab")
+        self._active_size = 0
+        self._set_size(self._active_seq, 0)
+
+    def _seal(self) -> None:
+        if self._fh is not None and self._active_size:
+            self._sync_locked()
+            self._fh.close()
+            self._fh = None
+
+    def _enforce_budget(self) -> None:
+        if self._total_bytes <= self.max_total_bytes:
+            return
+        for seq in sorted(self._sizes):
+            if self._total_bytes <= self.max_total_bytes or seq == self._active_seq:
+                break
+            self.dropped_events += len(self._read_lines(seq)[0])
+            self._remove(seq)
+
+    # ---- reading -----------------------------------------------------------
+
+    def _read_lines(self, seq: int) -> Tuple[List[Tuple[bytes, int]], int]:
+        """Unacknowledged (line, end_offset) pairs of a segment, plus the ack offset."""
+        start = self._read_ack(seq)
+        with open(self._path(seq), "rb") as fh:
+            fh.seek(start)
+            data = fh.read()
+        out: List[Tuple[bytes, int]] = []
+        pos = start
+        for raw in data.split(b"\n")[:-1]:  # a trailing partial line is a torn write
+            pos += len(raw) + 1
+            if raw.strip():
+                out.append((raw, pos))
+        return out, start
+
+    def pending(self) -> int:
+        """Number of spooled events not yet acknowledged."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+            return sum(len(self._read_lines(s)[0]) for s in self._segments())
+
+    def replay(
+        self,
+        send: Callable[[List[bytes]], bool],
+        *,
+        max_batch_events: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+    ) -> int:
+        """Resend spooled events oldest-first; returns how many were acknowledged.
+
+        `send` receives a batch of serialized events and returns True once the
+        batch needs no resending: the server accepted it, or permanently
+        rejected it (the caller accounts for those; returning False for them
+        would block the spool forever). Replay stops at the first batch `send`
+        returns False for, leaving the rest for the next call, and the spool is
+        then compacted. The active segment is sealed first so events appended
+        during a replay land in a new segment.
+        """
+        with self._lock:
+            self._seal()
+            seqs = [
+                s
+                for s in self._segments()
+                if (s != self._active_seq or self._fh is None) and s not in self._replaying
+            ]
+            self._replaying.update(seqs)
+        try:
+            sent, done = self._replay(seqs, send, max_batch_events, max_batch_bytes)
+        finally:
+            with self._lock:
+                self._replaying.difference_update(seqs)
+        if not done and sent:
+            self.compact()
+        return sent
+
+    def _replay(
+        self, seqs: List[int], send: Callable[[List[bytes]], bool], max_batch_events: int, max_batch_bytes: int
+    ) -> Tuple[int, bool]:
+        sent = 0
+        for seq in seqs:
+            with self._lock:
+                if not os.path.exists(self._path(seq)):
+                    continue
+                lines, acked = self._read_lines(seq)
+            i = 0
+            while i < len(lines):
+                batch: List[bytes] = []
+                size = 0
+                while i < len(lines) and len(batch) < max_batch_events:
+                    raw = lines[i][0]
+                    if batch and size + len(raw) > max_batch_bytes:
+                        break
+                    batch.append(raw)
+                    size += len(raw)
+                    i += 1
+                if not send(batch):
+                    return sent, False
+                sent += len(batch)
+                with self._lock:
+                    if os.path.exists(self._path(seq)):  # not dropped by the disk budget
+                        offset = lines[i - 1][1]
+                        self._write_ack(seq, offset)
+                        self._set_size(seq, self._sizes.get(seq, 0) - (offset - acked))
+                        acked = offset
+            with self._lock:
+                self._remove(seq)
+        return sent, True
+
+    def compact(self) -> None:
+        """Rewrite sealed segments without their acknowledged prefix or duplicate event_ids.
+
+        Segments a replay is working through are left alone.
+        """
+        with self._lock:
+            self._seal()
+            seen: set = set()
+            for seq in self._segments():
+                if (seq == self._active_seq and self._fh is not None) or seq in self._replaying:
+                    continue
+                lines, start = self._read_lines(seq)
+                keep: List[bytes] = []
+                for raw, _ in lines:
+                    try:
+                        event_id = json.loads(raw).get("event_id")
+                    except (ValueError, AttributeError):
+                        continue
+                    if event_id and event_id in seen:
+                        continue
+                    seen.add(event_id)
+                    keep.append(raw)
+                if not keep:
+                    self._remove(seq)
+                    continue
+                if start == 0 and len(keep) == len(lines):
+                    continue
+                tmp = self._path(seq) + ".tmp"
+                data = b"".join(raw + b"\n" for raw in keep)
+                with open(tmp, "wb") as fh:
+                    fh.write(data)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(tmp, self._path(seq))
+                self._set_size(seq, len(data))
+                try:
+                    os.remove(self._path(seq) + ACK_SUFFIX)
+                except FileNotFoundError:
+                    pass
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._sync_locked()
+                self._fh.close()
+                self._fh = None
+                if self._active_size == 0:
+                    self._remove(self._active_seq)
+
+
+__all__ = ["UsageSpool"]
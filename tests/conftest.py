@@ -0,0 +1,46 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+import httpx
+import pytest
+
+from omem.client import MemoryClient, RetryConfig
+
+
+@pytest.fixture
+def mock_client():
+    """Factory for MemoryClients talking to an in-process backend instead of the network.
+
+    `mock_client(backend, retries=None, backoff_s=0.001, **kwargs)`: `backend`
+    is a MockTransport handler, a transport, or a ready httpx.Client (e.g.
+    FakeOmemService.http_client()). With `retries`, requests are retried that
+    many times with a tiny backoff and no jitter. Other keyword arguments go
+    to MemoryClient (base_url, api_token, hooks, ...). Clients are closed at
+    teardown.
+    """
+    clients: List[MemoryClient] = []
+
+    def make(backend: Any, *, retries: Optional[int] = None, backoff_s: float = 0.001, **kwargs: Any) -> MemoryClient:
+        if isinstance(backend, httpx.Client):
+            http = backend
+        elif isinstance(backend, httpx.BaseTransport):
+            http = httpx.Client(transport=backend)
+        else:
+            http = httpx.Client(transport=httpx.MockTransport(backend))
+        kwargs.setdefault("base_url", "http://omem.test")
+        kwargs.setdefault("tenant_id", "__from_api_key__")
+        kwargs.setdefault("api_token", "qbk_test")
+        if retries is not None:
+            kwargs.setdefault(
+                "retry_config", RetryConfig(max_retries=retries, base_backoff_seconds=backoff_s, jitter=False)
+            )
+        client = MemoryClient(http=http, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
@@ -0,0 +1,148 @@
+"""Tests for content-addressed attachment uploads."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from omem.attachments import AttachmentUploader, hash_file
+from omem.client import OmemClientError
+from omem.memory import Conversation
+from omem.types import CanonicalAttachmentV1
+
+
+class _AttachmentStore:
+    """MockTransport handler storing attachments by sha256."""
+
+    def __init__(self) -> None:
+        self.blobs: Dict[str, bytes] = {}
+        self.puts = 0
+        self.ingests: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.startswith("/attachments/"):
+            digest = path.rsplit("/", 1)[1]
+            if request.method == "GET":
+                if digest not in self.blobs:
+                    return httpx.Response(404, json={"error": "not_found"})
+                return httpx.Response(200, json={"ref": f"blob://{digest}"})
+            body = request.read()
+            assert hashlib.sha256(body).hexdigest() == digest
+            with self.lock:
+                self.puts += 1
+                self.blobs[digest] = body
+            return httpx.Response(201, json={"ref": f"blob://{digest}"})
+        if path == "/ingest":
+            self.ingests.append(json.loads(request.content))
+            return httpx.Response(200, json={"job_id": "job-1"})
+        return httpx.Response(404, json={"error": "not_found"})
+
+
+class TestHashFile:
+    def test_matches_hashlib_across_chunk_boundaries(self, tmp_path):
+        data = bytes(range(256)) * 1000 + b"tail"
+        path = tmp_path / "blob.bin"
+        path.write_bytes(data)
+
+        assert hash_file(path, chunk_size=4096) == (hashlib.sha256(data).hexdigest(), len(data))
+        assert hash_file(path, max_bytes=10) == (hashlib.sha256(data[:10]).hexdigest(), 10)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty"
+        path.write_bytes(b"")
+        assert hash_file(path) == (hashlib.sha256(b"").hexdigest(), 0)
+
+
+class TestAttachmentUploader:
+    def test_uploads_once_per_digest(self, tmp_path, mock_client):
+        """Identical content is uploaded once; later calls hit the dedup cache."""
+        store = _AttachmentStore()
+        uploader = AttachmentUploader(mock_client(store), chunk_size=1024)
+        a = tmp_path / "a.png"
+        b = tmp_path / "b.png"
+        a.write_bytes(b"x" * 5000)
+        b.write_bytes(b"x" * 5000)
+
+        att = uploader.upload(a)
+        again = uploader.upload_many([b, b"x" * 5000, a])
+
+        assert store.puts == 1
+        assert att.type == "image" and att.name == "a.png"
+        assert att.sha256 == hashlib.sha256(b"x" * 5000).hexdigest()
+        assert att.ref == f"blob://{att.sha256}"
+        assert {x.sha256 for x in again} == {att.sha256}
+        assert uploader.dedup_hits == 3
+
+    def test_existing_digest_is_not_reuploaded(self, mock_client):
+        """A digest the service already stores is resolved without a PUT."""
+        store = _AttachmentStore()
+        store.blobs[hashlib.sha256(b"known").hexdigest()] = b"known"
+
+        att = AttachmentUploader(mock_client(store)).upload(b"known", type="file", name="k.txt")
+
+        assert store.puts == 0
+        assert att.ref.startswith("blob://")
+
+    def test_concurrent_identical_uploads_share_one_request(self, mock_client):
+        store = _AttachmentStore()
+        uploader = AttachmentUploader(mock_client(store), max_concurrency=8)
+
+        results = uploader.upload_many([b"same bytes"] * 16)
+
+        assert store.puts == 1
+        assert len({r.ref for r in results}) == 1
+
+    def test_truncates_to_max_bytes(self, tmp_path, mock_client):
+        store = _AttachmentStore()
+        path = tmp_path / "big.txt"
+        path.write_bytes(b"0123456789")
+
+        att = AttachmentUploader(mock_client(store), max_bytes=4).upload(path)
+
+        assert att.truncated is True
+        assert store.blobs[att.sha256] == b"0123"
+
+    def test_upload_without_ref_raises(self, mock_client):
+        """A PUT response that omits the ref is an error, not a synthesized ref."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                return httpx.Response(404, json={"error": "not_found"})
+            return httpx.Response(201, json={})
+
+        with pytest.raises(OmemClientError, match="missing_ref"):
+            AttachmentUploader(mock_client(handler)).upload(b"orphan")
+
+
+class TestConversationAttachments:
+    def test_commit_fills_attachment_refs_on_turns(self, tmp_path, mock_client):
+        """Conversation.commit() uploads pending attachments and sends refs."""
+        store = _AttachmentStore()
+        doc = tmp_path / "report.pdf"
+        doc.write_bytes(b"%PDF-1.7 ...")
+        conv = Conversation(mock_client(store), "conv-1", sync_cursor=False)
+        conv.add({"role": "user", "content": "see attached", "attachments": [str(doc)]})
+        conv.add(
+            {
+                "role": "user",
+                "content": "and this",
+                "attachments": [CanonicalAttachmentV1(type="link", ref="https://x"), {"data": b"raw", "name": "n"}],
+            }
+        )
+
+        conv.commit()
+
+        turns = store.ingests[0]["turns"]
+        first = turns[0]["attachments"][0]
+        assert first["sha256"] == hashlib.sha256(b"%PDF-1.7 ...").hexdigest()
+        assert first["ref"] == f"blob://{first['sha256']}"
+        assert first["name"] == "report.pdf" and first["truncated"] is False
+        assert [a["type"] for a in turns[1]["attachments"]] == ["link", "file"]
+        assert store.puts == 2
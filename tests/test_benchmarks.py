@@ -0,0 +1,49 @@
+"""Smoke tests for the benchmark harness."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run import compare, main, run_benchmarks  # noqa: E402
+
+
+class TestBenchmarks:
+    def test_quick_run_reports_time_and_memory(self):
+        report = run_benchmarks(pattern="per_turn", quick=True)
+        assert report["results"]["memory_per_turn"]["unit"] == "bytes/obj"
+        report = run_benchmarks(pattern="parse_datetime", quick=True)
+        r = report["results"]["parse_datetime"]
+        assert r["unit"] == "ns/op" and r["value"] > 0 and r["samples"] == 3
+
+    def test_compare_flags_regressions_with_per_entry_threshold(self):
+        report = {"results": {"a": {"unit": "ns/op", "value": 130.0}, "b": {"unit": "ns/op", "value": 130.0}}}
+        baseline = {"results": {"a": {"value": 100.0}, "b": {"value": 100.0, "max_regression": 0.5}}}
+        rows = {r["name"]: r for r in compare(report, baseline, 0.25)}
+        assert rows["a"]["regressed"] and not rows["b"]["regressed"]
+
+    def test_compare_refuses_baseline_from_another_host(self, tmp_path):
+        report = run_benchmarks(pattern="parse_datetime", quick=True)
+        baseline = json.loads(json.dumps(report))
+        assert compare(report, baseline, 0.25)
+        baseline["meta"]["host"]["cpu_count"] = (report["meta"]["host"]["cpu_count"] or 0) + 64
+        with pytest.raises(ValueError, match="cpu_count"):
+            compare(report, baseline, 0.25)
+        del baseline["meta"]["host"]
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps(baseline))
+        assert main(["-k", "parse_datetime", "--quick", "--baseline", str(path)]) == 2
+
+    def test_cli_exit_code_against_baseline(self, tmp_path):
+        out = tmp_path / "out.json"
+        assert main(["-k", "parse_datetime", "--quick", "--output", str(out)]) == 0
+        report = json.loads(out.read_text())
+        report["results"]["parse_datetime"]["value"] /= 10  # pretend we used to be 10x faster
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report))
+        assert main(["-k", "parse_datetime", "--quick", "--baseline", str(baseline)]) == 1
@@ -0,0 +1,75 @@
+"""Tests for cassette recording and replay."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import httpx
+import pytest
+
+from omem.cassette import CassetteMiss, RecordingTransport, ReplayTransport, load_cassette
+from omem.client import OmemClientError, OmemServerError
+
+
+@pytest.fixture
+def client_for(mock_client):
+    """One retry, and a token the cassette must scrub."""
+    return lambda transport: mock_client(transport, retries=1, api_token="qbk_secret")
+
+
+def _backend(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/retrieval":
+        q = json.loads(request.content)["query"]
+        return httpx.Response(200, json={"strategy": "dialog_v2", "evidence_details": [{"text": f"hit {q}"}]})
+    if request.url.path == "/ingest/jobs/j1":
+        return httpx.Response(503, json={"error": "busy"})
+    return httpx.Response(404, json={"error": "not_found"})
+
+
+class TestCassette:
+    @pytest.mark.parametrize("name", ["c.jsonl", "c.jsonl.gz"])
+    def test_record_then_replay_through_client(self, tmp_path, name, client_for):
+        """Replayed responses go through the real parsing and error paths."""
+        path = tmp_path / name
+        rec = RecordingTransport(path, transport=httpx.MockTransport(_backend))
+        client = client_for(rec)
+        live = client.retrieve_dialog_v2(query="west lake")
+        with pytest.raises(OmemServerError):
+            client.get_job("j1")
+        rec.close()
+
+        interactions = load_cassette(path)
+        assert len(interactions) == 3  # retrieval + job (one retry)
+        assert all(dict(it["request"]["headers"])["x-api-key"] == "<scrubbed>" for it in interactions)
+        assert "qbk_secret" not in json.dumps(interactions)
+
+        replay = ReplayTransport(path)
+        client = client_for(replay)
+        assert client.retrieve_dialog_v2(query="west lake") == live
+        with pytest.raises(OmemServerError):
+            client.get_job("j1")
+        assert replay.remaining == 0
+
+    def test_miss_and_body_matching(self, tmp_path, client_for):
+        path = tmp_path / "c.jsonl"
+        rec = RecordingTransport(path, transport=httpx.MockTransport(_backend))
+        client_for(rec).retrieve_dialog_v2(query="a")
+        rec.close()
+
+        client = client_for(ReplayTransport(path, match_body=True))
+        with pytest.raises(OmemClientError) as ei:
+            client.retrieve_dialog_v2(query="b")
+        assert isinstance(ei.value.__cause__, CassetteMiss)
+        assert client.retrieve_dialog_v2(query="a")["evidence_details"][0]["text"] == "hit a"
+
+    def test_latency_simulation(self, client_for):
+        interaction = {
+            "request": {"method": "GET", "url": "/ingest/jobs/j1", "headers": []},
+            "response": {"status": 200, "headers": [["content-type", "application/json"]], "body": '{"job_id":"j1"}'},
+            "duration_ms": 40.0,
+        }
+        client = client_for(ReplayTransport([interaction], simulate_latency=True, latency_scale=0.5))
+        t0 = time.perf_counter()
+        client.get_job("j1")
+        assert time.perf_counter() - t0 >= 0.018
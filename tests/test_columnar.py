@@ -0,0 +1,108 @@
+"""Tests for columnar export (omem.columnar, SearchResult/GraphItems.to_numpy/to_arrow)."""
+
+from __future__ import annotations
+
+import importlib.util
+import math
+
+import httpx
+import pytest
+
+from omem.columnar import _collect, _dictionary_encode, to_arrow, to_numpy
+from omem.models import MemoryItem, SearchResult
+from omem.pagination import GraphItems
+
+EVENTS = [
+    {"id": "ev-1", "summary": "West Lake trip", "t_abs_start": "2026-01-14T10:00:00+08:00", "involves": ["Caroline", "Dana"]},
+    {"id": "ev-2", "summary": "Budget review", "t_abs_start": "not a date", "involves": ["Dana"]},
+    {"id": "ev-3", "summary": "Tea", "timestamp": "1970-01-01T00:00:01Z"},
+]
+
+
+def _result() -> SearchResult:
+    return SearchResult(
+        query="q",
+        items=[
+            MemoryItem(text="a", score=0.9, timestamp="2026-01-14T02:00:00Z", source="tkg", entities=["Caroline"]),
+            MemoryItem(text="b", score=0.5, entities=["Dana", "Caroline"], event_id="ev-2"),
+        ],
+    )
+
+
+@pytest.fixture
+def events_client(mock_client):
+    return mock_client(lambda request: httpx.Response(200, json={"items": EVENTS}))
+
+
+class TestCollect:
+    def test_graph_payload_columns(self):
+        """Timestamps become UTC epoch microseconds; bad or missing values become None."""
+        cols = _collect(EVENTS, "events")
+        assert cols["id"] == ["ev-1", "ev-2", "ev-3"]
+        assert cols["timestamp"] == [1768356000000000, None, 1000000]
+        assert cols["entities"] == [["Caroline", "Dana"], ["Dana"], []]
+
+    def test_search_items_use_raw_timestamps(self):
+        result = _result()
+        cols = _collect(result.items, "search")
+        assert cols["score"] == [0.9, 0.5] and cols["timestamp"] == [1768356000000000, None]
+        assert isinstance(result.items[0]._timestamp_raw, str)  # not parsed on the model
+
+    def test_dictionary_encoding_and_validation(self):
+        assert _dictionary_encode([["a", "b"], [], ["b"]]) == ([0, 1, 1], [0, 2, 2, 3], ["a", "b"])
+        with pytest.raises(ValueError, match="kind"):
+            _collect([], "nope")
+        with pytest.raises(ValueError, match="entities"):
+            to_numpy([], "events", entities="csv")
+
+    def test_graph_iterators_carry_their_kind(self, events_client):
+        items = events_client.iter_list_events(page_size=200)
+        assert isinstance(items, GraphItems) and items.kind == "events"
+        assert next(items)["id"] == "ev-1"
+        assert [e["id"] for e in items] == ["ev-2", "ev-3"]
+
+    def test_missing_optional_dependencies(self):
+        if importlib.util.find_spec("numpy") is None:
+            with pytest.raises(ImportError, match=r"omem\[numpy\]"):
+                _result().to_numpy()
+        if importlib.util.find_spec("pyarrow") is None:
+            with pytest.raises(ImportError, match=r"omem\[arrow\]"):
+                to_arrow(EVENTS, "events")
+
+
+class TestNumpy:
+    def test_search_result_to_numpy(self):
+        np = pytest.importorskip("numpy")
+        cols = _result().to_numpy()
+        assert cols["score"].dtype == np.float64 and cols["score"].tolist() == [0.9, 0.5]
+        assert cols["timestamp"].dtype == np.dtype("datetime64[us]")
+        assert str(cols["timestamp"][0]) == "2026-01-14T02:00:00.000000" and np.isnat(cols["timestamp"][1])
+        assert cols["entities"].tolist() == [["Caroline"], ["Dana", "Caroline"]]
+
+    def test_graph_items_to_numpy_dictionary(self, events_client):
+        np = pytest.importorskip("numpy")
+        cols = events_client.iter_list_events().to_numpy(entities="dictionary")
+        assert cols["entities_dictionary"].tolist() == ["Caroline", "Dana"]
+        assert cols["entities"].tolist() == [0, 1, 1] and cols["entities_offsets"].tolist() == [0, 2, 3, 3]
+        assert np.isnat(cols["timestamp"][1])
+
+    def test_evidence_confidence_missing_is_nan(self):
+        pytest.importorskip("numpy")
+        cols = to_numpy([{"id": "e1", "confidence": 0.9}, {"id": "e2"}], "evidences")
+        assert cols["confidence"][0] == 0.9 and math.isnan(cols["confidence"][1])
+
+
+class TestArrow:
+    def test_search_result_to_arrow(self):
+        pa = pytest.importorskip("pyarrow")
+        table = _result().to_arrow()
+        assert table.schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+        assert table.schema.field("entities").type == pa.list_(pa.string())
+        assert table.column("score").to_pylist() == [0.9, 0.5]
+
+    def test_graph_items_to_arrow_dictionary(self, events_client):
+        pa = pytest.importorskip("pyarrow")
+        table = events_client.iter_list_events().to_arrow(entities="dictionary")
+        assert table.schema.field("entities").type == pa.list_(pa.dictionary(pa.int32(), pa.string()))
+        assert table.column("entities").to_pylist() == [["Caroline", "Dana"], ["Dana"], []]
+        assert table.column("timestamp").null_count == 1
@@ -0,0 +1,103 @@
+"""Tests for connection pooling options, warm-up and keep-alive."""
+
+from __future__ import annotations
+
+import importlib.util
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from omem import Memory
+from omem.client import MemoryClient
+from omem.fake_service import FakeOmemService
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    requests = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with _Handler.lock:
+            _Handler.connections += 1
+
+    def do_GET(self) -> None:  # noqa: N802
+        with _Handler.lock:
+            _Handler.requests += 1
+        time.sleep(0.02)  # keep concurrent warm-up requests overlapping
+        body = b'{"ok":true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = _Handler.requests = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestConnectionManagement:
+    def test_warmup_opens_pooled_connections_that_are_reused(self, server):
+        """Requests after warmup() reuse the warm connections instead of dialing."""
+        client = MemoryClient(base_url=server, tenant_id="__from_api_key__", api_token="qbk_x", max_keepalive_connections=4)
+        assert client.warmup(connections=3) == 3
+        assert _Handler.connections == 3
+        client.debug_config()
+        client.debug_config()
+        assert _Handler.connections == 3
+        client.close()
+
+    def test_limits_are_applied(self):
+        client = MemoryClient(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            max_connections=7,
+            max_keepalive_connections=50,
+            keepalive_expiry_s=90,
+        )
+        pool = client._http._transport._pool
+        assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (7, 7, 90)
+        with pytest.raises(ValueError):
+            MemoryClient(base_url="http://omem.test", tenant_id="t1", max_connections=0)
+
+    @pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+    def test_http2_without_h2_fails_fast(self):
+        with pytest.raises(ImportError, match="h2"):
+            MemoryClient(base_url="http://omem.test", tenant_id="t1", http2=True)
+
+    def test_keepalive_pings_only_while_idle(self, server):
+        client = MemoryClient(base_url=server, tenant_id="t1")
+        client.start_keepalive(0.05)
+        time.sleep(0.2)
+        idle_pings = _Handler.requests
+        assert idle_pings >= 2
+        assert _Handler.connections == 1
+        client.stop_keepalive()
+        time.sleep(0.1)
+        assert _Handler.requests <= idle_pings + 1
+        client.close()
+
+    def test_memory_warm_on_init(self):
+        fake = FakeOmemService()
+        mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client(), warm_on_init=True)
+        for _ in range(100):
+            if fake.requests["/debug/config"]:
+                break
+            time.sleep(0.01)
+        assert fake.requests["/debug/config"] == 1
+        assert mem.warmup(connections=2) == 2
+        mem.close()
@@ -0,0 +1,144 @@
+"""Tests for the streaming tenant exporter."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pytest
+
+from omem.client import OmemValidationError
+from omem.exporter import export_tenant
+from omem.fake_service import FakeOmemService
+from omem.types import CanonicalTurnV1
+
+N_TIMESLICES = 7
+
+
+def _graph_handler(fail_on: Optional[str] = None):
+    timeslices = [{"id": f"ts-{i}", "kind": "dialog_session"} for i in range(N_TIMESLICES)]
+    events = {
+        ts["id"]: [
+            {"id": f"{ts['id']}-ev-{j}", "summary": f"event {j}", "entity_ids": [f"ent-{(i + j) % 3}"]}
+            for j in range(3)
+        ]
+        for i, ts in enumerate(timeslices)
+    }
+
+    def page(items: List[Dict[str, Any]], request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params.get("offset", 0))
+        return httpx.Response(200, json={"items": items[offset : offset + limit]})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if fail_on and fail_on in path:
+            return httpx.Response(400, json={"error": "boom"})
+        if path.endswith("/timeslices/range"):
+            return page(timeslices, request)
+        if path.startswith("/graph/v0/timeslices/"):
+            return page(events[path.split("/")[4]], request)
+        if path.endswith("/evidences"):
+            eid = path.split("/")[4]
+            return page([{"id": f"{eid}-evd-{k}", "text": "fact"} for k in range(2)], request)
+        if path.endswith("/timeline"):
+            eid = path.split("/")[4]
+            return page(
+                [
+                    {"utterance_id": f"{eid}-u", "kind": "utterance", "raw_text": "hi"},
+                    {"evidence_id": f"{eid}-evd-0", "kind": "evidence"},
+                ],
+                request,
+            )
+        return httpx.Response(404, json={"error": "not_found"})
+
+    return handler
+
+
+def _read(path) -> List[Dict[str, Any]]:
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestExporter:
+    """Test export_tenant()."""
+
+    def test_exports_all_record_types(self, tmp_path, mock_client):
+        """Timeslices, events, entities, evidences and utterances are exported."""
+        out = tmp_path / "export.jsonl"
+        stats = export_tenant(
+            mock_client(_graph_handler()), str(out), start="2026-01-01", end="2026-02-01", page_size=2
+        )
+
+        records = _read(out)
+        types = [r["type"] for r in records]
+        assert types.count("timeslice") == N_TIMESLICES
+        assert types.count("event") == N_TIMESLICES * 3
+        assert types.count("entity") == 3
+        assert types.count("evidence") == 6
+        assert types.count("utterance") == 3
+        assert stats.completed and stats.events == N_TIMESLICES * 3
+        # Written in walk order regardless of fetch concurrency.
+        ts_ids = [r["data"]["id"] for r in records if r["type"] == "timeslice"]
+        assert ts_ids == [f"ts-{i}" for i in range(N_TIMESLICES)]
+
+    def test_gzip_resume_after_interruption(self, tmp_path, mock_client):
+        """A failed run resumes from its checkpoint and matches a clean export."""
+        clean = tmp_path / "clean.jsonl.gz"
+        export_tenant(mock_client(_graph_handler()), str(clean), start="a", end="b", page_size=2)
+
+        out = tmp_path / "export.jsonl.gz"
+        ckpt = tmp_path / "export.ckpt"
+        with pytest.raises(OmemValidationError):
+            export_tenant(
+                mock_client(_graph_handler(fail_on="/ent-2/")),
+                str(out),
+                start="a",
+                end="b",
+                page_size=2,
+                checkpoint_path=str(ckpt),
+                checkpoint_every=1,
+                concurrency=1,
+            )
+        state = json.loads(ckpt.read_text())
+        assert state["phase"] == "entities"
+
+        stats = export_tenant(
+            mock_client(_graph_handler()), str(out), start="a", end="b", page_size=2, checkpoint_path=str(ckpt)
+        )
+
+        assert stats.resumed and stats.completed
+        assert _read(out) == _read(clean)
+        assert json.loads(ckpt.read_text())["phase"] == "done"
+
+    def test_checkpoint_mismatch_is_rejected(self, tmp_path, mock_client):
+        """A checkpoint from a different export is not silently reused."""
+        out = tmp_path / "export.jsonl"
+        ckpt = tmp_path / "export.ckpt"
+        export_tenant(mock_client(_graph_handler()), str(out), start="a", end="b", checkpoint_path=str(ckpt))
+
+        with pytest.raises(ValueError, match="different export"):
+            export_tenant(mock_client(_graph_handler()), str(out), start="a", end="c", checkpoint_path=str(ckpt))
+
+    def test_fake_service_resolves_entity_names(self, tmp_path, mock_client):
+        """Events carrying only `involves` names are resolved; a vanished entity (404) is skipped."""
+        fake = FakeOmemService()
+        client = mock_client(fake.http_client(), base_url="http://omem.fake", api_token="qbk_fake")
+        texts = ["Caroline visited West Lake", "Dana met Caroline for tea", "Dana booked a trip"]
+        turns = [CanonicalTurnV1(turn_id=f"t{i}", role="user", text=t) for i, t in enumerate(texts, 1)]
+        client.ingest_dialog_v1(session_id="s1", turns=turns)
+
+        out = tmp_path / "export.jsonl"
+        stats = export_tenant(
+            client, str(out), start="2000-01-01", end="2100-01-01", entity_ids=["ent-gone"], page_size=2
+        )
+
+        records = _read(out)
+        assert all("entity_ids" not in r["data"] for r in records if r["type"] == "event")
+        entities = [r["data"]["id"] for r in records if r["type"] == "entity"]
+        assert sorted(entities) == ["ent-caroline", "ent-dana", "ent-lake", "ent-west"]
+        assert stats.completed and stats.missing_entities == 1
+        assert stats.evidences == stats.utterances == 6
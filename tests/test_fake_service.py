@@ -0,0 +1,107 @@
+"""Tests for the in-process fake omem service."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from omem import Memory
+from omem.client import (
+    MemoryClient,
+    OmemPayloadTooLargeError,
+    OmemRateLimitError,
+    OmemServerError,
+)
+from omem.fake_service import FakeOmemService, FakeServiceConfig, fixed_latency
+from omem.types import CanonicalTurnV1
+
+
+@pytest.fixture
+def fake_client(mock_client):
+    def make(fake: FakeOmemService, retries: int = 2) -> MemoryClient:
+        return mock_client(fake.http_client(), retries=retries, base_url="http://omem.fake", api_token="qbk_fake")
+
+    return make
+
+
+def _turns(*texts: str):
+    return [CanonicalTurnV1(turn_id=f"t{i:04d}", role="user", text=t) for i, t in enumerate(texts, 1)]
+
+
+class TestFakeService:
+    def test_memory_add_search_and_explain(self):
+        """The high-level API works end to end against the fake."""
+        fake = FakeOmemService()
+        mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client())
+        mem.add(
+            "conv-1",
+            [
+                {"role": "user", "content": "Caroline is planning a trip to West Lake"},
+                {"role": "assistant", "content": "Sounds lovely, when do you leave?"},
+            ],
+            wait=True,
+        )
+
+        result = mem.search("West Lake trip", enrich="context")
+        assert result.items[0].text == "Caroline is planning a trip to West Lake"
+        assert result.items[0].context.entities[0] == "Caroline (entity)"
+        assert result.timings.server_total_ms is not None
+        assert mem.resolve_entity("caroline").name == "Caroline"
+        assert fake.requests["/ingest"] == 1
+
+    def test_cursor_pagination_and_idempotent_commits(self, fake_client):
+        fake = FakeOmemService()
+        client = fake_client(fake)
+        turns = _turns(*[f"Alice note {i}" for i in range(5)])
+        client.ingest_dialog_v1(session_id="s1", turns=turns, commit_id="c1")
+        client.ingest_dialog_v1(session_id="s1", turns=turns, commit_id="c1")
+        # Turns at or before the committed cursor are not indexed again.
+        client.ingest_dialog_v1(session_id="s1", turns=turns, commit_id="c2", base_turn_id="t0005")
+
+        page = client.graph_list_events(limit=2)
+        assert len(page["items"]) == 2 and page["has_more"] and page["next_cursor"]
+        events = list(client.iter_list_events(page_size=2))
+        assert [e["summary"] for e in events] == [f"Alice note {i}" for i in range(5)]
+        assert len(list(client.iter_entity_evidences("ent-alice", page_size=3))) == 5
+        assert client.get_session("s1").cursor_committed == "t0005"
+
+    def test_job_delay_hides_turns_until_completed(self, fake_client):
+        fake = FakeOmemService(FakeServiceConfig(job_delay_s=60))
+        client = fake_client(fake)
+        handle = client.ingest_dialog_v1(session_id="s1", turns=_turns("Bob likes tea"))
+        assert client.get_job(handle.job_id).status == "PENDING"
+        assert client.retrieve_dialog_v2(query="tea")["evidence_details"] == []
+
+    def test_faults_rate_limits_and_payload_limits(self, fake_client):
+        flaky = fake_client(FakeOmemService(FakeServiceConfig(error_rate=1.0, fault_routes=["/retrieval"])), retries=1)
+        with pytest.raises(OmemServerError):
+            flaky.retrieve_dialog_v2(query="x")
+        # Other routes are unaffected.
+        flaky.ingest_dialog_v1(session_id="s1", turns=_turns("ok"))
+
+        fake = FakeOmemService(FakeServiceConfig(rate_limit_rps=0.001, rate_limit_burst=1, retry_after_s=0))
+        limited = fake_client(fake, retries=1)
+        limited.retrieve_dialog_v2(query="x")
+        with pytest.raises(OmemRateLimitError) as ei:
+            limited.retrieve_dialog_v2(query="x")
+        assert ei.value.retry_after_s == 0
+        assert fake.faults["429"] == 2
+
+        small = fake_client(FakeOmemService(FakeServiceConfig(max_turns_per_ingest=2)))
+        with pytest.raises(OmemPayloadTooLargeError):
+            small.ingest_dialog_v1(session_id="s1", turns=_turns("a", "b", "c"))
+
+    def test_async_transport_with_latency(self):
+        fake = FakeOmemService(FakeServiceConfig(latency=fixed_latency(20)))
+
+        async def run() -> list:
+            async with fake.async_http_client(base_url="http://omem.fake") as http:
+                return await asyncio.gather(*(http.get("/debug/config") for _ in range(5)))
+
+        t0 = time.perf_counter()
+        responses = asyncio.run(run())
+        assert all(r.status_code == 200 for r in responses)
+        # Concurrent requests overlap their simulated latency.
+        assert time.perf_counter() - t0 < 0.09
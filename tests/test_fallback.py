@@ -0,0 +1,154 @@
+"""Tests for the local fallback store and circuit breaker."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from omem import Memory
+from omem.client import OmemHttpError
+from omem.fake_service import FakeOmemService, FakeServiceConfig, fixed_latency
+from omem.fallback import CircuitBreaker, LocalFallbackStore
+from omem.metrics import CIRCUIT_STATE, MetricsRegistry
+from omem.models import MemoryItem
+
+
+class TestCircuitBreaker:
+    def test_opens_probes_and_closes(self):
+        metrics = MetricsRegistry()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=0.05, metrics=metrics)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+        assert metrics.snapshot().gauge(CIRCUIT_STATE, {"circuit": "search"}) == 2
+
+        time.sleep(0.06)
+        assert breaker.allow() and not breaker.allow()  # a single half-open probe
+        breaker.record_failure()
+        assert breaker.state == "open"
+        time.sleep(0.06)
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+        assert metrics.snapshot().gauge(CIRCUIT_STATE, {"circuit": "search"}) == 0
+
+
+class TestLocalFallbackStore:
+    def test_persists_evicts_and_compacts(self, tmp_path):
+        store = LocalFallbackStore(tmp_path, max_items=3, segment_max_records=2)
+        for i in range(4):
+            store.add(f"note {i} about the quarterly budget", session_id="s1")
+        store.add_items([MemoryItem(text="Caroline visited West Lake", event_id="ev-1", source="tkg")])
+        store.add_items([MemoryItem(text="ignored", source="local")])
+        assert len(store) == 3
+        assert [it.event_id for it in store.search("west lake")] == ["ev-1"]
+        assert store.search("budget", session_id="s1")[0].source == "local"
+        store.close()
+        assert len(list(tmp_path.glob("fb-*.jsonl"))) <= 3
+
+        reopened = LocalFallbackStore(tmp_path, max_items=3)
+        assert len(reopened) == 3
+        assert sorted(it.text for it in reopened.search("budget")) == [
+            "note 2 about the quarterly budget",
+            "note 3 about the quarterly budget",
+        ]
+
+    def test_non_latin_text_is_searchable(self, tmp_path):
+        store = LocalFallbackStore(tmp_path)
+        store.add("Анна поехала в Москву")
+        store.add_items([MemoryItem(text="Ελένη ταξιδεύει στην Αθήνα", event_id="ev-2", source="tkg")])
+        assert [it.text for it in store.search("Москву")] == ["Анна поехала в Москву"]
+        assert [it.event_id for it in store.search("Αθήνα")] == ["ev-2"]
+
+    def test_add_items_writes_once_per_call(self, tmp_path):
+        store = LocalFallbackStore(tmp_path)
+        store.add("warm up")  # opens the segment
+        flushes = []
+        flush = store._fh.flush
+        store._fh.flush = lambda: (flushes.append(1), flush())[1]
+        store.add_items([MemoryItem(text=f"note {i}", source="tkg") for i in range(20)])
+        assert len(flushes) == 1 and len(store) == 21
+
+    def test_rejects_bad_limits(self):
+        with pytest.raises(ValueError):
+            LocalFallbackStore(max_items=0)
+
+
+def _memory(fake: FakeOmemService, **kw) -> Memory:
+    return Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client(), **kw)
+
+
+class TestMemoryFallback:
+    def test_circuit_open_serves_local_results(self):
+        """After repeated failures search() answers from the local store without calling the server."""
+        fake = FakeOmemService()
+        store = LocalFallbackStore()
+        mem = _memory(fake, fallback=store, circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout_s=60))
+        mem.add("conv-1", [{"role": "user", "content": "Caroline is planning a trip to West Lake"}], wait=True)
+        assert mem.search("West Lake").items[0].source != "local"
+
+        fake.config = FakeServiceConfig(error_rate=1.0, fault_routes=["/retrieval"])
+        mem._client._retry = type(mem._client._retry)(max_retries=0)
+        for _ in range(2):
+            result = mem.search("West Lake", fail_silent=True)
+            assert result.strategy == "local_fallback" and "Server" in result.error
+        calls = fake.requests["/retrieval"]
+        result = mem.search("West Lake")
+        assert result.error == "circuit_open" and fake.requests["/retrieval"] == calls
+        assert result.items[0].text == "Caroline is planning a trip to West Lake"
+        assert result.items[0].source == "local"
+        mem.close()
+
+    def test_client_error_on_half_open_probe_releases_it(self):
+        """A 4xx probe neither opens nor closes the circuit, and the next search probes again."""
+        fake = FakeOmemService()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.05)
+        mem = _memory(fake, fallback=LocalFallbackStore(), circuit_breaker=breaker)
+        breaker.record_failure()
+        time.sleep(0.06)
+        retrieve = mem._client.retrieve_dialog_v2
+
+        def bad_request(**kw):
+            raise OmemHttpError("bad request", status_code=400)
+
+        mem._client.retrieve_dialog_v2 = bad_request
+        with pytest.raises(OmemHttpError):
+            mem.search("West Lake")
+        assert breaker.state == "half_open"
+        mem._client.retrieve_dialog_v2 = retrieve
+        result = mem.search("West Lake")
+        assert result.strategy != "local_fallback" and breaker.state == "closed"
+        mem.close()
+
+    def test_search_does_not_wait_for_store_writes(self):
+        """Results reach the store from the pool; search() latency excludes the writes."""
+
+        class SlowStore(LocalFallbackStore):
+            def add_items(self, items, *, session_id=None):
+                time.sleep(0.3)
+                super().add_items(items, session_id=session_id)
+
+        fake = FakeOmemService()
+        store = SlowStore()
+        mem = _memory(fake, fallback=store)
+        mem.add("conv-1", [{"role": "user", "content": "Bob's favourite tea is oolong"}], wait=True)
+        seen = len(store)
+        t0 = time.perf_counter()
+        result = mem.search("oolong tea")
+        assert time.perf_counter() - t0 < 0.2 and result.latency_ms < 200
+        assert result.items and len(store) == seen
+        mem.close()  # waits for the queued write
+        assert len(store) == seen + len(result.items)
+
+    def test_latency_budget(self):
+        fake = FakeOmemService(FakeServiceConfig(latency=fixed_latency(300)))
+        mem = _memory(fake, fallback=LocalFallbackStore(), latency_budget_ms=50)
+        mem.add("conv-1", [{"role": "user", "content": "Bob's favourite tea is oolong"}])
+        t0 = time.perf_counter()
+        result = mem.search("oolong tea")
+        assert time.perf_counter() - t0 < 0.25
+        assert result.error == "latency_budget_exceeded"
+        assert [it.text for it in result.items] == ["Bob's favourite tea is oolong"]
+        mem.close()
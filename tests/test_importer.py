@@ -0,0 +1,180 @@
+"""End-to-end tests for the bulk conversation importer.
+
+These run against a small stand-in /ingest server on localhost, so the real
+HTTP, retry and serialization paths are exercised.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from omem.client import MemoryClient, RetryConfig
+from omem.importer import ImportProgress, import_archive
+
+
+class _IngestServer:
+    """Records commits and enforces the per-session cursor chain."""
+
+    def __init__(self, *, fail_session: Optional[str] = None, throttle_first: bool = False) -> None:
+        self.sessions: Dict[str, List[Dict[str, Any]]] = {}
+        self.commit_ids: set = set()
+        self.cursor_errors: List[str] = []
+        self.fail_session = fail_session
+        self.throttle_first = throttle_first
+        self.lock = threading.Lock()
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                sid = body["session_id"]
+                with outer.lock:
+                    if outer.throttle_first:
+                        outer.throttle_first = False
+                        return self._send(429, {"error": "rate_limited"}, {"Retry-After": "0"})
+                    if sid == outer.fail_session:
+                        return self._send(400, {"error": "rejected"})
+                    if body["commit_id"] not in outer.commit_ids:
+                        outer.commit_ids.add(body["commit_id"])
+                        turns = outer.sessions.setdefault(sid, [])
+                        last = turns[-1]["turn_id"] if turns else None
+                        if body["cursor"]["base_turn_id"] != last:
+                            outer.cursor_errors.append(sid)
+                        turns.extend(body["turns"])
+                return self._send(200, {"job_id": f"job-{body['commit_id']}"})
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def client(self) -> MemoryClient:
+        return MemoryClient(
+            base_url=self.url,
+            tenant_id="__from_api_key__",
+            api_token="qbk_test",
+            retry_config=RetryConfig(max_retries=2, base_backoff_seconds=0.0),
+        )
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    servers: List[_IngestServer] = []
+
+    def make(**kwargs: Any) -> _IngestServer:
+        srv = _IngestServer(**kwargs)
+        servers.append(srv)
+        return srv
+
+    yield make
+    for srv in servers:
+        srv.close()
+
+
+def _write_jsonl(path, conversations: int, turns: int) -> None:
+    # Interleave conversations, as exported chat logs often are.
+    with open(path, "w", encoding="utf-8") as f:
+        for t in range(turns):
+            for c in range(conversations):
+                role = "user" if t % 2 == 0 else "assistant"
+                f.write(json.dumps({"conversation_id": f"c{c}", "role": role, "content": f"c{c} turn {t}"}) + "\n")
+
+
+class TestImporter:
+    """Test import_archive() end to end."""
+
+    def test_jsonl_import_serializes_chunks_per_conversation(self, server, tmp_path):
+        """All turns arrive once, in order, with a valid cursor chain."""
+        srv = server(throttle_first=True)
+        archive = tmp_path / "chats.jsonl"
+        _write_jsonl(archive, conversations=5, turns=23)
+        reports: List[ImportProgress] = []
+
+        result = import_archive(
+            srv.client(), str(archive), chunk_size=10, concurrency=4,
+            progress_callback=reports.append, progress_interval_s=0.0,
+        )
+
+        assert result.turns_committed == 115
+        assert result.commits == 15
+        assert result.failed_commits == 0
+        assert result.bytes_read == archive.stat().st_size
+        assert srv.cursor_errors == []
+        for c in range(5):
+            texts = [t["text"] for t in srv.sessions[f"c{c}"]]
+            assert texts == [f"c{c} turn {t}" for t in range(23)]
+        assert reports and reports[-1].turns_committed == 115
+
+    def test_csv_and_conversation_per_line(self, server, tmp_path):
+        """CSV archives and {"messages": [...]} lines are both accepted."""
+        srv = server()
+        archive = tmp_path / "chats.csv"
+        with open(archive, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["conversation_id", "role", "content", "name"])
+            w.writerow(["a", "user", "multi\nline", "Alice"])
+            w.writerow(["a", "assistant", "", ""])  # empty -> skipped
+            w.writerow(["a", "assistant", "ok", ""])
+        result = import_archive(srv.client(), str(archive))
+        assert result.turns_committed == 2 and result.turns_skipped == 1
+        assert srv.sessions["a"][0]["text"] == "multi\nline"
+        assert srv.sessions["a"][0]["speaker"] == "Alice"
+
+        archive = tmp_path / "convs.jsonl"
+        archive.write_text(
+            json.dumps({"conversation_id": "b", "messages": [{"role": "user", "content": "hi"}]}) + "\n"
+        )
+        assert import_archive(srv.client(), str(archive)).turns_committed == 1
+
+    def test_resume_from_checkpoint(self, server, tmp_path):
+        """A re-run commits only what the previous run did not."""
+        archive = tmp_path / "chats.jsonl"
+        ckpt = tmp_path / "chats.ckpt"
+        _write_jsonl(archive, conversations=3, turns=12)
+
+        srv = server(fail_session="c1")
+        first = import_archive(srv.client(), str(archive), chunk_size=5, checkpoint_path=str(ckpt))
+        assert first.failed_commits == 1
+        assert first.errors and first.errors[0].startswith("c1:")
+
+        srv.fail_session = None
+        second = import_archive(srv.client(), str(archive), chunk_size=5, checkpoint_path=str(ckpt))
+
+        assert second.turns_committed == 12
+        assert srv.cursor_errors == []
+        assert all(len(srv.sessions[f"c{c}"]) == 12 for c in range(3))
+
+    def test_rate_limit_spaces_commits(self, server, tmp_path):
+        """max_commits_per_s throttles commits across workers."""
+        import time
+
+        srv = server()
+        archive = tmp_path / "chats.jsonl"
+        _write_jsonl(archive, conversations=4, turns=1)
+        t0 = time.monotonic()
+        result = import_archive(srv.client(), str(archive), concurrency=4, max_commits_per_s=20)
+        assert result.commits == 4
+        assert time.monotonic() - t0 >= 0.14
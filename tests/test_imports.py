@@ -0,0 +1,52 @@
+"""Tests for lazy package imports."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+import omem
+from omem.client import MemoryClient
+
+
+class TestLazyImports:
+    def test_import_omem_does_not_load_httpx(self):
+        """`import omem` defers the client stack until a name is used."""
+        code = (
+            "import sys, omem\n"
+            "assert 'httpx' not in sys.modules and 'omem.client' not in sys.modules\n"
+            "omem.Memory\n"
+            "assert 'httpx' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_memory_defers_opt_in_features(self):
+        """`import omem.memory` leaves attachments, fallback, overlay and paging for first use."""
+        code = (
+            "import sys, omem.memory\n"
+            "deferred = ['asyncio', 'omem.attachments', 'omem.fallback', 'omem.overlay', 'omem.pagination',\n"
+            "            'omem.instrumentation', 'omem.transports']\n"
+            "assert not [m for m in deferred if m in sys.modules], [m for m in deferred if m in sys.modules]\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_all_public_names_resolve(self):
+        for name in omem.__all__:
+            assert getattr(omem, name) is not None
+        assert set(omem.__all__) <= set(dir(omem))
+        assert omem.MemoryClient is MemoryClient
+
+    def test_unknown_attribute_raises(self):
+        with pytest.raises(AttributeError, match="NotAThing"):
+            omem.NotAThing
+
+    def test_http_client_is_built_on_first_request(self):
+        client = MemoryClient(base_url="http://omem.test", tenant_id="t1")
+        assert client._http_client is None
+        client.close()  # closing an unused client is a no-op
+        assert isinstance(client._http, httpx.Client)
+        assert client._http is client._http
+        client.close()
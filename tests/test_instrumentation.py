@@ -0,0 +1,121 @@
+"""Tests for MemoryClient request hooks."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+
+import httpx
+import pytest
+
+from omem.client import MemoryClient, OmemServerError
+from omem.instrumentation import RequestEvent, enable_opentelemetry
+
+
+class TestRequestHooks:
+    def test_event_per_attempt_with_retry_details(self, mock_client):
+        """Each attempt is reported with endpoint template, status and backoff."""
+        statuses = iter([503, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={"job_id": "j1", "status": "RUNNING"})
+
+        events: List[RequestEvent] = []
+        client = mock_client(handler, retries=2, backoff_s=0.01, hooks=[events.append])
+        client.get_job("j1")
+
+        assert [(e.attempt, e.status_code, e.will_retry) for e in events] == [(0, 503, True), (1, 200, False)]
+        assert all(e.endpoint == "/ingest/jobs/{job_id}" for e in events)
+        assert events[0].error_type == "OmemServerError"
+        assert events[0].backoff_s == 0.0 and events[1].backoff_s == pytest.approx(0.01)
+        assert events[0].request_id == events[1].request_id
+        assert events[1].response_bytes > 0
+
+    def test_final_error_and_transport_failure_are_reported(self, mock_client):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/retrieval":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(500, json={"error": "boom"})
+
+        events: List[RequestEvent] = []
+        client = mock_client(handler, retries=2, backoff_s=0.01)
+        client.add_request_hook(events.append)
+
+        with pytest.raises(OmemServerError):
+            client.graph_explain_event("ev-1")
+        assert events[-1].status_code == 500 and events[-1].will_retry is False
+
+        events.clear()
+        with pytest.raises(Exception, match="ConnectError"):
+            client.retrieve_dialog_v2(query="q")
+        assert [e.error_type for e in events] == ["ConnectError"] * 3
+        assert events[0].status_code is None
+
+    def test_no_trace_extension_without_hooks(self, mock_client):
+        """Without hooks the request carries no tracing callback."""
+        seen: List[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append("trace" in request.extensions)
+            return httpx.Response(200, json={})
+
+        client = mock_client(handler)
+        client.debug_config()
+        hook = lambda ev: None  # noqa: E731
+        client.add_request_hook(hook)
+        client.debug_config()
+        client.remove_request_hook(hook)
+        client.debug_config()
+        assert seen == [False, True, False]
+
+    def test_failing_hook_does_not_break_request(self, mock_client):
+        def bad_hook(ev: RequestEvent) -> None:
+            raise RuntimeError("hook bug")
+
+        client = mock_client(lambda r: httpx.Response(200, json={"ok": True}), hooks=[bad_hook])
+        assert client.debug_config() == {"ok": True}
+
+    def test_phase_timings_over_real_connection(self):
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers["Content-Length"]))
+                body = json.dumps({"evidence_details": []}).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            events: List[RequestEvent] = []
+            client = MemoryClient(
+                base_url=f"http://127.0.0.1:{httpd.server_address[1]}",
+                tenant_id="__from_api_key__",
+                api_token="qbk_test",
+                hooks=[events.append],
+            )
+            client.retrieve_dialog_v2(query="hello")
+            client.close()
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+        ev = events[0]
+        assert ev.endpoint == "/retrieval" and ev.status_code == 200
+        assert {"connect", "send", "server", "receive"} <= set(ev.phases_ms)
+        assert ev.request_bytes > 0
+
+
+def test_enable_opentelemetry_without_otel_installed(mock_client):
+    if importlib.util.find_spec("opentelemetry") is not None:
+        pytest.skip("opentelemetry is installed")
+    client = mock_client(lambda r: httpx.Response(200, json={}))
+    assert enable_opentelemetry(client) is False
+    assert client._hooks == []
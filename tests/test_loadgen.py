@@ -0,0 +1,50 @@
+"""Tests for the load generator."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from omem import Memory
+from omem.client import RetryConfig
+from omem.fake_service import FakeOmemService, FakeServiceConfig
+from omem.loadgen import LoadConfig, main, run_load
+
+
+def _memory(fake: FakeOmemService) -> Memory:
+    return Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client())
+
+
+class TestLoadgen:
+    @pytest.mark.parametrize("mode", ["sync", "threaded", "async"])
+    def test_modes_complete_the_schedule(self, mode):
+        fake = FakeOmemService()
+        cfg = LoadConfig(duration_s=0.3, turns_per_s=60, search_qps=30, mode=mode, concurrency=4, seed=7)
+        report = run_load(_memory(fake), cfg)
+
+        assert report.completed == report.scheduled > 0
+        assert report.ops["add"].count + report.ops["search"].count == report.completed
+        assert report.turns_added == report.ops["add"].count * cfg.turns_per_add
+        assert report.ops["search"].p99_ms >= report.ops["search"].p50_ms
+        assert fake.requests["/retrieval"] == report.ops["search"].count
+
+    def test_errors_and_retries_are_broken_down(self):
+        fake = FakeOmemService(FakeServiceConfig(error_rate=1.0, fault_routes=["/retrieval"], seed=1))
+        mem = _memory(fake)
+        mem._client._retry = RetryConfig(max_retries=1, base_backoff_seconds=0.0, jitter=False)
+        report = run_load(mem, LoadConfig(duration_s=0.2, turns_per_s=0, search_qps=40, mode="threaded", seed=3))
+
+        n = report.ops["search"].count
+        assert n > 0 and report.ops["search"].errors == n
+        assert report.errors == {"OmemServerError": n}
+        assert report.http_errors == {"OmemServerError": 2 * n}
+        assert report.retries == n
+
+    def test_cli_writes_json_report(self, tmp_path):
+        out = tmp_path / "run.json"
+        code = main(["--fake", "--duration", "0.2", "--turns-per-s", "20", "--search-qps", "10",
+                     "--query", "West Lake:2", "--seed", "5", "--output", str(out)])
+        data = json.loads(out.read_text())
+        assert code == 0
+        assert data["mode"] == "threaded" and data["config"]["queries"] == [["West Lake", 2.0]]
@@ -12,14 +12,16 @@ Tests cover:
 
 from __future__ import annotations
 
-from datetime import datetime
+import dataclasses
+import pickle
+from datetime import datetime, timezone
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from omem.memory import Memory, Conversation
-from omem.models import AddResult, SearchResult, MemoryItem
+from omem.memory import Memory, Conversation, _event_from_graph, _items_from_retrieval
+from omem.models import AddResult, Event, SearchResult, MemoryItem
 
 
 class TestMemoryInit:
@@ -423,3 +425,206 @@ class TestModels:
         assert result.job_id is None
         assert result.completed is False
 
+    def test_slotted_models_parse_timestamps_lazily(self):
+        """Raw timestamps are stored as-is and parsed on first access."""
+        item = MemoryItem(text="x", timestamp="2026-01-14T10:00:00Z")
+        assert not hasattr(item, "__dict__")
+        assert item._timestamp_raw == "2026-01-14T10:00:00Z"
+        assert item.timestamp == datetime(2026, 1, 14, 10, tzinfo=timezone.utc)
+        assert isinstance(item._timestamp_raw, datetime)  # cached
+        assert MemoryItem(text="x", timestamp="not a date").timestamp is None
+        with pytest.raises(AttributeError):
+            item.extra = 1  # type: ignore[attr-defined]
+
+        copy = pickle.loads(pickle.dumps(item))
+        assert copy == item and dataclasses.replace(item, text="y").timestamp == item.timestamp
+        assert dataclasses.asdict(item)["timestamp"] == item.timestamp
+
+    def test_payload_builders_intern_repeated_strings(self):
+        payload = {
+            "evidence_details": [
+                {"text": "a", "source": "".join(["t", "kg"]), "entities": ["".join(["Caro", "line"])]},
+                {"text": "b", "source": "".join(["tk", "g"]), "entities": ["".join(["Car", "oline"])]},
+            ]
+        }
+        a, b = _items_from_retrieval(payload)
+        assert a.source is b.source and a.entities[0] is b.entities[0]
+
+        ev = _event_from_graph({"id": "e1", "summary": "s", "involves": ["Dana"]}, timestamp="2026-01-14T10:00:00+08:00")
+        assert isinstance(ev, Event) and ev.entities == ["Dana"]
+        assert ev.timestamp is not None and ev.timestamp.utcoffset().total_seconds() == 8 * 3600
+
+
+
+class TestSearchEnrich:
+    """Test Memory.search(enrich=...)."""
+
+    @staticmethod
+    def _memory(mock_client_cls):
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+        mock_client.retrieve_dialog_v2.return_value = {
+            "evidence_details": [
+                {"text": "Caroline went hiking", "score": 0.9, "tkg_event_id": "ev-1"},
+                {"text": "Caroline likes tea", "score": 0.8, "event_id": "ev-2"},
+                {"text": "No event id", "score": 0.7},
+            ]
+        }
+        mem = Memory(api_key="qbk_test", endpoint="http://localhost:8000")
+        return mem, mock_client
+
+    @patch("omem.memory.MemoryClient")
+    def test_enrich_context_attaches_event_context(self, mock_client_cls):
+        """enrich="context" attaches EventContext to items with event ids."""
+        mem, mock_client = self._memory(mock_client_cls)
+        mock_client.graph_explain_event.side_effect = lambda eid: {
+            "item": {
+                "event": {"summary": f"summary {eid}"},
+                "entities": [{"name": "Caroline", "type": "PERSON"}],
+                "knowledge": [{"id": "k1", "summary": "Caroline hikes"}],
+            }
+        }
+
+        result = mem.search("Caroline", enrich="context", enrich_top=3)
+
+        assert result.items[0].context is not None
+        assert result.items[0].context.summary == "summary ev-1"
+        assert result.items[0].context.entities == ["Caroline (PERSON)"]
+        assert result.items[1].context.event_id == "ev-2"
+        assert result.items[2].context is None
+        assert mock_client.graph_explain_event.call_count == 2
+        assert result.enrich_latency_ms is not None
+
+    @patch("omem.memory.MemoryClient")
+    def test_enrich_evidence_respects_top_k(self, mock_client_cls):
+        """enrich="evidence" only explains the top enrich_top items."""
+        mem, mock_client = self._memory(mock_client_cls)
+        mock_client.graph_explain_event.return_value = {
+            "item": {"utterances": [{"id": "u1", "raw_text": "I went hiking"}]}
+        }
+
+        result = mem.search("Caroline", enrich="evidence", enrich_top=1)
+
+        assert [e.text for e in result.items[0].evidence] == ["I went hiking"]
+        assert result.items[1].evidence is None
+        mock_client.graph_explain_event.assert_called_once_with("ev-1")
+
+    @patch("omem.memory.MemoryClient")
+    def test_enrich_budget_returns_unenriched(self, mock_client_cls):
+        """Items whose explain call misses the budget come back un-enriched."""
+        import threading
+
+        mem, mock_client = self._memory(mock_client_cls)
+        release = threading.Event()
+
+        def explain(eid):
+            if eid == "ev-2":
+                release.wait(5)
+            return {"item": {"event": {"summary": eid}}}
+
+        mock_client.graph_explain_event.side_effect = explain
+        try:
+            result = mem.search("Caroline", enrich="context", enrich_timeout_s=0.2)
+        finally:
+            release.set()
+
+        assert result.items[0].context is not None
+        assert result.items[1].context is None
+        assert result.enrich_latency_ms < 2000
+        mem.close()
+
+    @patch("omem.memory.MemoryClient")
+    def test_enrich_rejects_unknown_mode(self, mock_client_cls):
+        """enrich must be "context" or "evidence"."""
+        mem, _ = self._memory(mock_client_cls)
+        with pytest.raises(ValueError, match="enrich must be one of"):
+            mem.search("Caroline", enrich="everything")
+
+
+class TestSearchMany:
+    """Test Memory.search_many()."""
+
+    @staticmethod
+    def _memory(mock_client_cls, responses):
+        mock_client = MagicMock()
+        mock_client_cls.return_value = mock_client
+
+        def retrieve(**kwargs):
+            resp = responses[kwargs["query"]]
+            if isinstance(resp, Exception):
+                raise resp
+            return {"evidence_details": resp}
+
+        mock_client.retrieve_dialog_v2.side_effect = retrieve
+        return Memory(api_key="qbk_test", endpoint="http://localhost:8000"), mock_client
+
+    @patch("omem.memory.MemoryClient")
+    def test_rrf_fuses_and_deduplicates(self, mock_client_cls):
+        """Items found by several queries are merged and ranked first."""
+        mem, mock_client = self._memory(
+            mock_client_cls,
+            {
+                "q1": [
+                    {"text": "only in q1", "score": 0.99},
+                    {"text": "shared", "score": 0.5, "event_id": "ev-1"},
+                ],
+                "q2": [
+                    {"text": "shared (rephrased)", "score": 0.7, "event_id": "ev-1"},
+                    {"text": "Only  in Q2", "score": 0.6},
+                ],
+            },
+        )
+
+        result = mem.search_many(["q1", "q2", "q1", " "])
+
+        assert mock_client.retrieve_dialog_v2.call_count == 2
+        assert [i.event_id for i in result.items].count("ev-1") == 1
+        assert result.items[0].event_id == "ev-1"
+        assert result.items[0].text == "shared (rephrased)"
+        assert set(result.query_latencies_ms) == {"q1", "q2"}
+        assert len(result) == 3
+
+    @patch("omem.memory.MemoryClient")
+    def test_max_fusion_ranks_by_best_score(self, mock_client_cls):
+        """fusion="max" keeps each item's best retrieval score."""
+        mem, _ = self._memory(
+            mock_client_cls,
+            {
+                "q1": [{"text": "a", "score": 0.4}, {"text": "b", "score": 0.3}],
+                "q2": [{"text": "B", "score": 0.9}],
+            },
+        )
+
+        result = mem.search_many(["q1", "q2"], fusion="max")
+
+        assert [(i.text.lower(), i.score) for i in result.items] == [("b", 0.9), ("a", 0.4)]
+
+    @patch("omem.memory.MemoryClient")
+    def test_fail_silent_keeps_successful_queries(self, mock_client_cls):
+        """A failing query is reported in error when fail_silent=True."""
+        responses = {"ok": [{"text": "found", "score": 0.5}], "bad": Exception("boom")}
+        mem, _ = self._memory(mock_client_cls, responses)
+
+        result = mem.search_many(["ok", "bad"], fail_silent=True)
+        assert [i.text for i in result.items] == ["found"]
+        assert "boom" in result.error
+
+        with pytest.raises(Exception, match="boom"):
+            mem.search_many(["ok", "bad"])
+
+    @patch("omem.memory.MemoryClient")
+    def test_queries_run_concurrently(self, mock_client_cls):
+        """Wall time is about the slowest query, not the sum."""
+        import time as _time
+
+        mem, mock_client = self._memory(mock_client_cls, {})
+
+        def slow(**kwargs):
+            _time.sleep(0.2)
+            return {"evidence_details": [{"text": kwargs["query"], "score": 0.5}]}
+
+        mock_client.retrieve_dialog_v2.side_effect = slow
+        t0 = _time.perf_counter()
+        result = mem.search_many(["a", "b", "c", "d"])
+        assert _time.perf_counter() - t0 < 0.6
+        assert len(result) == 4
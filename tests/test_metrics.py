@@ -0,0 +1,97 @@
+"""Tests for the in-process metrics registry and Prometheus rendering."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from omem.client import OmemServerError
+from omem.metrics import (
+    ERRORS_TOTAL,
+    REQUEST_DURATION,
+    REQUESTS_TOTAL,
+    RETRIES_TOTAL,
+    LogHistogram,
+    MetricsRegistry,
+    render_prometheus,
+)
+
+
+class TestLogHistogram:
+    def test_percentiles_within_bucket_error(self):
+        """Quantiles of 1..1000 land within the ~9% bucket resolution."""
+        h = LogHistogram()
+        for v in range(1, 1001):
+            h.record(float(v))
+        snap = h.snapshot()
+        assert snap.count == 1000
+        assert snap.percentile(0.5) == pytest.approx(500, rel=0.1)
+        assert snap.percentile(0.99) == pytest.approx(990, rel=0.1)
+        assert snap.percentile(1.0) <= 1000
+
+    def test_snapshots_merge_exactly(self):
+        a, b, both = LogHistogram(), LogHistogram(), LogHistogram()
+        for v in (1.0, 5.0, 40.0):
+            a.record(v)
+            both.record(v)
+        for v in (2.0, 300.0):
+            b.record(v)
+            both.record(v)
+        merged = a.snapshot().merge(b.snapshot())
+        assert merged.buckets == both.snapshot().buckets
+        assert (merged.count, merged.min, merged.max) == (5, 1.0, 300.0)
+
+
+class TestClientMetrics:
+    def test_attempts_errors_and_retries_are_recorded(self, mock_client):
+        """Every attempt lands in the endpoint histogram; errors are keyed by subclass."""
+        statuses = iter([503, 503, 503])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/retrieval":
+                return httpx.Response(200, json={"evidence_details": []})
+            return httpx.Response(next(statuses), json={"error": "busy"})
+
+        client = mock_client(handler, retries=2)
+        client.retrieve_dialog_v2(query="hello")
+        with pytest.raises(OmemServerError):
+            client.get_job("j1")
+
+        snap = client.metrics.snapshot()
+        job = {"endpoint": "/ingest/jobs/{job_id}", "method": "GET"}
+        assert snap.histogram(REQUEST_DURATION, job).count == 3
+        assert snap.histogram(REQUEST_DURATION, {"endpoint": "/retrieval", "method": "POST"}).count == 1
+        assert snap.counter(REQUESTS_TOTAL, {"endpoint": "/ingest/jobs/{job_id}", "status": "503"}) == 3
+        assert snap.counter(ERRORS_TOTAL, {"error": "OmemServerError"}) == 3
+        assert snap.counter(RETRIES_TOTAL, {"endpoint": "/ingest/jobs/{job_id}"}) == 2
+
+    def test_shared_registry_and_prometheus_output(self, mock_client):
+        registry = MetricsRegistry()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"evidence_details": []})
+
+        for _ in range(2):
+            mock_client(handler, metrics=registry).retrieve_dialog_v2(query="q")
+        registry.set_gauge("omem_circuit_state", 0)
+
+        text = render_prometheus(registry.snapshot())
+        assert "# TYPE omem_request_duration_seconds histogram" in text
+        assert 'omem_request_duration_seconds_count{endpoint="/retrieval",method="POST"} 2' in text
+        assert 'omem_request_duration_seconds_bucket{endpoint="/retrieval",method="POST",le="+Inf"} 2' in text
+        assert 'omem_request_duration_quantile_seconds{endpoint="/retrieval",method="POST",quantile="0.99"}' in text
+        assert 'omem_requests_total{endpoint="/retrieval",status="200"} 2' in text
+        assert "omem_circuit_state 0" in text
+
+    @patch("omem.memory.MemoryClient")
+    def test_memory_metrics_returns_client_snapshot(self, mock_client_class):
+        from omem import Memory
+
+        registry = MetricsRegistry()
+        registry.incr("omem_cache_hits_total", {"cache": "attachments"})
+        mock_client_class.return_value.metrics = registry
+
+        mem = Memory(api_key="qbk_test", endpoint="http://localhost:8000")
+        assert mem.metrics().counter("omem_cache_hits_total", {"cache": "attachments"}) == 1
@@ -0,0 +1,118 @@
+"""Tests for the read-your-writes overlay."""
+
+from __future__ import annotations
+
+import time
+
+from omem import Memory
+from omem.fake_service import FakeOmemService, FakeServiceConfig
+from omem.models import MemoryItem
+from omem.overlay import RecentWritesOverlay, merge_items
+from omem.textindex import BM25Index, tokenize
+from omem.types import CanonicalTurnV1
+
+
+def _turns(*texts: str):
+    return [CanonicalTurnV1(turn_id=f"t{i:04d}", role="user", text=t) for i, t in enumerate(texts, 1)]
+
+
+class TestTextIndex:
+    def test_bm25_ranking_and_cjk_bigrams(self):
+        assert tokenize("我去西湖 West-Lake") == ["我去", "去西", "西湖", "west", "lake"]
+        index = BM25Index()
+        index.add("a", "Caroline booked a trip to West Lake")
+        index.add("b", "Bob likes tea and lake views, lake lake")
+        index.add("c", "下周我们去西湖划船")
+        assert [d for _, d in index.search("west lake trip")][:2] == ["a", "b"]
+        assert [d for _, d in index.search("西湖")] == ["c"]
+        index.add("a", "replaced text")
+        assert "a" not in [d for _, d in index.search("west lake")]
+        index.remove("a")
+        assert len(index) == 2 and "a" not in index
+
+
+    def test_tokenizer_covers_all_scripts(self):
+        """Words in any script are kept whole; accents and combining marks stay inside the word."""
+        assert tokenize("Анна поехала в Москву") == ["анна", "поехала", "в", "москву"]
+        assert tokenize("Ελληνικό κείμενο, Besançon") == ["ελληνικό", "κείμενο", "besançon"]
+        assert tokenize("Besanc\u0327on") == ["besançon"]  # decomposed input normalizes to the same token
+        assert tokenize("สวัสดี नमस्ते שלום مرحبا") == ["สวัสดี", "नमस्ते", "שלום", "مرحبا"]
+        assert tokenize("STRASSE Straße snake_case") == ["strasse", "strasse", "snake", "case"]
+
+
+class TestRecentWritesOverlay:
+    def test_job_completion_and_ttl_evict(self):
+        overlay = RecentWritesOverlay(ttl_s=60, poll_interval_s=0)
+        overlay.record("s1", "j1", _turns("Alice adopted a cat named Miso"))
+        overlay.record("s2", "j2", _turns("Alice prefers window seats"))
+        assert [it.text for it in overlay.search("alice cat")][0] == "Alice adopted a cat named Miso"
+        assert [it.source for it in overlay.search("alice", session_id="s2")] == ["overlay"]
+
+        assert overlay.refresh_due()
+        overlay.refresh(lambda job_id: "COMPLETED" if job_id == "j1" else "RUNNING")
+        assert overlay.pending_jobs == ["j2"] and len(overlay) == 1
+
+        overlay.ttl_s = 0
+        overlay.expire()
+        assert len(overlay) == 0
+
+    def test_turns_without_job_id_expire_on_search(self):
+        """The TTL applies even when no job is pending, so refresh() never runs."""
+        overlay = RecentWritesOverlay(ttl_s=60, poll_interval_s=0)
+        overlay.record("s1", None, _turns("Alice adopted a cat named Miso"))
+        assert overlay.pending_jobs == [] and not overlay.refresh_due()
+        assert len(overlay.search("alice cat")) == 1
+
+        overlay.ttl_s = 0
+        assert overlay.search("alice cat") == [] and len(overlay) == 0
+
+    def test_non_latin_turns_are_searchable(self):
+        overlay = RecentWritesOverlay()
+        overlay.record("s1", "j1", _turns("Анна поехала в Москву", "Η Μαρία μένει στην Αθήνα", "Alice likes tea"))
+        assert [it.text for it in overlay.search("Москву")] == ["Анна поехала в Москву"]
+        assert [it.text for it in overlay.search("αθήνα")] == ["Η Μαρία μένει στην Αθήνα"]
+
+    def test_merge_dedupes_against_server(self):
+        server = [MemoryItem(text="Alice  adopted a cat", score=0.9)]
+        local = [MemoryItem(text="alice adopted a cat", score=0.95), MemoryItem(text="new fact", score=0.5)]
+        assert [it.text for it in merge_items(server, local, 10)] == ["Alice  adopted a cat", "new fact"]
+
+
+class TestMemoryReadYourWrites:
+    def test_search_sees_uncompleted_commit_until_job_completes(self):
+        """Turns are searchable immediately and drop out of the overlay once indexed server-side."""
+        fake = FakeOmemService(FakeServiceConfig(job_delay_s=0.3))
+        mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client(), read_your_writes=True)
+        mem._overlay.poll_interval_s = 0.05
+        mem.add("conv-1", [{"role": "user", "content": "My sister Dana lives in Lisbon"}])
+
+        result = mem.search("where does Dana live")
+        assert [(it.text, it.source) for it in result.items] == [("My sister Dana lives in Lisbon", "overlay")]
+
+        deadline = time.time() + 5
+        while len(mem._overlay) and time.time() < deadline:
+            time.sleep(0.05)
+            mem.search("Dana")
+        assert len(mem._overlay) == 0
+        items = mem.search("where does Dana live").items
+        assert len(items) == 1 and items[0].source != "overlay"
+        mem.close()
+
+    def test_failed_refresh_submit_does_not_stall_polling(self):
+        fake = FakeOmemService(FakeServiceConfig(job_delay_s=60))
+        mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client(), read_your_writes=True)
+        mem._overlay.poll_interval_s = 0
+        mem.add("conv-1", [{"role": "user", "content": "My sister Dana lives in Lisbon"}])
+        mem._executor().shutdown()
+
+        assert [it.source for it in mem.search("Dana").items] == ["overlay"]
+        assert mem._overlay.refresh_due()
+        mem._pool = None
+        mem.close()
+
+    def test_disabled_by_default(self):
+        fake = FakeOmemService(FakeServiceConfig(job_delay_s=60))
+        mem = Memory(api_key="qbk_fake", endpoint="http://omem.fake", http=fake.http_client())
+        mem.add("conv-1", [{"role": "user", "content": "My sister Dana lives in Lisbon"}])
+        assert mem.search("Dana").items == []
+        mem.close()
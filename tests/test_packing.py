@@ -0,0 +1,95 @@
+"""Tests for token-budgeted prompt packing."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from omem.models import EventContext, ExtractedKnowledge, MemoryItem, SearchResult
+from omem.packing import estimate_tokens, pack_items, simhash
+
+
+def _words(n: int) -> str:
+    return " ".join(f"w{i}" for i in range(n))
+
+
+class TestPacking:
+    def test_estimator_and_simhash(self):
+        assert estimate_tokens("abcd" * 10) == 10
+        assert estimate_tokens("我去西湖") == 4
+        a = simhash("Caroline went to the LGBTQ support group yesterday")
+        b = simhash("caroline went to the LGBTQ support group yesterday!")
+        c = simhash("Bob bought oolong tea at the market")
+        assert a == b and bin(a ^ c).count("1") > 10
+
+    def test_dedupes_orders_and_respects_budget(self):
+        """Near-duplicates collapse and the packed text never exceeds the budget."""
+        items = [
+            MemoryItem(text="Caroline went to a support group yesterday", score=0.7),
+            MemoryItem(text="Caroline went to a support group yesterday.", score=0.9),
+            MemoryItem(text=_words(200), score=0.8),
+            MemoryItem(text="Melanie has two kids", score=0.5),
+        ]
+        packed = pack_items(items, 40)
+        assert packed.duplicates_removed == 1
+        assert [it.score for it in packed.items] == [0.9, 0.5]
+        assert packed.items_dropped == 1
+        assert packed.text == "1. Caroline went to a support group yesterday.\n2. Melanie has two kids"
+        assert packed.tokens <= 40
+
+    def test_recency_order_and_knapsack(self):
+        old = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        new = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        items = [
+            MemoryItem(text="older fact about tea", score=0.9, timestamp=old),
+            MemoryItem(text="newer fact about coffee", score=0.1, timestamp=new),
+        ]
+        assert pack_items(items, 100, order="recency").items[0].text == "newer fact about coffee"
+
+        # Greedy takes the single high-score long item; knapsack prefers two mid-score short ones.
+        items = [
+            MemoryItem(text=_words(12), score=0.6),
+            MemoryItem(text="short one", score=0.5),
+            MemoryItem(text="short two", score=0.5),
+        ]
+        budget = estimate_tokens("00. " + _words(12) + "\n")
+        assert len(pack_items(items, budget).items) == 1
+        assert [it.text for it in pack_items(items, budget, strategy="knapsack").items] == ["short one", "short two"]
+
+    def test_non_latin_and_tokenless_items_are_not_duplicates(self):
+        """Distinct memories in any script survive dedupe; items without tokens are never duplicates."""
+        texts = [
+            "Анна поехала в Москву на поезде",
+            "Иван купил новую машину вчера",
+            "Η Μαρία μένει στην Αθήνα",
+            "Анна поехала в Москву на поезде!",
+            "👍",
+            "🎉🎉",
+        ]
+        items = [MemoryItem(text=t, score=1 - i / 10) for i, t in enumerate(texts)]
+        packed = pack_items(items, 1000)
+        assert packed.duplicates_removed == 1
+        assert [it.text for it in packed.items] == texts[:3] + texts[4:]
+
+    def test_knowledge_lines_are_trimmed_before_items(self):
+        ctx = EventContext(
+            event_id="ev-1",
+            summary="s",
+            knowledge=[
+                ExtractedKnowledge(id="k1", summary="minor detail " + _words(30), importance=0.1),
+                ExtractedKnowledge(id="k2", summary="Caroline attends weekly", importance=0.9),
+            ],
+        )
+        items = [MemoryItem(text="Caroline support group", score=0.9, context=ctx), MemoryItem(text="tea", score=0.1)]
+        packed = pack_items(items, 25)
+        assert packed.text == "1. Caroline support group\n   - Caroline attends weekly\n2. tea"
+        assert packed.knowledge_trimmed == 1
+
+    def test_to_prompt_with_budget(self):
+        result = SearchResult(query="q", items=[MemoryItem(text=f"fact {i} " + _words(10), score=1 - i / 10) for i in range(8)])
+        assert result.to_prompt().count("\n") == 4
+        assert result.to_prompt(max_items=None, token_budget=30).count("\n") == 1
+        assert result.to_prompt(token_budget=10_000).count("\n") == 4  # max_items still caps
+        with pytest.raises(ValueError):
+            result.to_prompt(token_budget=10, order="random")
@@ -0,0 +1,113 @@
+"""Tests for paginated graph iterators (MemoryClient.iter_* / aiter_*)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from omem.pagination import iter_pages
+
+
+def _offset_handler(total: int, calls: List[Dict[str, Any]]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        calls.append(params)
+        limit = int(params["limit"])
+        offset = int(params.get("offset", 0))
+        items = [{"id": f"ev-{i}"} for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(200, json={"items": items})
+
+    return handler
+
+
+class TestIterPages:
+    """Test offset and cursor paging."""
+
+    def test_offset_paging_walks_all_pages(self, mock_client):
+        """Short last page ends the walk; offsets advance by page length."""
+        calls: List[Dict[str, Any]] = []
+        client = mock_client(_offset_handler(450, calls))
+
+        ids = [e["id"] for e in client.iter_list_events(entity_id="ent-1", page_size=200)]
+
+        assert ids == [f"ev-{i}" for i in range(450)]
+        assert [c.get("offset") for c in calls] == [None, "200", "400"]
+        assert all(c["entity_id"] == "ent-1" for c in calls)
+
+    def test_cursor_paging_follows_next_cursor(self, mock_client):
+        """next_cursor is sent back as cursor until the backend stops returning it."""
+        pages = {
+            None: {"items": [{"id": 1}, {"id": 2}], "next_cursor": "c2"},
+            "c2": {"items": [{"id": 3}, {"id": 4}], "next_cursor": "c3"},
+            "c3": {"items": [{"id": 5}]},
+        }
+        seen: List[Any] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            cursor = request.url.params.get("cursor")
+            seen.append(cursor)
+            return httpx.Response(200, json=pages[cursor])
+
+        client = mock_client(handler)
+        ids = [e["id"] for e in client.iter_entity_evidences("ent-1", page_size=2)]
+
+        assert ids == [1, 2, 3, 4, 5]
+        assert seen == [None, "c2", "c3"]
+
+    def test_max_items_stops_early(self, mock_client):
+        """max_items caps both the yielded items and the pages fetched."""
+        calls: List[Dict[str, Any]] = []
+        client = mock_client(_offset_handler(1000, calls))
+
+        items = list(client.iter_timeslice_events("ts-1", page_size=100, max_items=150))
+
+        assert len(items) == 150
+        assert len(calls) == 2
+
+    def test_repeated_page_guard(self):
+        """A backend that ignores offset does not cause an infinite loop."""
+        page = {"items": [{"id": i} for i in range(10)]}
+        items = list(iter_pages(lambda cursor, offset: page, page_size=10))
+        assert len(items) == 10
+
+    def test_prefetches_next_page_while_consuming(self):
+        """The next page is requested before the current one is exhausted."""
+        fetched = threading.Event()
+
+        def fetch(cursor, offset):
+            if offset:
+                fetched.set()
+                return {"items": [{"id": "last"}]}
+            return {"items": [{"id": "a"}, {"id": "b"}]}
+
+        it = iter_pages(fetch, page_size=2)
+        assert next(it)["id"] == "a"
+        assert fetched.wait(2)
+        assert [i["id"] for i in it] == ["b", "last"]
+
+    def test_rejects_non_positive_page_size(self):
+        with pytest.raises(ValueError, match="page_size"):
+            list(iter_pages(lambda c, o: {"items": []}, page_size=0))
+
+
+class TestAsyncIterPages:
+    """Test aiter_* variants."""
+
+    def test_aiter_timeslices_range(self, mock_client):
+        calls: List[Dict[str, Any]] = []
+        client = mock_client(_offset_handler(250, calls))
+
+        async def collect() -> List[Dict[str, Any]]:
+            return [
+                ts async for ts in client.aiter_timeslices_range(
+                    "2026-01-01T00:00:00Z", "2026-02-01T00:00:00Z", page_size=100
+                )
+            ]
+
+        items = asyncio.run(collect())
+        assert len(items) == 250
+        assert calls[0]["start"] == "2026-01-01T00:00:00Z"
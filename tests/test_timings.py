@@ -0,0 +1,67 @@
+"""Tests for the /retrieval latency breakdown."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from omem import Memory
+from omem.timings import SEARCH_PHASE, SEARCH_SERVER_PHASE, parse_server_timing, timings_from_payload
+
+
+class TestParsing:
+    def test_server_timing_header(self):
+        value = 'vector;dur=12.5;desc="ANN", graph;dur=30, cache;desc=hit, total;dur=48.25, graph;dur=1'
+        assert parse_server_timing(value) == {"vector": 12.5, "graph": 31.0, "total": 48.25}
+        assert parse_server_timing(None) == {}
+
+    def test_payload_metrics_and_debug_fields(self):
+        data = {
+            "metrics": {"timings": {"vector": 10, "rerank_ms": 4}, "total_ms": 20, "hits": 3},
+            "debug": {"graph_ms": 7.5, "plan_s": 0.002, "enabled": True},
+        }
+        assert timings_from_payload(data) == {
+            "vector": 10.0,
+            "rerank": 4.0,
+            "total": 20.0,
+            "graph": 7.5,
+            "plan": pytest.approx(2.0),
+        }
+
+
+class TestSearchTimings:
+    def test_search_result_carries_breakdown_and_metrics(self, mock_client):
+        """Client phases are measured; server phases come from header and body."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(json.loads(request.content))
+            if len(calls) == 1:
+                return httpx.Response(503, json={"error": "busy"})
+            return httpx.Response(
+                200,
+                headers={"Server-Timing": "vector;dur=12, total;dur=40"},
+                json={"evidence_details": [], "metrics": {"graph_ms": 20}},
+            )
+
+        client = mock_client(handler, retries=1)
+        with patch("omem.memory.MemoryClient", return_value=client):
+            mem = Memory(api_key="qbk_test", endpoint="http://omem.test")
+            result = mem.search("west lake")
+
+        t = result.timings
+        assert calls[-1]["query"] == "west lake"
+        assert t.attempts == 2
+        assert t.server_ms == {"vector": 12.0, "graph": 20.0}
+        assert t.server_total_ms == 40.0
+        assert t.backoff_ms > 0 and t.network_ms > 0 and t.encode_ms >= 0 and t.decode_ms >= 0
+        assert t.total_ms >= t.network_ms + t.backoff_ms
+        assert t.transit_ms is not None
+
+        snap = mem.metrics()
+        assert snap.histogram(SEARCH_PHASE, {"phase": "network"}).count == 1
+        assert snap.histogram(SEARCH_SERVER_PHASE, {"phase": "vector"}).count == 1
+        assert snap.histogram(SEARCH_SERVER_PHASE, {"phase": "total"}).count == 1
@@ -0,0 +1,122 @@
+"""Tests for the shared transport registry."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import httpx
+import pytest
+
+from omem import Memory
+from omem.client import MemoryClient
+from omem.transports import SharedTransportRegistry
+
+
+def _client(registry: SharedTransportRegistry, **kw) -> MemoryClient:
+    kw.setdefault("base_url", "https://omem.test/api/v1/memory")
+    kw.setdefault("api_token", "qbk_x")
+    return MemoryClient(tenant_id="__from_api_key__", shared_transport=registry, **kw)
+
+
+class TestSharedTransports:
+    def test_clients_share_one_pool_with_refcounted_close(self):
+        """Any number of clients with the same settings reuse one transport, each with its own httpx.Client."""
+        registry = SharedTransportRegistry()
+        clients = [_client(registry) for _ in range(50)]
+        assert len({id(c._http) for c in clients}) == 50
+        assert len({id(c._shared.pool) for c in clients if c._http}) == 1 and len(registry) == 1
+        shared = clients[0]._shared
+        assert registry.refcount(shared) == 50
+
+        for c in clients[:-1]:
+            c.close()
+            c.close()  # idempotent
+        assert registry.refcount(shared) == 1 and len(registry) == 1
+        clients[-1].close()
+        assert registry.refcount(shared) == 0 and len(registry) == 0
+
+    def test_pool_key_includes_origin_and_settings(self):
+        registry = SharedTransportRegistry()
+        a = _client(registry)
+        b = _client(registry, base_url="https://OMEM.test/other/path")
+        c = _client(registry, base_url="https://other.test")
+        d = _client(registry, max_connections=5)
+        e = _client(registry, timeout_s=5)
+        assert a._http is not b._http and a._shared.pool is b._shared.pool
+        assert len({id(x._http and x._shared.pool) for x in (a, c, d, e)}) == 4
+        registry.close_all()
+
+    def test_concurrent_acquire_is_safe(self):
+        registry = SharedTransportRegistry()
+        clients = [_client(registry) for _ in range(32)]
+        got = []
+        threads = [threading.Thread(target=lambda c=c: got.append(c._http and c._shared)) for c in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(h.pool) for h in got}) == 1 and registry.refcount(got[0]) == 32
+        registry.close_all()
+
+    def test_per_instance_headers(self):
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.headers.get("x-user-id"), request.headers.get("x-api-key")))
+            return httpx.Response(200, json={})
+
+        http = httpx.Client(transport=httpx.MockTransport(handler))
+        for user in ("alice", "bob"):
+            client = MemoryClient(
+                base_url="http://omem.test", tenant_id="__from_api_key__", api_token=f"qbk_{user}",
+                http=http, headers={"X-User-ID": user},
+            )
+            client.debug_config()
+        assert seen == [("alice", "qbk_alice"), ("bob", "qbk_bob")]
+
+    def test_cookies_do_not_cross_clients(self, monkeypatch):
+        """A cookie set on one tenant's response is never sent by another client on the same pool."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.headers.get("x-api-key"), request.headers.get("cookie")))
+            return httpx.Response(200, json={}, headers={"set-cookie": "sess=userA-secret; Path=/"})
+
+        mock = httpx.MockTransport(handler)
+        registry = SharedTransportRegistry()
+        monkeypatch.setattr(registry, "_new_pool", lambda limits, http2: mock)
+        a = _client(registry, api_token="qbk_a")
+        b = _client(registry, api_token="qbk_b")
+        a.debug_config()
+        b.debug_config()
+        assert a._shared.pool is b._shared.pool is mock
+        assert seen == [("qbk_a", None), ("qbk_b", None)]
+        registry.close_all()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_child_process_rebuilds_pool(self):
+        registry = SharedTransportRegistry()
+        client = _client(registry)
+        parent_http = client._http
+        parent_shared = client._shared
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            ok = client._http is not parent_http and client._shared.pool is not parent_shared.pool and len(registry) == 1
+            client.close()
+            os.write(w, b"1" if ok and len(registry) == 0 else b"0")
+            os._exit(0)
+        os.close(w)
+        assert os.read(r, 1) == b"1"
+        os.waitpid(pid, 0)
+        assert registry.refcount(parent_shared) == 1 and not parent_http.is_closed
+        client.close()
+
+    def test_memory_shared_transport(self):
+        a = Memory(api_key="qbk_a", shared_transport=True)
+        b = Memory(api_key="qbk_b", shared_transport=True)
+        assert a._client._http is not b._client._http
+        assert a._client._shared.pool is b._client._shared.pool
+        a.close()
+        b.close()
@@ -0,0 +1,271 @@
+"""Tests for the LLM usage reporter."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+
+import httpx
+
+from omem import usage
+
+
+class _Collector:
+    def __init__(self, fail_first: int = 0, status: int = 503) -> None:
+        self.bodies = []
+        self.encodings = []
+        self.fail_first = fail_first
+        self.status = status
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            raw = request.read()
+            if request.headers.get("content-encoding") == "gzip":
+                raw = gzip.decompress(raw)
+            self.encodings.append(request.headers.get("content-encoding"))
+            self.bodies.append(json.loads(raw))
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return httpx.Response(self.status)
+        return httpx.Response(202)
+
+    def event_ids(self):
+        return [e["event_id"] for b in self.bodies for e in b["events"]]
+
+
+def _reporter(collector: _Collector, **batch_kw) -> "usage.LLMUsageReporter":
+    batch_kw.setdefault("base_backoff_s", 0.001)
+    return usage.LLMUsageReporter(
+        base_url="http://omem.test",
+        tenant_id="t1",
+        internal_key="k",
+        http=httpx.Client(transport=httpx.MockTransport(collector)),
+        batch=usage.UsageBatchConfig(**batch_kw),
+    )
+
+
+class TestBatchedUsageReporter:
+    def test_batches_by_count_and_flushes_on_close(self):
+        """Events are grouped into batches and the tail is sent on close()."""
+        collector = _Collector()
+        rep = _reporter(collector, max_events=10, max_age_s=60, gzip_min_bytes=None)
+        ids = [rep.emit({"request_id": f"r{i}", "prompt_tokens": 1}) for i in range(25)]
+        rep.close()
+
+        assert [len(b["events"]) for b in collector.bodies] == [10, 10, 5]
+        assert collector.event_ids() == ids
+        stats = rep.stats()
+        assert stats.sent == 25 and stats.batches == 3 and stats.queued == 0
+
+    def test_retries_reuse_event_ids_and_gzip(self):
+        collector = _Collector(fail_first=2)
+        rep = _reporter(collector, max_events=5, gzip_min_bytes=0)
+        ids = [rep.emit({"request_id": f"r{i}"}) for i in range(5)]
+        assert rep.flush(timeout_s=5)
+
+        assert len(collector.bodies) == 3
+        assert all(b == collector.bodies[0] for b in collector.bodies)
+        assert collector.event_ids()[-5:] == ids
+        assert collector.encodings == ["gzip"] * 3
+        assert rep.stats().retries == 2 and rep.stats().sent == 5
+        rep.close()
+
+    def test_drop_accounting(self):
+        """A full queue drops new events; exhausted retries drop the batch."""
+        gate = threading.Event()
+        collector = _Collector(fail_first=10, status=500)
+
+        def handler(request):
+            gate.wait(5)
+            return collector(request)
+
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(handler)),
+            batch=usage.UsageBatchConfig(max_events=1, max_queue=2, max_retries=1, base_backoff_s=0.001),
+        )
+        results = [rep.emit({"request_id": f"r{i}"}) for i in range(6)]
+        gate.set()
+        rep.close()
+
+        stats = rep.stats()
+        assert results.count(None) == stats.dropped_queue_full >= 3
+        assert stats.dropped_send_failed == 6 - stats.dropped_queue_full
+        assert stats.sent == 0
+
+    def test_age_trigger(self):
+        collector = _Collector()
+        rep = _reporter(collector, max_events=100, max_age_s=0.02)
+        rep.emit({"request_id": "r1"})
+        for _ in range(200):
+            if collector.bodies:
+                break
+            threading.Event().wait(0.01)
+        assert len(collector.bodies) == 1
+        rep.close()
+
+
+class TestUsageSpooling:
+    def test_failed_posts_are_spooled_and_replayed(self, tmp_path):
+        """Undeliverable events survive on disk and are resent once the endpoint recovers."""
+        collector = _Collector(fail_first=1, status=500)
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(collector)),
+            spool=usage.UsageSpool(tmp_path, fsync_interval_s=0),
+            spool_replay_interval_s=0.01,
+        )
+        first = rep.emit({"request_id": "r1"})
+        assert first is not None and rep.stats().spooled == 1
+        second = rep.emit({"request_id": "r2"})
+        for _ in range(200):
+            if rep.stats().replayed:
+                break
+            threading.Event().wait(0.01)
+        rep.close()
+
+        assert rep.stats().replayed == 1
+        assert collector.event_ids() == [first, second, first]
+        assert not list(tmp_path.glob("seg-*"))
+
+
+    def test_permanent_rejections_do_not_block_the_spool(self, tmp_path):
+        """A 4xx-rejected event is dropped (bisected out of its batch) instead of wedging replay."""
+        state = {"down": True, "posts": 0}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            state["posts"] += 1
+            if state["down"]:
+                return httpx.Response(503)
+            ids = [e["request_id"] for e in json.loads(request.read())["events"]]
+            return httpx.Response(400 if "bad" in ids else 202)
+
+        spool = usage.UsageSpool(tmp_path, fsync_interval_s=0)
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(handler)),
+            spool=spool,
+            spool_replay_interval_s=60,
+        )
+        rep.emit({"request_id": "bad"})
+        rep.emit({"request_id": "good1"})
+        assert rep.stats().spooled == 2
+        state["down"] = False
+        assert rep.emit({"request_id": "bad"}) is None  # rejected live: dropped, not spooled
+        assert rep.stats().spooled == 2 and rep.stats().dropped_send_failed == 1
+
+        state["posts"] = 0
+        rep._replay_wake.set()
+        for _ in range(200):
+            if spool.pending() == 0:
+                break
+            threading.Event().wait(0.01)
+        rep.close()
+        stats = rep.stats()
+        assert spool.pending() == 0 and stats.replayed == 1 and stats.dropped_send_failed == 2
+        assert state["posts"] == 3  # [bad, good1] -> [bad] + [good1]
+
+    def test_batch_mode_bisects_rejected_batches(self):
+        collector = _Collector()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(gzip.decompress(request.read()) if request.headers.get("content-encoding") else request.read())
+            if any(e["request_id"] == "bad" for e in body["events"]):
+                return httpx.Response(422)
+            return collector(request)
+
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(handler)),
+            batch=usage.UsageBatchConfig(max_events=100, max_age_s=60, base_backoff_s=0.001),
+        )
+        for rid in ("g1", "g2", "bad", "g3"):
+            rep.emit({"request_id": rid})
+        rep.close()
+        stats = rep.stats()
+        assert stats.sent == 3 and stats.dropped_send_failed == 1 and stats.retries == 0
+        assert sorted(e["request_id"] for b in collector.bodies for e in b["events"]) == ["g1", "g2", "g3"]
+
+
+class TestUsageAggregation:
+    def test_reporter_sends_summaries_and_sampled_detail(self):
+        collector = _Collector()
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(collector)),
+            aggregate=usage.UsageAggregationConfig(window_s=3600, detail_sample_rate=1.0),
+        )
+        for i in range(3):
+            rep.report_llm_usage(
+                provider="openai", model="m", prompt_tokens=10, completion_tokens=2, total_tokens=12, request_id=f"r{i}"
+            )
+        rep.close()
+
+        events = [e for b in collector.bodies for e in b["events"]]
+        summaries = [e for e in events if e["event_type"] == "llm_aggregate"]
+        assert len(events) - len(summaries) == 3
+        assert [(s["metrics"]["calls"], s["metrics"]["total_tokens"]) for s in summaries] == [(3, 36)]
+        assert rep.stats().aggregated == 3 and rep.stats().summaries == 1
+
+    def test_emit_does_not_post_on_caller_thread(self):
+        """Without batch mode, sampled detail is posted by the aggregation thread."""
+        collector = _Collector()
+        threads = []
+
+        def slow(request: httpx.Request) -> httpx.Response:
+            threads.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return collector(request)
+
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(slow)),
+            aggregate=usage.UsageAggregationConfig(window_s=3600, detail_sample_rate=1.0),
+        )
+        t0 = time.perf_counter()
+        ids = [rep.emit({"request_id": f"r{i}", "prompt_tokens": 1}) for i in range(3)]
+        assert time.perf_counter() - t0 < 0.1
+        deadline = time.monotonic() + 2
+        while not threads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert threads == ["omem-usage-aggregate"]
+        rep.close()
+
+        detail = [e["event_id"] for b in collector.bodies for e in b["events"] if e["event_type"] != "llm_aggregate"]
+        assert sorted(detail) == sorted(ids)
+
+    def test_batch_mode_close_delivers_late_summaries(self):
+        """Usage aggregated after close()'s flush is posted, not left in the stopped queue."""
+        collector = _Collector()
+        rep = usage.LLMUsageReporter(
+            base_url="http://omem.test",
+            tenant_id="t1",
+            http=httpx.Client(transport=httpx.MockTransport(collector)),
+            batch=usage.UsageBatchConfig(max_events=100, max_age_s=60),
+            aggregate=usage.UsageAggregationConfig(window_s=3600, detail_sample_rate=0.0),
+        )
+        report = dict(provider="openai", model="m", prompt_tokens=10, completion_tokens=2, total_tokens=12)
+        for i in range(3):
+            rep.report_llm_usage(request_id=f"r{i}", **report)
+        flush = rep.flush
+
+        def flush_then_report(timeout_s=None):
+            ok = flush(timeout_s)
+            rep.report_llm_usage(request_id="late", **report)  # e.g. another thread racing close()
+            return ok
+
+        rep.flush = flush_then_report
+        rep.close()
+
+        summaries = [e for b in collector.bodies for e in b["events"] if e["event_type"] == "llm_aggregate"]
+        assert sum(s["metrics"]["calls"] for s in summaries) == 4
+        assert rep.stats().summaries == len(summaries) == 2
@@ -0,0 +1,81 @@
+"""Tests for windowed usage aggregation."""
+
+from __future__ import annotations
+
+import pytest
+
+from omem.usage_aggregate import UsageAggregationConfig, UsageAggregator, sampled
+
+
+def _event(i: int, *, model: str = "gpt-4o-mini", prompt=10, completion=5, job_id=None):
+    return {
+        "event_id": f"llm_{i}",
+        "tenant_id": "t1",
+        "api_key_id": "k1",
+        "request_id": f"r{i}",
+        "job_id": job_id,
+        "metrics": {
+            "stage": "byok",
+            "provider": "openai",
+            "model": model,
+            "source": "sdk",
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "total_tokens": None if prompt is None else prompt + completion,
+            "tokens_missing": prompt is None,
+        },
+    }
+
+
+class TestUsageAggregator:
+    def test_rolls_up_per_group_and_window(self):
+        agg = UsageAggregator(UsageAggregationConfig(window_s=60), emitter_id="e1")
+        for i in range(5):
+            assert agg.add(_event(i), now=120.0 + i) == []
+        agg.add(_event(5, model="gpt-4o"), now=130.0)
+        agg.add(_event(6, prompt=None), now=131.0)
+
+        closed = agg.add(_event(7), now=185.0)  # next window closes the first
+        by_model = {s["metrics"]["model"]: s for s in closed}
+        assert set(by_model) == {"gpt-4o-mini", "gpt-4o"}
+        mini = by_model["gpt-4o-mini"]["metrics"]
+        assert (mini["calls"], mini["prompt_tokens"], mini["completion_tokens"], mini["total_tokens"]) == (6, 50, 30, 75)
+        assert mini["tokens_missing_calls"] == 1
+        assert by_model["gpt-4o"]["window"]["start"].startswith("1970-01-01T00:02:00")
+        assert agg.drain(now=186.0) == []
+        assert [s["metrics"]["calls"] for s in agg.drain(now=241.0)] == [1]
+
+    def test_event_ids_are_deterministic_and_distinct_per_part(self):
+        ids = []
+        for _ in range(2):
+            agg = UsageAggregator(UsageAggregationConfig(window_s=60), emitter_id="e1")
+            agg.add(_event(0), now=10.0)
+            first = agg.drain(now=11.0, force=True)
+            agg.add(_event(1), now=12.0)
+            second = agg.drain(now=70.0)
+            ids.append((first[0]["event_id"], second[0]["event_id"]))
+        assert ids[0] == ids[1]
+        assert ids[0][0] != ids[0][1]
+        other = UsageAggregator(UsageAggregationConfig(window_s=60), emitter_id="e2")
+        other.add(_event(0), now=10.0)
+        assert other.drain(force=True)[0]["event_id"] not in ids[0]
+
+    def test_max_groups_flushes_early(self):
+        agg = UsageAggregator(UsageAggregationConfig(window_s=60, max_groups=2))
+        agg.add(_event(0, model="a"), now=1.0)
+        agg.add(_event(1, model="b"), now=1.0)
+        closed = agg.add(_event(2, model="c"), now=1.0)
+        assert sorted(s["metrics"]["model"] for s in closed) == ["a", "b"]
+        assert agg.open_groups == 1
+
+    def test_detail_sampling_is_per_request(self):
+        events = [_event(i, job_id=f"job{i % 50}") for i in range(1000)]
+        picks = {e["job_id"] for e in events if sampled(e, 0.2)}
+        for e in events:
+            assert sampled(e, 0.2) == (e["job_id"] in picks)
+        assert 0 < len(picks) < 50
+        assert not sampled(events[0], 0.0) and sampled(events[0], 1.0)
+
+    def test_rejects_bad_config(self):
+        with pytest.raises(ValueError):
+            UsageAggregator(UsageAggregationConfig(window_s=0))
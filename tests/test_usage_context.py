@@ -0,0 +1,105 @@
+"""Tests for context-local usage attribution."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from omem import usage_context
+from omem.usage import LLMUsageReporter
+from omem.usage_context import (
+    LLMUsageContext,
+    bind_llm_usage_context,
+    get_llm_usage_context,
+    record_llm_usage,
+    reset_llm_usage_context,
+    reset_llm_usage_hook,
+    set_llm_usage_context,
+    set_llm_usage_hook,
+)
+
+
+@pytest.fixture
+def sink():
+    seen = []
+    token = set_llm_usage_hook(seen.append)
+    yield seen
+    reset_llm_usage_hook(token)
+
+
+class TestUsageContext:
+    def test_no_hook_is_noop(self):
+        assert record_llm_usage(model="m", prompt_tokens=1) is None
+
+    def test_context_fields_and_call_index(self, sink):
+        token = set_llm_usage_context(LLMUsageContext(tenant_id="t1", request_id="r1", stage="extract"))
+        try:
+            record_llm_usage(model="m")
+            record_llm_usage(model="m", stage="rerank")
+        finally:
+            reset_llm_usage_context(token)
+        assert [(p["request_id"], p["stage"], p["call_index"]) for p in sink] == [
+            ("r1", "extract", 0),
+            ("r1", "rerank", 1),
+        ]
+        assert get_llm_usage_context() is None
+
+    def test_propagates_to_tasks_and_bound_threads(self, sink):
+        token = set_llm_usage_context(LLMUsageContext(tenant_id="t1", request_id="r1"))
+        try:
+
+            async def main():
+                await asyncio.gather(*(asyncio.to_thread(record_llm_usage, model="a") for _ in range(2)))
+                await asyncio.gather(*(asyncio.sleep(0, record_llm_usage(model="b")) for _ in range(2)))
+
+            asyncio.run(main())
+            bound = bind_llm_usage_context(record_llm_usage)
+            with ThreadPoolExecutor(2) as pool:
+                list(pool.map(lambda _: bound(model="c"), range(3)))
+                pool.submit(record_llm_usage, model="unbound").result()
+        finally:
+            reset_llm_usage_context(token)
+        assert sorted(p["model"] for p in sink) == ["a", "a", "b", "b", "c", "c", "c"]
+        assert sorted(p["call_index"] for p in sink) == list(range(7))
+
+    def test_reporter_context_emits_through_hook(self):
+        bodies = []
+        http = httpx.Client(transport=httpx.MockTransport(lambda r: bodies.append(r.read()) or httpx.Response(202)))
+        rep = LLMUsageReporter(base_url="http://omem.test", tenant_id="t1", http=http)
+        with rep.context(request_id="r1", stage="extract"):
+            event_id = record_llm_usage(provider="openai", model="m", prompt_tokens=3, completion_tokens=1)
+        assert event_id and len(bodies) == 1
+        assert record_llm_usage(model="m") is None
+
+    def test_mirrors_into_server_module_when_present(self, monkeypatch):
+        import contextvars
+
+        ext_ctx = contextvars.ContextVar("ext_ctx", default=None)
+        ext_hook = contextvars.ContextVar("ext_hook", default=None)
+
+        class ExtContext:
+            def __init__(self, **kw):
+                self.__dict__.update(kw)
+
+        mod = types.ModuleType("modules.memory")
+        mod.LLMUsageContext = ExtContext
+        mod.set_llm_usage_context = ext_ctx.set
+        mod.reset_llm_usage_context = ext_ctx.reset
+        mod.set_llm_usage_hook = ext_hook.set
+        mod.reset_llm_usage_hook = ext_hook.reset
+        monkeypatch.setitem(sys.modules, "modules", types.ModuleType("modules"))
+        monkeypatch.setitem(sys.modules, "modules.memory", mod)
+        monkeypatch.setattr(usage_context, "_external", usage_context._UNSET)
+
+        ctx_token = set_llm_usage_context(LLMUsageContext(tenant_id="t1", request_id="r1"))
+        hook_token = set_llm_usage_hook(print)
+        assert ext_ctx.get().request_id == "r1" and ext_hook.get() is print
+        reset_llm_usage_hook(hook_token)
+        reset_llm_usage_context(ctx_token)
+        assert ext_ctx.get() is None and ext_hook.get() is None
+        monkeypatch.setattr(usage_context, "_external", usage_context._UNSET)
@@ -0,0 +1,114 @@
+"""Tests for the durable usage event spool."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from omem.usage_spool import UsageSpool
+
+
+def _events(n: int, start: int = 0):
+    return [{"event_id": f"llm_{i}", "metrics": {"prompt_tokens": i}} for i in range(start, start + n)]
+
+
+def _ids(batch):
+    return [json.loads(raw)["event_id"] for raw in batch]
+
+
+class TestUsageSpool:
+    def test_replay_acks_progress_and_survives_reopen(self, tmp_path):
+        """A failed batch stops replay; the acknowledged prefix is never resent."""
+        spool = UsageSpool(tmp_path, segment_max_bytes=200, max_total_bytes=10_000, fsync_interval_s=0)
+        spool.append(_events(10))
+        assert len(list(tmp_path.glob("seg-*.jsonl"))) > 1
+        spool.close()
+
+        spool = UsageSpool(tmp_path, segment_max_bytes=200, max_total_bytes=10_000)
+        assert spool.pending() == 10
+        seen = []
+
+        def flaky(batch):
+            if len(seen) >= 3:
+                return False
+            seen.extend(_ids(batch))
+            return True
+
+        assert spool.replay(flaky, max_batch_events=1) == 3
+        assert spool.pending() == 7
+
+        resent = []
+        assert spool.replay(lambda b: resent.extend(_ids(b)) or True) == 7
+        assert seen + resent == [f"llm_{i}" for i in range(10)]
+        assert spool.pending() == 0
+        assert not list(tmp_path.glob("seg-*"))
+
+    def test_budget_drops_oldest_segments(self, tmp_path):
+        spool = UsageSpool(tmp_path, segment_max_bytes=100, max_total_bytes=300)
+        spool.append(_events(30))
+        total = sum(os.path.getsize(p) for p in tmp_path.glob("seg-*.jsonl"))
+        assert total <= 300
+        assert spool.dropped_events + spool.pending() == 30
+        remaining = []
+        spool.replay(lambda b: remaining.extend(_ids(b)) or True)
+        assert remaining == [f"llm_{i}" for i in range(30 - len(remaining), 30)]
+
+    def test_compact_removes_acked_prefix_and_duplicates(self, tmp_path):
+        spool = UsageSpool(tmp_path)
+        spool.append(_events(4))
+        spool.append(_events(2, start=2))  # resend of llm_2/llm_3 after a timeout
+        acked = []
+        spool.replay(lambda b: not acked and not acked.extend(_ids(b)), max_batch_events=1)
+        assert acked == ["llm_0"]
+        spool.compact()
+        assert not list(tmp_path.glob("seg-*.ack"))
+        out = []
+        spool.replay(lambda b: out.extend(_ids(b)) or True)
+        assert out == ["llm_1", "llm_2", "llm_3"]
+
+    def test_compact_during_replay_keeps_ack_offsets(self, tmp_path):
+        """compact() leaves a segment under replay alone; a stopped replay compacts afterwards."""
+        spool = UsageSpool(tmp_path)
+        spool.append(_events(4))
+        spool.append(_events(2, start=2))
+        sent = []
+
+        def send(batch):
+            if len(sent) == 2:
+                return False
+            sent.extend(_ids(batch))
+            if len(sent) == 2:
+                spool.compact()  # e.g. from another thread
+            return True
+
+        assert spool.replay(send, max_batch_events=1) == 2
+        assert not list(tmp_path.glob("seg-*.ack"))  # compacted once the replay stopped
+        out = []
+        spool.replay(lambda b: out.extend(_ids(b)) or True)
+        assert sent + out == ["llm_0", "llm_1", "llm_2", "llm_3"]
+
+    def test_budget_uses_running_total(self, tmp_path):
+        """append() keeps the byte total current instead of scanning the directory."""
+        spool = UsageSpool(tmp_path, segment_max_bytes=100, max_total_bytes=300)
+        spool._segments = lambda: pytest.fail("append scanned the spool directory")
+        spool.append(_events(30))
+        total = sum(os.path.getsize(p) for p in tmp_path.glob("seg-*.jsonl"))
+        assert spool._total_bytes == total <= 300
+        del spool._segments
+        spool.replay(lambda b: True)
+        assert spool._total_bytes == 0
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        spool = UsageSpool(tmp_path)
+        spool.append(_events(2))
+        spool.close()
+        seg = next(tmp_path.glob("seg-*.jsonl"))
+        with open(seg, "ab") as fh:
+            fh.write(b'{"event_id":"llm_trunc')
+        assert UsageSpool(tmp_path).pending() == 2
+
+    def test_rejects_bad_limits(self, tmp_path):
+        with pytest.raises(ValueError):
+            UsageSpool(tmp_path, segment_max_bytes=100, max_total_bytes=10)